@@ -72,16 +72,16 @@ async def load_annotation_from_file(graph_db: GraphDatabase = None,
 
     annotations = []
 
-    for _, row in iter_progress(
-        mapping_df.iterrows(),
+    for referenced_component_id, map_target in iter_progress(
+        mapping_df[['referencedComponentId', 'mapTarget']].itertuples(index=False, name=None),
         description='Processing CTV3 to SNOMED mappings',
         total=len(mapping_df),
     ):
         annotations.append(Annotation(
             prefixFrom=ConceptPrefix.SNOMED,
-            conceptIdFrom=str(row['referencedComponentId']),
+            conceptIdFrom=str(referenced_component_id),
             prefixTo=ConceptPrefix.CTV3,
-            conceptIdTo=str(row['mapTarget']),
+            conceptIdTo=str(map_target),
         ))
 
     verbose_print(f'Inserting {len(annotations)} annotations into the graph database...')
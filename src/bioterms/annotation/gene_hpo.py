@@ -63,18 +63,20 @@ async def load_annotation_from_file(graph_db: GraphDatabase = None,
 
     annotations = []
 
-    for _, row in iter_progress(
-        mapping_df.iterrows(),
+    mapping_rows = mapping_df[['gene_symbol', 'hpo_id', 'frequency']].itertuples(index=False, name=None)
+
+    for gene_symbol, hpo_id, frequency_code in iter_progress(
+        mapping_rows,
         description='Processing HGNC to HPO annotations',
         total=len(mapping_df),
     ):
-        if row['gene_symbol'] == '-':
+        if gene_symbol == '-':
             # No corresponding HGNC code
             continue
 
         frequency = 'UN'
-        if row['frequency'] != '-':
-            frequency_id = row['frequency'].split(':')[-1]
+        if frequency_code != '-':
+            frequency_id = frequency_code.split(':')[-1]
 
             match frequency_id:
                 case '0040285':
@@ -101,8 +103,8 @@ async def load_annotation_from_file(graph_db: GraphDatabase = None,
         annotations.append(Annotation(
             prefixFrom=VOCABULARY_PREFIX_1,
             prefixTo=VOCABULARY_PREFIX_2,
-            conceptIdFrom=row['gene_symbol'],
-            conceptIdTo=row['hpo_id'].split(':')[-1],
+            conceptIdFrom=gene_symbol,
+            conceptIdTo=hpo_id.split(':')[-1],
             properties={'frequency': frequency},
         ))
 
@@ -64,16 +64,16 @@ async def load_annotation_from_file(graph_db: GraphDatabase = None,
 
     annotations = []
 
-    for _, row in iter_progress(
-        mapping_df.iterrows(),
+    for ncit_id, hgnc_id in iter_progress(
+        mapping_df.itertuples(index=False, name=None),
         description='Processing NCIT to HGNC annotations',
         total=len(mapping_df)
     ):
         annotations.append(Annotation(
             prefixFrom=VOCABULARY_PREFIX_1,
             prefixTo=VOCABULARY_PREFIX_2,
-            conceptIdFrom=row['ncit_id'],
-            conceptIdTo=row['hgnc_id'].split(':')[-1],
+            conceptIdFrom=ncit_id,
+            conceptIdTo=hgnc_id.split(':')[-1],
         ))
 
     verbose_print(f'Processed {len(annotations)} NCIT to HGNC annotations. Saving to database...')
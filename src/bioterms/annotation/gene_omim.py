@@ -72,24 +72,20 @@ async def load_annotation_from_file(graph_db: GraphDatabase = None,
 
     mapping_df = pd.read_csv(
         os.path.join(CONFIG.data_dir, FILE_PATHS[0]),
-    )
+    ).dropna(subset=['Gene Symbol'])
 
     verbose_print('OMIM gene mapping file loaded from disk, processing annotations...')
 
     annotations = []
 
-    for _, row in iter_progress(
-        mapping_df.iterrows(),
+    for class_id, gene_symbols in iter_progress(
+        mapping_df[['Class ID', 'Gene Symbol']].itertuples(index=False, name=None),
         description='Processing OMIM to HGNC annotations',
         total=len(mapping_df)
     ):
-        if pd.isna(row['Gene Symbol']):
-            continue
-
-        gene_symbols = row['Gene Symbol'].split('|')
-        omim_id = row['Class ID'].split('/')[-1]
+        omim_id = class_id.split('/')[-1]
 
-        for gene_symbol in gene_symbols:
+        for gene_symbol in gene_symbols.split('|'):
             annotations.append(Annotation(
                 prefixFrom=VOCABULARY_PREFIX_1,
                 prefixTo=VOCABULARY_PREFIX_2,
@@ -1,11 +1,10 @@
 import os
 import httpx
-from owlready2 import get_ontology
 
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix
 from bioterms.etc.utils import check_files_exist, ensure_data_directory, download_file, iter_progress, \
-    verbose_print
+    load_owl_ontology, verbose_print
 from bioterms.database import GraphDatabase, get_active_graph_db
 from bioterms.model.annotation import Annotation
 from .utils import assert_pre_requisite
@@ -57,9 +56,7 @@ async def load_annotation_from_file(graph_db: GraphDatabase = None,
         graph_db=graph_db,
     )
 
-    owl_file_path = f'file://{os.path.join(CONFIG.data_dir, FILE_PATHS[0])}'
-
-    hoom_ontology = get_ontology(owl_file_path).load()
+    hoom_ontology = load_owl_ontology(os.path.join(CONFIG.data_dir, FILE_PATHS[0]))
     hoom_classes = list(hoom_ontology.classes())
     annotations = []
 
@@ -73,16 +73,16 @@ async def load_annotation_from_file(graph_db: GraphDatabase = None,
 
     annotations = []
 
-    for _, row in iter_progress(
-        mapping_df.iterrows(),
+    for referenced_component_id, map_target in iter_progress(
+        mapping_df[['referencedComponentId', 'mapTarget']].itertuples(index=False, name=None),
         desc='Processing SNOMED-ORDO annotations',
         total=len(mapping_df),
     ):
         annotations.append(Annotation(
             prefixFrom=VOCABULARY_PREFIX_1,
             prefixTo=VOCABULARY_PREFIX_2,
-            conceptIdFrom=str(row['referencedComponentId']),
-            conceptIdTo=str(row['mapTarget']),
+            conceptIdFrom=str(referenced_component_id),
+            conceptIdTo=str(map_target),
         ))
 
     verbose_print(f'Inserting {len(annotations)} SNOMED-ORDO annotations into the database...')
@@ -16,7 +16,7 @@ from pymongo.errors import OperationFailure
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix
 from bioterms.etc.errors import IndexCreationError
-from bioterms.etc.utils import batch_iterable, iter_progress
+from bioterms.etc.utils import batch_iterable, iter_progress, write_in_background
 from bioterms.etc.metrics import DOCDB_OP_DURATION, DOCDB_OP_TTFI, DOCDB_OP_ERRORS, \
     AUTOCOMPLETE_ITEMS
 from bioterms.model.concept import Concept, ConceptUnion
@@ -25,6 +25,23 @@ from .doc_db import DocumentDatabase
 from .utils import generate_extra_data
 
 
+async def _prepare_terms_batches(terms: list[Concept]) -> AsyncIterator[tuple[list[Concept], list]]:
+    """
+    Split the terms into batches and compute the extra search data of each batch.
+    :param terms: The terms to save.
+    :return: An async iterator of (batch, extra_data) tuples.
+    """
+    with ProcessPoolExecutor(
+        max_workers=CONFIG.process_limit,
+    ) as executor:
+        for batch in batch_iterable(terms):
+            extra_data = await generate_extra_data(
+                concepts=batch,
+                executor=executor,
+            )
+            yield batch, extra_data
+
+
 class MongoUserRepository(UserRepository):
     """
     A MongoDB implementation of the UserRepository interface.
@@ -284,7 +301,7 @@ class MongoDocumentDatabase(DocumentDatabase):
                 new_docs[concept_id]['searchText'] = search_text
 
         if new_docs:
-            await collection.insert_many(new_docs.values())
+            await collection.insert_many(new_docs.values(), ordered=False)
 
     @staticmethod
     async def _upsert_terms_batch(collection,
@@ -332,6 +349,25 @@ class MongoDocumentDatabase(DocumentDatabase):
             ]
             await collection.bulk_write(operations)
 
+    async def _write_terms_batch(self,
+                                 collection,
+                                 item: tuple[list[Concept], list],
+                                 no_upsert: bool,
+                                 existing_concept_ids: set[str],
+                                 ):
+        """
+        Write one prepared batch of concepts.
+        :param collection: The MongoDB collection to write to.
+        :param item: The (batch, extra_data) tuple to write.
+        :param no_upsert: Whether to insert the batch directly without checking for existing documents.
+        :param existing_concept_ids: The set of concept IDs already present in the collection.
+        """
+        batch, extra_data = item
+        if no_upsert:
+            await self._insert_new_terms_batch(collection, batch, extra_data)
+        else:
+            await self._upsert_terms_batch(collection, batch, extra_data, existing_concept_ids)
+
     async def save_terms(self,
                          terms: list[Concept],
                          no_upsert: bool = False
@@ -351,19 +387,11 @@ class MongoDocumentDatabase(DocumentDatabase):
                 existing_concept_ids.add(doc['conceptId'])
 
         with pymongo.timeout(None):
-            with ProcessPoolExecutor(
-                max_workers=CONFIG.process_limit,
-            ) as executor:
-                for batch in batch_iterable(terms):
-                    extra_data = await generate_extra_data(
-                        concepts=batch,
-                        executor=executor,
-                    )
-
-                    if no_upsert:
-                        await self._insert_new_terms_batch(collection, batch, extra_data)
-                    else:
-                        await self._upsert_terms_batch(collection, batch, extra_data, existing_concept_ids)
+            # Writes run in a separate task, so the next batch is prepared while the last is written
+            await write_in_background(
+                items=_prepare_terms_batches(terms),
+                write=lambda item: self._write_terms_batch(collection, item, no_upsert, existing_concept_ids),
+            )
 
     async def count_terms(self,
                           prefix: ConceptPrefix,
@@ -625,8 +625,10 @@ class SqlDocumentDatabase(DocumentDatabase):
             return
         prefix = terms[0].prefix
 
-        async with self._engine.begin() as conn:
+        # Commit as we go, so a large vocabulary is written as one transaction per batch, not one overall
+        async with self._engine.connect() as conn:
             tables = await self._ensure_tables_exist(conn, prefix)
+            await conn.commit()
             concept_t = tables.concept
             ngram_t = tables.ngram
 
@@ -690,6 +692,8 @@ class SqlDocumentDatabase(DocumentDatabase):
                 if ngram_rows:
                     await conn.execute(insert(ngram_t), ngram_rows)
 
+                await conn.commit()
+
     async def count_terms(self,
                           prefix: ConceptPrefix,
                           ) -> int:
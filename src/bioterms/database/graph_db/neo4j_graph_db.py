@@ -449,7 +449,11 @@ class Neo4jGraphDatabase(GraphDatabase):
                     """,
                     session=session,
                     parameters={
-                        'concepts': [concept.model_dump() for concept in concept_batch],
+                        # Only the fields the query reads are sent, not the whole concept document
+                        'concepts': [
+                            concept.model_dump(include={'concept_id', 'prefix', 'concept_types'})
+                            for concept in concept_batch
+                        ],
                     },
                 )
 
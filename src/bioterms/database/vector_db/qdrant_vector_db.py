@@ -6,11 +6,39 @@ from qdrant_client.http.models import HnswConfigDiff
 from qdrant_client.http.exceptions import UnexpectedResponse
 
 from bioterms.etc.enums import ConceptPrefix
+from bioterms.etc.utils import write_in_background
 from bioterms.model.concept import Concept
 from bioterms.embedding import ConceptTransformer, TextTransformer
 from .vector_db import VectorDatabase
 
 
+async def _point_batches(embeddings: AsyncIterator[tuple[str, str, list[float]]],
+                         id_map: dict[str, str],
+                         ) -> AsyncIterator[list[PointStruct]]:
+    """
+    Group embeddings into batches of points, recording the point ID assigned to each concept.
+    :param embeddings: An async iterator of tuples containing (concept_id, vector_id, embedding_vector)
+    :param id_map: The mapping of concept IDs to point IDs to fill in
+    :return: An async iterator of point batches
+    """
+    points = []
+    async for concept_id, vector_id, vector in embeddings:
+        points.append(PointStruct(
+            id=vector_id,
+            vector=vector,
+            payload={'conceptId': concept_id}
+        ))
+
+        id_map[concept_id] = vector_id
+
+        if len(points) > 1000:
+            yield points
+            points = []
+
+    if points:
+        yield points
+
+
 class QdrantVectorDatabase(VectorDatabase):
     """
     Qdrant vector database implementation.
@@ -87,6 +115,20 @@ class QdrantVectorDatabase(VectorDatabase):
         """
         await self.client.delete_collection(collection_name=collection_name)
 
+    async def _upsert_points(self,
+                             collection_name: str,
+                             points: list[PointStruct],
+                             ):
+        """
+        Upsert one batch of points.
+        :param collection_name: The name of the collection to upsert into
+        :param points: The batch of points
+        """
+        await self.client.upsert(
+            collection_name=collection_name,
+            points=points,
+        )
+
     async def load_embeddings(self,
                               prefix: ConceptPrefix,
                               embeddings: AsyncIterator[tuple[str, str, list[float]]],
@@ -108,30 +150,13 @@ class QdrantVectorDatabase(VectorDatabase):
             )
         )
 
-        points = []
+        # Upserts run in a separate task, so the next batch is produced while the last is written
         id_map = {}
-        async for concept_id, vector_id, vector in embeddings:
-            points.append(PointStruct(
-                id=vector_id,
-                vector=vector,
-                payload={'conceptId': concept_id}
-            ))
-
-            id_map[concept_id] = vector_id
-
-            if len(points) > 1000:
-                await self.client.upsert(
-                    collection_name=collection_name,
-                    points=points,
-                )
-
-                points = []
-
-        if points:
-            await self.client.upsert(
-                collection_name=collection_name,
-                points=points,
-            )
+        await write_in_background(
+            items=_point_batches(embeddings, id_map),
+            write=lambda points: self._upsert_points(collection_name, points),
+            maxsize=4,
+        )
 
         # Re-enable HNSW indexing after inserts
         await self.client.update_collection(
@@ -36,6 +36,11 @@ class Settings(BaseSettings):
         description='Maximum number of worker process to spawn for handling data. '
                     'This is not used when running as a service, only for CLI commands.',
     )
+    similarity_batch_size: int = Field(
+        65536,
+        description='Number of concept pairs scored by a worker process in one task when '
+                    'calculating similarity.',
+    )
     auto_complete_min_length: int = Field(
         3,
         description='Minimum length of query string for auto-complete searches',
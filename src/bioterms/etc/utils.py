@@ -3,15 +3,18 @@ Utility functions for data management, downloading, extraction, and processing.
 """
 
 import asyncio
+import gc
 import os
 import io
+import gzip
+import shutil
 import zipfile
 import uuid
 import tempfile
 import fnmatch
-import zlib
 import tarfile
-from collections.abc import MutableSequence, Iterable
+from collections.abc import MutableSequence, Iterable, Awaitable
+from contextlib import aclosing, contextmanager
 from pathlib import Path
 from itertools import islice
 from concurrent.futures import Executor
@@ -24,13 +27,15 @@ import networkx as nx
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeElapsedColumn, \
     TimeRemainingColumn
 
-from .consts import CONFIG, DOWNLOAD_CLIENT, QUERY_CLIENT
+from .consts import CONFIG, DOWNLOAD_CLIENT, QUERY_CLIENT, LOGGER
 from .errors import FilesNotFound
 
 if TYPE_CHECKING:
+    from owlready2 import Ontology
     from sentence_transformers import SentenceTransformer
 
 _TRANSFORMER: Optional['SentenceTransformer'] = None
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
 T = TypeVar('T')
 R = TypeVar('R')
 
@@ -67,6 +72,22 @@ def check_files_exist(files: list[str]) -> bool:
     return True
 
 
+async def check_files_exist_async(files: list[str]) -> bool:
+    """
+    Check if all specified files exist in the data directory, without blocking the event loop.
+
+    The checks run concurrently on the aiofiles thread pool, so slow (e.g. networked) file
+    systems are waited on once rather than once per file.
+    :param files: List of file names to check.
+    :return: True if all files exist, False otherwise.
+    """
+    results = await asyncio.gather(
+        *(aiofiles.os.path.exists(os.path.join(CONFIG.data_dir, file_name)) for file_name in files)
+    )
+
+    return all(results)
+
+
 def ensure_data_directory():
     """
     Ensure that the data directory exists.
@@ -198,9 +219,10 @@ async def download_file(url: str,
         absolute_file_path = os.path.join(CONFIG.data_dir, file_path)
         os.makedirs(os.path.dirname(absolute_file_path), exist_ok=True)
 
+        # Each aiofiles write is a round trip to a worker thread, so network reads are coalesced to 1MB
         async with aiofiles.open(absolute_file_path, 'wb') as data_file:
             async for chunk in aiter_progress(
-                response.aiter_bytes(),
+                response.aiter_bytes(chunk_size=_DOWNLOAD_CHUNK_SIZE),
                 description=f'Downloading {os.path.basename(file_path)}'
             ):
                 await data_file.write(chunk)
@@ -262,33 +284,38 @@ async def extract_file_from_zip(zip_path: str,
                 await dest_f.write(data)
 
 
+def _extract_gzip_sync(gzip_path: str,
+                       output_path: str,
+                       chunk_size: int,
+                       ) -> None:
+    """
+    Synchronous implementation that decompresses a gzip file to disk.
+    :param gzip_path: The path to the gzip file.
+    :param output_path: The path to save the decompressed output file.
+    :param chunk_size: The size of the buffer used to copy decompressed data.
+    """
+    with gzip.open(gzip_path, 'rb') as f_in, open(output_path, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out, length=chunk_size)
+
+
 async def extract_file_from_gzip(gzip_path: str,
                                  output_path: str,
                                  chunk_size: int = 1024 * 1024,
                                  ):
     """
-    Extract a gzip compressed file.
+    Extract a gzip compressed file in a separate thread.
+
+    The whole copy runs in one thread call, instead of a thread hop for every chunk read and write.
     :param gzip_path: The path to the gzip file.
     :param output_path: The path to save the decompressed output file.
-    :param chunk_size: The chunk size to use when reading the gzip file.
+    :param chunk_size: The size of the buffer used to copy decompressed data.
     """
-    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
-
-    async with aiofiles.open(gzip_path, "rb") as f_in, \
-        aiofiles.open(output_path, "wb") as f_out:
-
-        while True:
-            chunk = await f_in.read(chunk_size)
-            if not chunk:
-                break
-
-            data = decompressor.decompress(chunk)
-            if data:
-                await f_out.write(data)
-
-        tail = decompressor.flush()
-        if tail:
-            await f_out.write(tail)
+    await asyncio.to_thread(
+        _extract_gzip_sync,
+        gzip_path,
+        output_path,
+        chunk_size,
+    )
 
 
 def _extract_tarball_sync(tarball_path: str,
@@ -395,6 +422,27 @@ def get_transformer() -> 'SentenceTransformer':
     return _TRANSFORMER
 
 
+def load_owl_ontology(file_path: str) -> 'Ontology':
+    """
+    Load an OWL file with owlready2, warning when its compiled parser is not available.
+
+    owlready2 silently falls back to a pure Python parser, roughly ten times slower, when its
+    optional owlready2_optimized extension failed to build on install.
+    :param file_path: The absolute path to the OWL file.
+    :return: The loaded ontology.
+    """
+    from owlready2 import get_ontology, driver
+
+    if driver.owlready2_optimized is None:
+        LOGGER.warning(
+            'owlready2 optimised parser is not available, parsing %s with the slower Python parser. '
+            'Reinstall owlready2 with a C compiler available to build it.',
+            file_path,
+        )
+
+    return get_ontology(f'file://{file_path}').load()
+
+
 def iter_progress(iterable: Iterable[T],
                   *,
                   description: str = "Working...",
@@ -459,6 +507,26 @@ def verbose_print(message: str):
         print(message)
 
 
+@contextmanager
+def gc_paused():
+    """
+    Pause the cyclic garbage collector while building a large number of objects.
+
+    Every few hundred allocations of container objects trigger a collection, and each
+    full collection walks everything built so far. Nothing allocated in a bulk build
+    is garbage, so the collections are pure overhead. The previous collector state is
+    restored on exit.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
 def _start_optional_progress(description: str | None,
                              total: int | None,
                              transient: bool,
@@ -562,6 +630,62 @@ async def schedule_tasks(executor: Executor,
         progress.stop()
 
 
+async def _put_unless_failed(q: asyncio.Queue,
+                             item,
+                             writer_task: asyncio.Task,
+                             ):
+    """
+    Put an item on the writer queue, raising the write error instead if the writer has failed.
+    :param q: The writer queue.
+    :param item: The item to put.
+    :param writer_task: The task consuming the queue.
+    """
+    put_task = asyncio.ensure_future(q.put(item))
+    await asyncio.wait({put_task, writer_task}, return_when=asyncio.FIRST_COMPLETED)
+
+    if writer_task.done():
+        put_task.cancel()
+        # The writer only returns on the sentinel, so a finished writer here has failed
+        writer_task.result()
+
+
+async def write_in_background(items: AsyncIterable[T],
+                              write: Callable[[T], Awaitable[None]],
+                              maxsize: int = 2,
+                              ):
+    """
+    Write items in a separate task, so the next item is produced while the last one is written.
+
+    Once a write fails the producer is not advanced again: it is closed and the write error is
+    raised right away, instead of after every remaining item has been produced.
+    :param items: The async iterable producing the items.
+    :param write: The coroutine function writing one item.
+    :param maxsize: The maximum number of produced items waiting to be written.
+    """
+    q: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+    sentinel = object()
+
+    async def _writer():
+        while True:
+            item = await q.get()
+            if item is sentinel:
+                return
+            await write(item)
+
+    writer_task = asyncio.create_task(_writer())
+
+    try:
+        async with aclosing(items) as produced:
+            async for item in produced:
+                await _put_unless_failed(q, item, writer_task)
+
+        await _put_unless_failed(q, sentinel, writer_task)
+        await writer_task
+    finally:
+        if not writer_task.done():
+            writer_task.cancel()
+
+
 def report_exception(exc: Exception = None):
     """
     Report an exception using the sentry SDK. If the SDK is not configured, this function does nothing.
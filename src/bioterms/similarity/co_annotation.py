@@ -1,15 +1,16 @@
 import math
-import itertools
-from copy import deepcopy
-from concurrent.futures import ProcessPoolExecutor
-from functools import lru_cache
-from typing import AsyncIterator, Iterable, Iterator, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
 
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptRelationshipType
-from bioterms.etc.utils import verbose_print, schedule_tasks
-from .utils import count_annotation_for_graph, filter_edges_by_relationship
+from bioterms.etc.utils import iter_progress, verbose_print, schedule_tasks
+from .utils import annotation_adjacency, count_annotation_for_graph, graph_to_csr, \
+    relationship_subgraph, topological_order
 
 
 METHOD_NAME = 'Co-Annotation Vector Method'
@@ -18,101 +19,158 @@ CORPUS_REQUIRED = True
 CORPUS_GRAPH_REQUIRED = False
 
 
-_pruned_target_graph: nx.DiGraph | None = None
-_annotation_graph: nx.Graph | None = None
-_target_prefix: ConceptPrefix | None = None
-_corpus_prefix: ConceptPrefix | None = None
-_total_annotation_count: int | None = None
-_PAIR_BATCH_SIZE = 256
-_T = TypeVar('_T')
-
-
-@lru_cache(maxsize=None)
-def _annotation_set(node: str) -> frozenset[str]:
-    """Return all corpus annotations below a node, cached per worker."""
-    descendants = nx.ancestors(_pruned_target_graph, node) | {node}
-    corpus_prefix = f'{_corpus_prefix.value}:'
-    annotations = set()
-    for descendant in descendants:
-        annotation_name = f'{_target_prefix.value}:{descendant}'
-        if annotation_name in _annotation_graph:
-            annotations.update(
-                neighbor for neighbor in _annotation_graph.neighbors(annotation_name)
-                if neighbor.startswith(corpus_prefix)
-            )
-    return frozenset(annotations)
-
-
-def _calculate_co_annotation_cached(node_1: str, node_2: str) -> float | None:
-    """Calculate co-annotation similarity using cached node annotation sets."""
-    annotation_set_1 = _annotation_set(node_1)
-    annotation_set_2 = _annotation_set(node_2)
-
-    if _total_annotation_count == 0 or not annotation_set_1 or not annotation_set_2:
-        return None
-
-    annotation_intersection = annotation_set_1 & annotation_set_2
-    if not annotation_intersection:
-        return 0.0
-
-    intersection_len = len(annotation_intersection)
-    if math.isclose(_total_annotation_count, intersection_len):
-        npmi = 1.0
-    else:
-        numerator = (intersection_len * _total_annotation_count) / (
-            len(annotation_set_1) * len(annotation_set_2)
+_ROW_BLOCK_SIZE = 256
+
+
+def _build_annotation_sets(target_graph: nx.DiGraph,
+                           annotation_graph: nx.Graph,
+                           target_prefix: ConceptPrefix,
+                           corpus_prefix: ConceptPrefix,
+                           ) -> tuple[list[str], tuple[frozenset[int], ...]]:
+    """
+    Collect the corpus annotations of every node and its descendants in one topological sweep.
+
+    Each node's set is its direct annotations merged with the already-built sets of its children,
+    so every edge is visited once instead of re-walking the subgraph below every node. Annotations
+    are integer corpus indices, which are cheaper to hash and merge than node names.
+    :param target_graph: The (pruned) directed graph of the target vocabulary.
+    :param annotation_graph: The undirected graph of the annotation between target and corpus.
+    :param target_prefix: The prefix of the target vocabulary.
+    :param corpus_prefix: The prefix of the corpus vocabulary.
+    :return: A tuple of (nodes, annotation_sets), with the frozen set of corpus annotation indices
+        below each node in the same order as `nodes`.
+    """
+    indptr, indices, _, nodes = graph_to_csr(target_graph)
+    order = topological_order(indptr, indices)
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+
+    direct_annotations, _ = annotation_adjacency(
+        annotation_graph=annotation_graph,
+        row_nodes=nodes,
+        row_prefix=target_prefix,
+        column_prefix=corpus_prefix,
+    )
+    direct_indptr = direct_annotations.indptr.tolist()
+    direct_indices = direct_annotations.indices.tolist()
+
+    annotation_sets = [
+        set(direct_indices[direct_indptr[node]:direct_indptr[node + 1]])
+        for node in range(len(nodes))
+    ]
+    for node in iter_progress(
+        order,
+        description='Collecting annotation sets for target graph',
+        total=len(order),
+    ):
+        # Children come before parents, so the set is complete when pushed up to the parents
+        annotation_sets[node] = frozenset(annotation_sets[node])
+        for parent in indices[indptr[node]:indptr[node + 1]]:
+            annotation_sets[parent] |= annotation_sets[node]
+
+    return nodes, tuple(annotation_sets)
+
+
+def _build_annotation_matrix(annotation_sets: tuple[frozenset[int], ...]) -> sp.csr_array:
+    """
+    Build the binary node-by-annotation indicator matrix from the node annotation sets.
+    :param annotation_sets: The corpus annotation set of each target node, by node index.
+    :return: A sparse matrix of shape [N, M], with a one where node i is annotated with annotation j.
+    """
+    annotation_index: dict[int, int] = {}
+    indptr = [0]
+    indices = []
+
+    for annotations in annotation_sets:
+        indices.extend(
+            annotation_index.setdefault(annotation, len(annotation_index))
+            for annotation in annotations
         )
-        try:
-            num_log = math.log(numerator)
-            denom_log = math.log(_total_annotation_count / intersection_len)
-            npmi = 1.0 if denom_log == 0 else (1 + num_log / denom_log) / 2
-        except (ValueError, ZeroDivisionError):
-            npmi = 0.0
+        indptr.append(len(indices))
 
-    return npmi * intersection_len / len(annotation_set_1 | annotation_set_2)
+    return sp.csr_array(
+        (
+            np.ones(len(indices), dtype=np.int32),
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(indptr, dtype=np.int64),
+        ),
+        shape=(len(annotation_sets), len(annotation_index)),
+    )
 
 
-def _co_annotation_worker(
-    node_pairs: tuple[tuple[str, str], ...],
-) -> list[tuple[str, str, float | None]]:
+def _co_annotation_scores(intersection_lens: np.ndarray,
+                          sizes_1: np.ndarray,
+                          sizes_2: np.ndarray,
+                          total_annotation_count: int,
+                          ) -> np.ndarray:
     """
-    Worker function to calculate co-annotation similarity for a batch of pairs.
+    Calculate the co-annotation similarity of many node pairs from their annotation set sizes.
+
+    Pairs sharing no annotation score zero, and never reach the logarithms of the NPMI.
+    :param intersection_lens: The number of annotations shared by each pair.
+    :param sizes_1: The number of annotations of the first node of each pair.
+    :param sizes_2: The number of annotations of the second node of each pair.
+    :param total_annotation_count: The total number of annotations in the annotation graph.
+    :return: The NPMI of each pair's annotation sets weighted by their Jaccard index.
     """
-    return [
-        (node_1, node_2, _calculate_co_annotation_cached(node_1, node_2))
-        for node_1, node_2 in node_pairs
-    ]
+    intersection_lens = intersection_lens.astype(np.float64)
+    sizes_1 = sizes_1.astype(np.float64)
+    sizes_2 = sizes_2.astype(np.float64)
+
+    scores = np.zeros_like(intersection_lens)
+    overlapping = intersection_lens > 0
+    intersection_lens = intersection_lens[overlapping]
+    sizes_1 = sizes_1[overlapping]
+    sizes_2 = sizes_2[overlapping]
 
+    # An intersection covering the whole universe has a zero NPMI denominator, and is fully associated
+    npmi = np.ones_like(intersection_lens)
+    below_universe = intersection_lens < total_annotation_count
+    below_universe_lens = intersection_lens[below_universe]
+    npmi[below_universe] = (1 + np.log(
+        below_universe_lens * total_annotation_count / (sizes_1[below_universe] * sizes_2[below_universe])
+    ) / np.log(total_annotation_count / below_universe_lens)) / 2
 
-def _batched(iterable: Iterable[_T], size: int) -> Iterator[tuple[_T, ...]]:
-    """Yield fixed-size tuples without materialising every node pair."""
-    iterator = iter(iterable)
-    while batch := tuple(itertools.islice(iterator, size)):
-        yield batch
+    scores[overlapping] = npmi * intersection_lens / (sizes_1 + sizes_2 - intersection_lens)
 
+    return scores
 
-def _worker_init(target_graph: nx.DiGraph,
-                 target_prefix: ConceptPrefix,
-                 corpus_prefix: ConceptPrefix,
-                 annotation_graph: nx.Graph,
-                 total_annotation_count: int
-                 ):
+
+def _co_annotation_block(start: int,
+                         annotation_matrix: sp.csr_array,
+                         annotation_matrix_t: sp.csr_array,
+                         annotation_sizes: np.ndarray,
+                         total_annotation_count: int,
+                         ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Initialise global variables for worker processes.
-    :param target_graph: The directed graph of the target vocabulary.
-    :param target_prefix: The prefix of the target vocabulary.
-    :param corpus_prefix: The prefix of the corpus vocabulary.
-    :param annotation_graph: The directed graph of the annotation between target and corpus.
+    Calculate co-annotation similarity between a block of rows and every later node.
+
+    The intersection sizes of all pairs in the block come from one sparse product, so only
+    pairs that share at least one annotation are ever visited; the dominant zero-intersection pairs
+    never reach the scoring arithmetic.
+    :param start: The first node index of the block.
+    :param annotation_matrix: The [N, M] node-by-annotation indicator matrix.
+    :param annotation_matrix_t: The transpose of the indicator matrix, in CSR layout.
+    :param annotation_sizes: The number of annotations of each node.
     :param total_annotation_count: The total number of annotations in the annotation graph.
+    :return: A tuple of (indices_1, indices_2, similarities) arrays, with indices_1 < indices_2.
     """
-    global _pruned_target_graph, _annotation_graph, _target_prefix, _corpus_prefix, _total_annotation_count
+    stop = min(start + _ROW_BLOCK_SIZE, annotation_matrix.shape[0])
+    intersections = (annotation_matrix[start:stop] @ annotation_matrix_t).tocoo()
+    rows = intersections.row + start
+    cols = intersections.col
+    upper = (cols > rows) & (intersections.data > 0)
+    rows = rows[upper]
+    cols = cols[upper]
 
-    _pruned_target_graph = target_graph
-    _annotation_graph = annotation_graph
-    _target_prefix = target_prefix
-    _corpus_prefix = corpus_prefix
-    _total_annotation_count = total_annotation_count
-    _annotation_set.cache_clear()
+    similarities = _co_annotation_scores(
+        intersections.data[upper],
+        annotation_sizes[rows],
+        annotation_sizes[cols],
+        total_annotation_count,
+    )
+
+    return rows, cols, similarities
 
 
 async def calculate_similarity(target_graph: nx.MultiDiGraph,
@@ -133,14 +191,12 @@ async def calculate_similarity(target_graph: nx.MultiDiGraph,
     :param annotation_graph: The directed graph of the annotation between target and corpus.
     :return: A generator yielding tuples of (concept_from, concept_to, similarity_score).
     """
-    target_graph = deepcopy(target_graph)
-    filter_edges_by_relationship(
+    target_graph = relationship_subgraph(
         graph=target_graph,
         relationship_types={ConceptRelationshipType.IS_A, ConceptRelationshipType.PART_OF},
     )
     verbose_print(f'Relationship filtered down to {len(target_graph.edges)} edges in target graph.')
 
-    target_graph = nx.DiGraph(target_graph)
     annotation_graph = annotation_graph.to_undirected()
 
     # Count the annotations for each node in the target graph
@@ -166,27 +222,40 @@ async def calculate_similarity(target_graph: nx.MultiDiGraph,
     )
     verbose_print(f'Total annotation count in annotation graph: {total_annotation_count}')
 
-    nodes = list(pruned_target_graph.nodes)
-    node_pairs = itertools.combinations(nodes, 2)
-    pair_count = len(nodes) * (len(nodes) - 1) // 2
-    pair_batches = _batched(node_pairs, _PAIR_BATCH_SIZE)
-    batch_count = math.ceil(pair_count / _PAIR_BATCH_SIZE)
+    nodes, annotation_sets = _build_annotation_sets(
+        target_graph=pruned_target_graph,
+        annotation_graph=annotation_graph,
+        target_prefix=target_prefix,
+        corpus_prefix=corpus_prefix,
+    )
+
+    if total_annotation_count == 0:
+        return
+
+    annotation_matrix = _build_annotation_matrix(annotation_sets)
+    annotation_matrix_t = annotation_matrix.T.tocsr()
+    annotation_sizes = np.diff(annotation_matrix.indptr)
+
     verbose_print(f'Calculating similarity for {len(nodes)} nodes, '
-                  f'total {pair_count} pairs.')
-
-    with ProcessPoolExecutor(
-        max_workers=CONFIG.process_limit,
-        initializer=_worker_init,
-        initargs=(pruned_target_graph, target_prefix, corpus_prefix, annotation_graph, total_annotation_count),
-    ) as executor:
-        async for results in schedule_tasks(
+                  f'total {len(nodes) * (len(nodes) - 1) // 2} pairs.')
+
+    # Row blocks run on threads: the matrices are shared rather than pickled to every worker,
+    # and the sparse product and NumPy kernel release the GIL while they run
+    with ThreadPoolExecutor(max_workers=CONFIG.process_limit) as executor:
+        async for indices_from, indices_to, similarities in schedule_tasks(
             executor=executor,
-            func=_co_annotation_worker,
-            iterable=pair_batches,
+            func=partial(
+                _co_annotation_block,
+                annotation_matrix=annotation_matrix,
+                annotation_matrix_t=annotation_matrix_t,
+                annotation_sizes=annotation_sizes,
+                total_annotation_count=total_annotation_count,
+            ),
+            iterable=range(0, len(nodes), _ROW_BLOCK_SIZE),
             description='Calculate co-annotation similarity scores between terms in the target graph.',
-            total=batch_count,
+            total=math.ceil(len(nodes) / _ROW_BLOCK_SIZE),
         ):
-            for concept_from, concept_to, similarity in results:
-
-                if similarity is not None:
-                    yield concept_from, concept_to, similarity
+            for index_from, index_to, similarity in zip(
+                indices_from.tolist(), indices_to.tolist(), similarities.tolist(),
+            ):
+                yield nodes[index_from], nodes[index_to], similarity
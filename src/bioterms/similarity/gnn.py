@@ -1,4 +1,3 @@
-import itertools
 from typing import Iterator, AsyncIterator
 import networkx as nx
 import numpy as np
@@ -16,6 +15,8 @@ from bioterms.database import get_active_vector_db
 METHOD_NAME = 'Hybrid Graph Neural Network with Text Embeddings'
 DEFAULT_SIMILARITY_THRESHOLD = 0.2
 
+_DEVICE_ROW_BLOCK_SIZE = 1024
+
 
 class ConceptGCN(nn.Module):
     """
@@ -170,17 +171,18 @@ def _sample_edge_pairs_for_training(edge_index: torch.Tensor,
     perm = torch.randperm(num_edges)[:num_samples]
     pos_pairs = edges[perm]  # Shape [K, 2]
 
-    neg_pairs = []
-    existing = set(map(tuple, edges.tolist()))
-    while len(neg_pairs) < num_samples:
-        i = torch.randint(0, num_nodes, (1,)).item()
-        j = torch.randint(0, num_nodes, (1,)).item()
-        if i == j:
-            continue
-        if (i, j) in existing or (j, i) in existing:
-            continue
-        neg_pairs.append((i, j))
-    neg_pairs = torch.tensor(neg_pairs, dtype=torch.long)
+    # Edges are keyed irrespective of direction, so (i, j) and (j, i) are rejected alike
+    existing = torch.minimum(edges[:, 0], edges[:, 1]) * num_nodes + torch.maximum(edges[:, 0], edges[:, 1])
+
+    neg_pairs = edges.new_empty((0, 2))
+    while neg_pairs.size(0) < num_samples:
+        # Oversample candidates, since self-loops and existing edges are thrown away
+        candidates = torch.randint(0, num_nodes, (num_samples * 4, 2), device=edges.device)
+        keys = torch.minimum(candidates[:, 0], candidates[:, 1]) * num_nodes \
+            + torch.maximum(candidates[:, 0], candidates[:, 1])
+        valid = (candidates[:, 0] != candidates[:, 1]) & ~torch.isin(keys, existing)
+        neg_pairs = torch.cat((neg_pairs, candidates[valid]))
+    neg_pairs = neg_pairs[:num_samples]
 
     return pos_pairs, neg_pairs
 
@@ -227,6 +229,10 @@ def _train_gnn_model(data: Data,
     if pos_pairs.numel() == 0:
         return IdentityGCN().to(device)
 
+    # Split the pairs into contiguous index columns once, instead of slicing them every epoch
+    pos_from, pos_to = pos_pairs[:, 0].contiguous(), pos_pairs[:, 1].contiguous()
+    neg_from, neg_to = neg_pairs[:, 0].contiguous(), neg_pairs[:, 1].contiguous()
+
     for _ in range(epochs):
         model.train()
         optimiser.zero_grad()
@@ -234,11 +240,8 @@ def _train_gnn_model(data: Data,
         z = model(x, edge_index)  # Shape [N, D]
         z = F.normalize(z, p=2, dim=1)
 
-        def pair_scores(pairs: torch.Tensor) -> torch.Tensor:
-            return (z[pairs[:, 0]] * z[pairs[:, 1]]).sum(dim=1)
-
-        pos_score = pair_scores(pos_pairs)
-        neg_score = pair_scores(neg_pairs)
+        pos_score = (z.index_select(0, pos_from) * z.index_select(0, pos_to)).sum(dim=-1)
+        neg_score = (z.index_select(0, neg_from) * z.index_select(0, neg_to)).sum(dim=-1)
 
         margin = 0.5
         loss = F.relu(margin - pos_score + neg_score).mean()
@@ -254,18 +257,48 @@ def _compute_similarity_matrix(embeddings: np.ndarray,
                                ) -> Iterator[tuple[str, str, float]]:
     """
     Compute cosine similarity matrix between node embeddings.
+
+    Scores are read out of the upper triangle one row slice at a time, so no Python-level work
+    happens per matrix element beyond yielding the result.
     :param embeddings: np.ndarray: Node embeddings array of shape [N, D]
     :param nodes: list[str]: List of node IDs corresponding to the embeddings.
-    :return: A pandas DataFrame with similarity scores.
+    :return: A generator yielding tuples of (concept_from, concept_to, similarity_score).
     """
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
     sim_matrix = embeddings @ embeddings.T  # Shape [N, N]
 
+    for i, node_from in enumerate(nodes[:-1]):
+        for node_to, sim in zip(nodes[i + 1:], sim_matrix[i, i + 1:].tolist()):
+            yield node_from, node_to, sim
+
+
+def _compute_similarity_matrix_on_device(z: torch.Tensor,
+                                         nodes: list[str],
+                                         ) -> Iterator[tuple[str, str, float]]:
+    """
+    Compute cosine similarity between node embeddings on the accelerator they were produced on.
+
+    The product is taken one block of rows at a time and each block is copied back to the host
+    once, so neither the full matrix nor the embeddings ever make the trip. Scores are then read
+    out of the block one row slice at a time, as in the host implementation.
+    On CUDA devices the product runs in half precision on the tensor cores.
+    :param z: Normalised node embeddings tensor [N, D], on the accelerator device.
+    :param nodes: list[str]: List of node IDs corresponding to the embeddings.
+    :return: A generator yielding tuples of (concept_from, concept_to, similarity_score).
+    """
+    if z.device.type == 'cuda':
+        z = z.half()
+
     n = len(nodes)
 
-    for i, j in itertools.combinations(range(n), 2):
-        sim = float(sim_matrix[i, j])
+    for start in range(0, n - 1, _DEVICE_ROW_BLOCK_SIZE):
+        stop = min(start + _DEVICE_ROW_BLOCK_SIZE, n - 1)
+        block = (z[start:stop] @ z[start + 1:].T).float().cpu().numpy()  # Shape [B, N - start - 1]
 
-        yield nodes[i], nodes[j], sim
+        # Column c of the block is node start + 1 + c, so row r starts at column r
+        for r, node_from in enumerate(nodes[start:stop]):
+            for node_to, sim in zip(nodes[start + 1 + r:], block[r, r:].tolist()):
+                yield node_from, node_to, sim
 
 
 async def calculate_similarity(target_graph: nx.DiGraph,
@@ -301,8 +334,12 @@ async def calculate_similarity(target_graph: nx.DiGraph,
         x = data.x.to(device)
         edge_index = data.edge_index.to(device)
         z = model(x, edge_index)  # Shape [N, D]
-        z = F.normalize(z, p=2)
-        embeddings = z.cpu().numpy()  # Shape [N, D]
+        z = F.normalize(z, p=2)  # Shape [N, D]
+
+    if device.type != 'cpu':
+        results = _compute_similarity_matrix_on_device(z, node_ids)
+    else:
+        results = _compute_similarity_matrix(z.cpu().numpy(), node_ids)
 
-    for result in _compute_similarity_matrix(embeddings, node_ids):
+    for result in results:
         yield result
@@ -0,0 +1,117 @@
+"""
+A process pool shared by the similarity methods, kept alive across calculations.
+"""
+
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Hashable
+import numpy as np
+
+from bioterms.etc.consts import CONFIG
+
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_KEY: tuple | None = None
+_SHARED_MEMORY: list[SharedMemory] = []
+_WORKER_SHARED_MEMORY: list[SharedMemory] = []
+
+
+def _share_arrays(arrays: dict[str, np.ndarray]) -> dict[str, tuple[str, tuple[int, ...], str]]:
+    """
+    Copy arrays into new shared memory blocks, owned by this module until the pool is shut down.
+    :param arrays: The arrays to share, by name.
+    :return: The (block name, shape, dtype) of each shared array, by name.
+    """
+    specs = {}
+
+    for name, array in arrays.items():
+        # Shared memory blocks cannot be empty
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+
+        _SHARED_MEMORY.append(block)
+        specs[name] = (block.name, array.shape, array.dtype.str)
+
+    return specs
+
+
+def _init_worker(initializer: Callable[..., Any],
+                 initargs: tuple,
+                 specs: dict[str, tuple[str, tuple[int, ...], str]],
+                 ):
+    """
+    Attach a worker process to the shared arrays, then run the similarity method's initializer.
+
+    The blocks are kept open for the lifetime of the worker, since the arrays handed to the
+    initializer are views on them; they are released when the worker exits.
+    :param initializer: The similarity method's worker initializer.
+    :param initargs: The positional arguments for the initializer.
+    :param specs: The (block name, shape, dtype) of each shared array, passed as keyword arguments.
+    """
+    arrays = {}
+
+    for name, (block_name, shape, dtype) in specs.items():
+        block = SharedMemory(name=block_name)
+        _WORKER_SHARED_MEMORY.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+    initializer(*initargs, **arrays)
+
+
+def get_pool(initializer: Callable[..., Any],
+             initargs: tuple,
+             key: Hashable | None,
+             shared_arrays: dict[str, np.ndarray] | None = None,
+             ) -> ProcessPoolExecutor:
+    """
+    Get the shared similarity process pool, with its workers initialised for the given data.
+
+    Worker initialisers only run when a worker starts, so the running pool is reused only when both
+    the initializer and the key match the previous call; otherwise its workers are shut down and a
+    new pool is started.
+    :param initializer: The function initialising each worker process.
+    :param initargs: The positional arguments passed to the initializer.
+    :param key: A fingerprint of the worker data, or None if the pool should never be reused.
+    :param shared_arrays: Arrays to place in shared memory once, rather than pickling them to every
+        worker. They are passed to the initializer as keyword arguments.
+    :return: The shared process pool.
+    """
+    global _POOL, _POOL_KEY
+
+    # A worker dying (e.g. killed for memory) leaves the executor permanently broken
+    if _POOL is not None and key is not None and _POOL_KEY == (initializer, key) \
+            and not getattr(_POOL, '_broken', False):
+        return _POOL
+
+    shutdown_pool()
+
+    _POOL = ProcessPoolExecutor(
+        max_workers=CONFIG.process_limit,
+        initializer=_init_worker,
+        initargs=(initializer, initargs, _share_arrays(shared_arrays or {})),
+    )
+    _POOL_KEY = (initializer, key)
+
+    return _POOL
+
+
+def shutdown_pool():
+    """
+    Shut down the shared similarity process pool, if one is running, and free its shared memory.
+    """
+    global _POOL, _POOL_KEY
+
+    if _POOL is not None:
+        _POOL.shutdown(wait=True, cancel_futures=True)
+
+    for block in _SHARED_MEMORY:
+        block.close()
+        block.unlink()
+
+    _SHARED_MEMORY.clear()
+    _POOL = None
+    _POOL_KEY = None
+
+
+atexit.register(shutdown_pool)
@@ -1,15 +1,14 @@
 import math
 import itertools
-from copy import deepcopy
-from concurrent.futures import ProcessPoolExecutor
-from functools import lru_cache
-from typing import AsyncIterator, Iterable, Iterator, TypeVar
+from typing import AsyncIterator
 import networkx as nx
+import numpy as np
 
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptRelationshipType
 from bioterms.etc.utils import iter_progress, verbose_print, schedule_tasks
-from .utils import count_annotation_for_graph, filter_edges_by_relationship
+from .pool import get_pool
+from .utils import count_annotation_for_graph, precompute_ancestors, relationship_subgraph
 
 
 METHOD_NAME = 'Relevance Method'
@@ -17,10 +16,13 @@ DEFAULT_SIMILARITY_THRESHOLD = 0.2
 CORPUS_REQUIRED = True
 CORPUS_GRAPH_REQUIRED = False
 
-_populated_target_graph: nx.DiGraph | None = None
+_ancestor_indptr: np.ndarray | None = None
+_ancestor_ranks: np.ndarray | None = None
+_by_rank: np.ndarray | None = None
+_ic: np.ndarray | None = None
+_annotation_counts: np.ndarray | None = None
 _max_annotation_count: int | None = None
-_PAIR_BATCH_SIZE = 256
-_T = TypeVar('_T')
+_row_starts: np.ndarray | None = None
 
 
 def _calculate_ic(target_graph: nx.DiGraph,
@@ -45,60 +47,198 @@ def _calculate_ic(target_graph: nx.DiGraph,
         )
 
 
-@lru_cache(maxsize=None)
-def _ancestors(node: str) -> frozenset[str]:
-    """Return the ontology ancestors of a node, cached within each worker."""
-    return frozenset(nx.descendants(_populated_target_graph, node)) | {node}
+def _collect_ancestors(target_graph: nx.DiGraph) -> tuple[list[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Collect the ancestors of every node with an information content, ordered for the MICA lookup.
+
+    Every ancestor of a node with an IC has an IC as well, since annotation counts only grow towards
+    the root. Ancestors are stored by their rank in descending IC order, so the smallest rank two
+    nodes share is their Most Informative Common Ancestor.
+    :param target_graph: The directed graph of the target vocabulary, with IC populated.
+    :return: A tuple of (nodes, ancestor_indptr, ancestor_ranks, by_rank). nodes are the nodes with an
+        IC in graph order; the sorted ancestor ranks (itself included) of node i are
+        `ancestor_ranks[ancestor_indptr[i]:ancestor_indptr[i + 1]]`, and `by_rank` maps a rank back
+        to its index in nodes.
+    """
+    graph_nodes, ancestor_sets = precompute_ancestors(target_graph)
+    ic = [target_graph.nodes[node].get('ic') for node in graph_nodes]
 
+    ic_nodes = [node for node in range(len(graph_nodes)) if ic[node] is not None]
+    by_rank = sorted(range(len(ic_nodes)), key=lambda idx: -ic[ic_nodes[idx]])
+    rank = [0] * len(graph_nodes)
+    for node_rank, idx in enumerate(by_rank):
+        rank[ic_nodes[idx]] = node_rank
 
-def _calculate_relevance_cached(node_1: str, node_2: str) -> float | None:
-    """Calculate relevance while avoiding repeated graph traversals."""
-    common_ancestors = _ancestors(node_1).intersection(_ancestors(node_2))
-    mica = max(
-        (node for node in common_ancestors if 'ic' in _populated_target_graph.nodes[node]),
-        key=lambda node: _populated_target_graph.nodes[node]['ic'],
-        default=None,
+    ancestor_ranks = [
+        sorted(rank[ancestor] for ancestor in ancestor_sets[node])
+        for node in ic_nodes
+    ]
+
+    return (
+        [graph_nodes[node] for node in ic_nodes],
+        np.cumsum([0] + [len(ranks) for ranks in ancestor_ranks], dtype=np.int64),
+        np.fromiter(itertools.chain.from_iterable(ancestor_ranks), dtype=np.int64),
+        np.asarray(by_rank, dtype=np.int64),
     )
-    if mica is None:
-        return None
 
-    return 2 * _populated_target_graph.nodes[mica]['ic'] / (
-        _populated_target_graph.nodes[node_1]['ic'] + _populated_target_graph.nodes[node_2]['ic']
-    ) * (1 - _populated_target_graph.nodes[mica]['annotation_count'] / _max_annotation_count)
 
+def _gather_ancestors(indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Gather the ancestor ranks of many nodes into one flat array.
+    :param indices: The node indices to gather ancestors for.
+    :return: A tuple of (positions, ranks), where positions[k] is the position in `indices` of the
+        node that ranks[k] belongs to.
+    """
+    starts = _ancestor_indptr[indices]
+    lengths = _ancestor_indptr[indices + 1] - starts
+    offsets = np.arange(lengths.sum()) + np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
 
-def _relevance_worker(
-    node_pairs: tuple[tuple[str, str], ...],
-) -> list[tuple[str, str, float | None]]:
+    return np.repeat(np.arange(len(indices)), lengths), _ancestor_ranks[offsets]
+
+
+def _find_mica(indices_1: np.ndarray, indices_2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     """
-    Worker function to calculate Relevance similarities for a batch of node pairs.
+    Find the Most Informative Common Ancestor of many node pairs at once.
+
+    The ancestor ranks of both sides are tagged with their pair position and sorted together; a
+    rank shared by both nodes of a pair then appears twice in a row, and the first such repeat of a
+    pair is its smallest shared rank.
+    :param indices_1: The first node index of each pair.
+    :param indices_2: The second node index of each pair.
+    :return: A tuple of (pairs, micas): the positions of the pairs that have a common ancestor, and
+        the node index of the MICA of each of them.
     """
-    return [
-        (node_1, node_2, _calculate_relevance_cached(node_1, node_2))
-        for node_1, node_2 in node_pairs
-    ]
+    node_count = len(_by_rank)
+    positions_1, ranks_1 = _gather_ancestors(indices_1)
+    positions_2, ranks_2 = _gather_ancestors(indices_2)
+
+    keys = np.concatenate((positions_1 * node_count + ranks_1, positions_2 * node_count + ranks_2))
+    keys.sort()
+    shared = keys[1:][keys[1:] == keys[:-1]]
+    pairs, first = np.unique(shared // node_count, return_index=True)
 
+    return pairs, _by_rank[shared[first] % node_count]
 
-def _batched(iterable: Iterable[_T], size: int) -> Iterator[tuple[_T, ...]]:
-    """Yield fixed-size tuples without materialising the pair combination."""
-    iterator = iter(iterable)
-    while batch := tuple(itertools.islice(iterator, size)):
-        yield batch
 
+def _relevance_worker(pair_range: tuple[int, int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Worker function to calculate Relevance similarities for a range of node pairs.
 
-def _worker_init(target_graph: nx.DiGraph,
-                 max_annotation_count: int,
+    Pairs are numbered row by row over the upper triangle, (0, 1), (0, 2), ..., (1, 2), ..., so a
+    task only carries its start and stop position and the worker expands them into node indices.
+    Pairs without a common ancestor, or whose nodes both have zero IC, are left out.
+    :param pair_range: The (start, stop) positions of the pairs to score.
+    :return: A tuple of (indices_1, indices_2, similarities) arrays.
+    """
+    pair_positions = np.arange(*pair_range, dtype=np.int64)
+    indices_1 = np.searchsorted(_row_starts, pair_positions, side='right') - 1
+    indices_2 = pair_positions - _row_starts[indices_1] + indices_1 + 1
+
+    pairs, micas = _find_mica(indices_1, indices_2)
+    indices_1 = indices_1[pairs]
+    indices_2 = indices_2[pairs]
+
+    ic_sums = _ic[indices_1] + _ic[indices_2]
+    resolved = ic_sums > 0
+    micas = micas[resolved]
+
+    similarities = 2 * _ic[micas] / ic_sums[resolved] * (
+        1 - _annotation_counts[micas] / _max_annotation_count
+    )
+
+    return indices_1[resolved], indices_2[resolved], similarities
+
+
+def _worker_init(max_annotation_count: int,
+                 ancestor_indptr: np.ndarray,
+                 ancestor_ranks: np.ndarray,
+                 by_rank: np.ndarray,
+                 ic: np.ndarray,
+                 annotation_counts: np.ndarray,
                  ):
     """
-    Initialise the worker with the target graph and maximum annotation count.
-    :param target_graph: The directed graph of the target vocabulary.
+    Initialise the worker with the precomputed ancestors and node attributes.
+
+    The arrays are views on shared memory set up by the parent process, so they are neither
+    pickled nor copied into each worker.
     :param max_annotation_count: The maximum annotation count in the target graph.
+    :param ancestor_indptr: The CSR index pointer into the ancestor ranks of each node.
+    :param ancestor_ranks: The sorted IC ranks of the ancestors of each node.
+    :param by_rank: The node index at each IC rank.
+    :param ic: The information content of each node.
+    :param annotation_counts: The annotation count of each node.
     """
-    global _populated_target_graph, _max_annotation_count
+    global _ancestor_indptr, _ancestor_ranks, _by_rank, _ic, _annotation_counts, _max_annotation_count, \
+        _row_starts
 
-    _populated_target_graph = target_graph
+    # The position of the first pair (i, i + 1) of each row i of the upper triangle
+    row_lengths = np.arange(len(ic) - 1, -1, -1, dtype=np.int64)
+    _row_starts = np.cumsum(row_lengths) - row_lengths
+    _ancestor_indptr = ancestor_indptr
+    _ancestor_ranks = ancestor_ranks
+    _by_rank = by_rank
+    _ic = ic
+    _annotation_counts = annotation_counts
     _max_annotation_count = max_annotation_count
-    _ancestors.cache_clear()
+
+
+async def calculate_relevance_scores(target_graph: nx.DiGraph,
+                                     max_annotation: int | float,
+                                     annotation_attribute: str,
+                                     description: str = 'Calculate relevance similarity scores between '
+                                                        'terms in the target graph.',
+                                     ) -> AsyncIterator[tuple[str, str, float]]:
+    """
+    Score every pair of nodes with an information content with the Relevance formula.
+
+    This is shared by the Relevance method and its weighed variant, which only differ in how the
+    annotation weight and information content of each node are derived.
+    :param target_graph: The directed graph of the target vocabulary, with IC and annotation weight
+        populated as node attributes.
+    :param max_annotation: The maximum annotation weight in the target graph.
+    :param annotation_attribute: The node attribute holding the annotation weight.
+    :param description: The progress description for the scoring tasks.
+    :return: A generator yielding tuples of (concept_from, concept_to, similarity_score).
+    """
+    nodes_with_ic, ancestor_indptr, ancestor_ranks, by_rank = _collect_ancestors(target_graph)
+    pair_count = len(nodes_with_ic) * (len(nodes_with_ic) - 1) // 2
+    batch_size = CONFIG.similarity_batch_size
+    pair_ranges = (
+        (start, min(start + batch_size, pair_count))
+        for start in range(0, pair_count, batch_size)
+    )
+
+    verbose_print(f'Calculating similarity for {len(nodes_with_ic)} nodes, '
+                  f'total {pair_count} pairs.')
+
+    shared_arrays = {
+        'ancestor_indptr': ancestor_indptr,
+        'ancestor_ranks': ancestor_ranks,
+        'by_rank': by_rank,
+        'ic': np.array([target_graph.nodes[node]['ic'] for node in nodes_with_ic], dtype=np.float64),
+        'annotation_counts': np.array(
+            [target_graph.nodes[node][annotation_attribute] for node in nodes_with_ic],
+            dtype=np.float64,
+        ),
+    }
+    executor = get_pool(
+        initializer=_worker_init,
+        initargs=(max_annotation,),
+        key=hash((max_annotation, *(array.tobytes() for array in shared_arrays.values()))),
+        shared_arrays=shared_arrays,
+    )
+
+    async for indices_from, indices_to, similarities in schedule_tasks(
+        executor=executor,
+        func=_relevance_worker,
+        iterable=pair_ranges,
+        description=description,
+        total=math.ceil(pair_count / batch_size),
+    ):
+        for index_from, index_to, similarity in zip(
+            indices_from.tolist(), indices_to.tolist(), similarities.tolist(),
+        ):
+            yield nodes_with_ic[index_from], nodes_with_ic[index_to], similarity
 
 
 async def calculate_similarity(target_graph: nx.MultiDiGraph,
@@ -117,14 +257,12 @@ async def calculate_similarity(target_graph: nx.MultiDiGraph,
     :return: A generator yielding tuples of (concept_from, concept_to, similarity_score).
     """
     # Count the annotations for each node in the target graph
-    target_graph = deepcopy(target_graph)
-    filter_edges_by_relationship(
+    target_graph = relationship_subgraph(
         graph=target_graph,
         relationship_types={ConceptRelationshipType.IS_A, ConceptRelationshipType.PART_OF},
     )
     verbose_print(f'Relationship filtered down to {len(target_graph.edges)} edges in target graph.')
 
-    target_graph = nx.DiGraph(target_graph)
     annotation_graph = annotation_graph.to_undirected()
 
     count_annotation_for_graph(
@@ -145,28 +283,9 @@ async def calculate_similarity(target_graph: nx.MultiDiGraph,
         max_annotation_count=max_annotation_count,
     )
 
-    nodes_with_ic = [node for node in target_graph.nodes if 'ic' in target_graph.nodes[node]]
-    node_pairs = itertools.combinations(nodes_with_ic, 2)
-    pair_count = len(nodes_with_ic) * (len(nodes_with_ic) - 1) // 2
-    pair_batches = _batched(node_pairs, _PAIR_BATCH_SIZE)
-    batch_count = math.ceil(pair_count / _PAIR_BATCH_SIZE)
-
-    verbose_print(f'Calculating similarity for {len(nodes_with_ic)} nodes, '
-                  f'total {pair_count} pairs.')
-
-    with ProcessPoolExecutor(
-        max_workers=CONFIG.process_limit,
-        initializer=_worker_init,
-        initargs=(target_graph, max_annotation_count),
-    ) as executor:
-        async for results in schedule_tasks(
-            executor=executor,
-            func=_relevance_worker,
-            iterable=pair_batches,
-            description='Calculate relevance similarity scores between terms in the target graph.',
-            total=batch_count,
-        ):
-            for concept_from, concept_to, similarity in results:
-
-                if similarity is not None:
-                    yield concept_from, concept_to, similarity
+    async for result in calculate_relevance_scores(
+        target_graph=target_graph,
+        max_annotation=max_annotation_count,
+        annotation_attribute='annotation_count',
+    ):
+        yield result
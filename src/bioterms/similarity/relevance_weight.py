@@ -1,15 +1,14 @@
 import math
-import itertools
-from copy import deepcopy
-from concurrent.futures import ProcessPoolExecutor
-from functools import lru_cache
-from typing import AsyncIterator, Iterable, Iterator, TypeVar
+from typing import AsyncIterator
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
 
-from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptRelationshipType
-from bioterms.etc.utils import iter_progress, verbose_print, schedule_tasks
-from .utils import filter_edges_by_relationship
+from bioterms.etc.utils import verbose_print
+from .relevance import calculate_relevance_scores
+from .utils import accumulate_to_ancestors, annotation_adjacency, graph_to_csr, relationship_subgraph, \
+    topological_order
 
 
 METHOD_NAME = 'Weighed Relevance Method'
@@ -17,195 +16,97 @@ DEFAULT_SIMILARITY_THRESHOLD = 0.2
 CORPUS_REQUIRED = True
 CORPUS_GRAPH_REQUIRED = True
 
-_populated_target_graph: nx.DiGraph | None = None
-_max_annotation_sum: float | None = None
 _tune_factor = 0.5
 _convergence_threshold = 1e-3
-_PAIR_BATCH_SIZE = 256
-_T = TypeVar('_T')
 
 
-def _direct_annotation_sum(node: str,
-                           target_prefix: ConceptPrefix,
-                           corpus_prefix: ConceptPrefix,
-                           annotation_graph: nx.Graph,
-                           corpus_graph: nx.DiGraph,
-                           is_first_iteration: bool,
-                           ) -> float:
+def _direct_annotation_weights(corpus_ic: np.ndarray,
+                               corpus_nodes: list[str],
+                               annotations: sp.csr_array,
+                               is_first_iteration: bool,
+                               ) -> np.ndarray:
     """
-    Sum the annotation contribution weights directly annotated on a node.
-    :param node: The target graph node to sum direct annotations for.
-    :param target_prefix: The prefix of the target vocabulary.
-    :param corpus_prefix: The prefix of the corpus vocabulary.
-    :param annotation_graph: The directed graph of the annotation between target and corpus.
-    :param corpus_graph: The directed graph of the corpus vocabulary.
+    Calculate the contribution weight of every corpus node when annotated on a target node.
+    :param corpus_ic: The information content of each corpus node, NaN where it has none yet.
+    :param corpus_nodes: The corpus node IDs, in the same order as `corpus_ic`.
+    :param annotations: The [T, C] target-by-corpus annotation matrix.
     :param is_first_iteration: Whether this is the first iteration of calculation.
-    :return: The summed direct annotation contribution weight.
-    """
-    annotation_name = f'{target_prefix.value}:{node}'
-    direct_annotation_nodes = annotation_graph.neighbors(annotation_name) \
-        if annotation_name in annotation_graph else []
-
-    direct_annotation_sum = 0
-    for annotation_node in direct_annotation_nodes:
-        if not annotation_node.startswith(f'{corpus_prefix.value}:'):
-            continue
-
-        corpus_node = annotation_node.split(':', 1)[1]
-        if 'ic' in corpus_graph.nodes[corpus_node]:
-            direct_annotation_sum += math.exp(_tune_factor * corpus_graph.nodes[corpus_node]['ic'])
-        elif is_first_iteration:
-            # In the first iteration, we assign a default contribution weight
-            direct_annotation_sum += 0.5
-        else:
-            # A directly annotated corpus node must have an IC
-            raise ValueError(f'Corpus node {corpus_node} does not have IC value.')
-
-    return direct_annotation_sum
-
-
-def _child_annotation_sum(node: str,
-                          target_graph: nx.DiGraph,
-                          ) -> float:
+    :return: The contribution weight of each corpus node.
     """
-    Sum the already-computed annotation sums of a node's children (topological predecessors).
+    weights = np.exp(_tune_factor * corpus_ic)
+    missing = np.isnan(corpus_ic)
 
-    The IS_A relationship is from child to parent, so the predecessors are the children.
-    :param node: The target graph node to sum child annotation sums for.
-    :param target_graph: The directed graph of the target vocabulary.
-    :return: The summed child annotation contribution weight.
-    """
-    child_annotation_sum = 0
-    for child in target_graph.predecessors(node):
-        if 'annotation_sum' not in target_graph.nodes[child]:
-            # A child should have been processed before the parent in topological order
-            raise ValueError(f'Child node {child} has not been processed yet.')
+    if is_first_iteration:
+        # In the first iteration, we assign a default contribution weight
+        weights[missing] = 0.5
+    else:
+        # A directly annotated corpus node must have an IC
+        annotated = np.zeros(len(corpus_nodes), dtype=bool)
+        annotated[annotations.indices] = True
+        invalid = np.flatnonzero(missing & annotated)
+        if len(invalid):
+            raise ValueError(f'Corpus node {corpus_nodes[invalid[0]]} does not have IC value.')
 
-        child_annotation_sum += target_graph.nodes[child]['annotation_sum']
+        weights[missing] = 0
 
-    return child_annotation_sum
+    return weights
 
 
-def _sum_annotation_for_graph(target_graph: nx.DiGraph,
-                              corpus_graph: nx.DiGraph,
-                              annotation_graph: nx.Graph,
-                              target_prefix: ConceptPrefix,
-                              corpus_prefix: ConceptPrefix,
+def _sum_annotation_for_graph(hierarchy: tuple[np.ndarray, np.ndarray, list[int]],
+                              annotations: sp.csr_array,
+                              corpus_ic: np.ndarray,
+                              corpus_nodes: list[str],
                               is_first_iteration: bool = False,
-                              ) -> None:
+                              ) -> np.ndarray:
     """
-    Sum annotation contribution weights for each node in the target graph, and add them as node attributes.
-    :param target_graph: The directed graph of the target vocabulary.
-    :param corpus_graph: The directed graph of the corpus vocabulary.
-    :param annotation_graph: The directed graph of the annotation between target and corpus.
-    :param target_prefix: The prefix of the target vocabulary.
-    :param corpus_prefix: The prefix of the corpus vocabulary.
+    Sum annotation contribution weights for each node in the target graph, over the node's own
+    annotations and those of all its descendants.
+    :param hierarchy: The (indptr, indices, order) CSR hierarchy of the target graph.
+    :param annotations: The [T, C] target-by-corpus annotation matrix.
+    :param corpus_ic: The information content of each corpus node, NaN where it has none yet.
+    :param corpus_nodes: The corpus node IDs, in the same order as `corpus_ic`.
     :param is_first_iteration: Whether this is the first iteration of calculation.
+    :return: The annotation sum of each target node.
     """
-    order = list(nx.topological_sort(target_graph))
-
-    for node in iter_progress(
-        order,
-        description='Calculating annotation sums for target graph',
-        total=len(order),
-    ):
-        direct_annotation_sum = _direct_annotation_sum(
-            node, target_prefix, corpus_prefix, annotation_graph, corpus_graph, is_first_iteration,
-        )
-        child_annotation_sum = _child_annotation_sum(node, target_graph)
+    weights = _direct_annotation_weights(corpus_ic, corpus_nodes, annotations, is_first_iteration)
+    indptr, indices, order = hierarchy
 
-        target_graph.nodes[node]['annotation_sum'] = direct_annotation_sum + child_annotation_sum
+    return accumulate_to_ancestors(indptr, indices, order, annotations @ weights)
 
 
-def _calculate_ic(target_graph: nx.DiGraph) -> float:
+def _calculate_ic(annotation_sums: np.ndarray,
+                  previous_ic: np.ndarray,
+                  ) -> tuple[np.ndarray, float]:
     """
     Calculate the information content for each node in the target graph.
-    :param target_graph: The directed graph of the target vocabulary.
-    :return: The maximum change in IC values across all nodes.
+    :param annotation_sums: The annotation sum of each node.
+    :param previous_ic: The information content of each node from the previous iteration, NaN
+        where it had none.
+    :return: A tuple of (ic, max_delta): the information content of each node, NaN where the node
+        and its descendants have no annotations, and the maximum change in IC values across all
+        nodes.
     """
-    max_annotation_sum = max(
-        target_graph.nodes[node].get('annotation_sum', 0) for node in target_graph.nodes
-    )
-
-    max_delta = 0
-
-    for node in iter_progress(
-        target_graph.nodes,
-        description='Calculating Information Content',
-        total=target_graph.number_of_nodes(),
-        transient=True,
-    ):
-        if 'annotation_sum' not in target_graph.nodes[node] or target_graph.nodes[node]['annotation_sum'] == 0:
-            # The node and its descendants have no annotations, IC is infinite
-            continue
-
-        new_ic = -1 * math.log(
-            target_graph.nodes[node]['annotation_sum'] / max_annotation_sum
-        )
-        if 'ic' in target_graph.nodes[node]:
-            delta = abs(new_ic - target_graph.nodes[node]['ic'])
-            if delta > max_delta:
-                max_delta = delta
-
-        target_graph.nodes[node]['ic'] = new_ic
-
-    return max_delta
+    max_annotation_sum = annotation_sums.max(initial=0)
+    annotated = annotation_sums > 0
 
+    ic = previous_ic.copy()
+    ic[annotated] = -1 * np.log(annotation_sums[annotated] / max_annotation_sum)
 
-@lru_cache(maxsize=None)
-def _ancestors(node: str) -> frozenset[str]:
-    """Return the ontology ancestors of a node, cached within each worker."""
-    return frozenset(nx.descendants(_populated_target_graph, node)) | {node}
+    changed = annotated & ~np.isnan(previous_ic)
+    max_delta = float(np.abs(ic[changed] - previous_ic[changed]).max(initial=0))
 
-
-def _calculate_relevance_cached(node_1: str, node_2: str) -> float | None:
-    """Calculate weighed relevance without repeating graph traversals."""
-    common_ancestors = _ancestors(node_1).intersection(_ancestors(node_2))
-    mica = max(
-        (node for node in common_ancestors if 'ic' in _populated_target_graph.nodes[node]),
-        key=lambda node: _populated_target_graph.nodes[node]['ic'],
-        default=None,
-    )
-    if mica is None:
-        return None
-
-    return 2 * _populated_target_graph.nodes[mica]['ic'] / (
-        _populated_target_graph.nodes[node_1]['ic'] + _populated_target_graph.nodes[node_2]['ic']
-    ) * (1 - _populated_target_graph.nodes[mica]['annotation_sum'] / _max_annotation_sum)
+    return ic, max_delta
 
 
-def _relevance_worker(
-    node_pairs: tuple[tuple[str, str], ...],
-) -> list[tuple[str, str, float | None]]:
+def _hierarchy(graph: nx.DiGraph) -> tuple[tuple[np.ndarray, np.ndarray, list[int]], list[str]]:
     """
-    Worker function to calculate weighed Relevance for a batch of node pairs.
+    Convert a vocabulary graph into the CSR hierarchy swept by the annotation sums.
+    :param graph: The directed graph of the vocabulary.
+    :return: A tuple of ((indptr, indices, order), nodes).
     """
-    return [
-        (node_1, node_2, _calculate_relevance_cached(node_1, node_2))
-        for node_1, node_2 in node_pairs
-    ]
+    indptr, indices, _, nodes = graph_to_csr(graph)
 
-
-def _batched(iterable: Iterable[_T], size: int) -> Iterator[tuple[_T, ...]]:
-    """Yield fixed-size tuples without materialising every node pair."""
-    iterator = iter(iterable)
-    while batch := tuple(itertools.islice(iterator, size)):
-        yield batch
-
-
-def _worker_init(target_graph: nx.DiGraph,
-                 max_annotation_sum: float,
-                 ):
-    """
-    Initialise the worker with the target graph and maximum annotation count.
-    :param target_graph: The directed graph of the target vocabulary.
-    :param max_annotation_sum: The maximum annotation count in the target graph.
-    """
-    global _populated_target_graph, _max_annotation_sum
-
-    _populated_target_graph = target_graph
-    _max_annotation_sum = max_annotation_sum
-    _ancestors.cache_clear()
+    return (indptr, indices, topological_order(indptr, indices)), nodes
 
 
 async def calculate_similarity(target_graph: nx.MultiDiGraph,
@@ -227,52 +128,60 @@ async def calculate_similarity(target_graph: nx.MultiDiGraph,
     :param annotation_graph: The directed graph of the annotation between target and corpus.
     :return: A generator yielding tuples of (concept_from, concept_to, similarity_score).
     """
-    target_graph = deepcopy(target_graph)
-    filter_edges_by_relationship(
+    target_graph = relationship_subgraph(
         graph=target_graph,
         relationship_types={ConceptRelationshipType.IS_A, ConceptRelationshipType.PART_OF},
     )
     verbose_print(f'Relationship filtered down to {len(target_graph.edges)} edges in target graph.')
 
-    corpus_graph = deepcopy(corpus_graph)
-    filter_edges_by_relationship(
+    corpus_graph = relationship_subgraph(
         graph=corpus_graph,
         relationship_types={ConceptRelationshipType.IS_A, ConceptRelationshipType.PART_OF},
     )
     verbose_print(f'Relationship filtered down to {len(corpus_graph.edges)} edges in corpus graph.')
 
-    target_graph = nx.DiGraph(target_graph)
-    corpus_graph = nx.DiGraph(corpus_graph)
     annotation_graph = annotation_graph.to_undirected()
 
+    target_hierarchy, target_nodes = _hierarchy(target_graph)
+    corpus_hierarchy, corpus_nodes = _hierarchy(corpus_graph)
+    target_annotations, _ = annotation_adjacency(
+        annotation_graph=annotation_graph,
+        row_nodes=target_nodes,
+        row_prefix=target_prefix,
+        column_prefix=corpus_prefix,
+        column_nodes=corpus_nodes,
+    )
+    corpus_annotations = target_annotations.T.tocsr()
+
+    target_ic = np.full(len(target_nodes), np.nan)
+    corpus_ic = np.full(len(corpus_nodes), np.nan)
+
     # Iteratively calculate annotation sums and information content until convergence
     iteration = 0
     while True:
         verbose_print(f'Iteration {iteration + 1}: Calculating annotation sums on target graph...')
-        _sum_annotation_for_graph(
-            target_graph=target_graph,
-            corpus_graph=corpus_graph,
-            annotation_graph=annotation_graph,
-            target_prefix=target_prefix,
-            corpus_prefix=corpus_prefix,
+        target_sums = _sum_annotation_for_graph(
+            hierarchy=target_hierarchy,
+            annotations=target_annotations,
+            corpus_ic=corpus_ic,
+            corpus_nodes=corpus_nodes,
             is_first_iteration=(iteration == 0),
         )
 
         verbose_print(f'Iteration {iteration + 1}: Calculating information content on target graph...')
-        max_delta_target = _calculate_ic(target_graph=target_graph)
+        target_ic, max_delta_target = _calculate_ic(target_sums, target_ic)
         verbose_print(f'Iteration {iteration + 1}: Maximum IC change on target = {max_delta_target:.6f}')
 
         verbose_print(f'Iteration {iteration + 1}: Calculating annotation sums on corpus graph...')
-        _sum_annotation_for_graph(
-            target_graph=corpus_graph,
-            corpus_graph=target_graph,
-            annotation_graph=annotation_graph,
-            target_prefix=corpus_prefix,
-            corpus_prefix=target_prefix,
+        corpus_sums = _sum_annotation_for_graph(
+            hierarchy=corpus_hierarchy,
+            annotations=corpus_annotations,
+            corpus_ic=target_ic,
+            corpus_nodes=target_nodes,
         )
 
         verbose_print(f'Iteration {iteration + 1}: Calculating IC sum on corpus graph...')
-        max_delta_corpus = _calculate_ic(target_graph=corpus_graph)
+        corpus_ic, max_delta_corpus = _calculate_ic(corpus_sums, corpus_ic)
         verbose_print(f'Iteration {iteration + 1}: Maximum IC change on corpus = {max_delta_corpus:.6f}')
 
         if iteration > 0 and max(max_delta_target, max_delta_corpus) < _convergence_threshold:
@@ -282,31 +191,17 @@ async def calculate_similarity(target_graph: nx.MultiDiGraph,
         iteration += 1
 
     # IC is ready, use the same formula as standard Relevance method
-    nodes_with_ic = [node for node in target_graph.nodes if 'ic' in target_graph.nodes[node]]
-    node_pairs = itertools.combinations(nodes_with_ic, 2)
-    pair_count = len(nodes_with_ic) * (len(nodes_with_ic) - 1) // 2
-    pair_batches = _batched(node_pairs, _PAIR_BATCH_SIZE)
-    batch_count = math.ceil(pair_count / _PAIR_BATCH_SIZE)
-    max_annotation_sum = max(
-        target_graph.nodes[node].get('annotation_sum', 0) for node in target_graph
+    nx.set_node_attributes(target_graph, dict(zip(target_nodes, target_sums.tolist())), 'annotation_sum')
+    nx.set_node_attributes(
+        target_graph,
+        {node: ic for node, ic in zip(target_nodes, target_ic.tolist()) if not math.isnan(ic)},
+        'ic',
     )
 
-    verbose_print(f'Calculating similarity for {len(nodes_with_ic)} nodes, '
-                  f'total {pair_count} pairs.')
-
-    with ProcessPoolExecutor(
-        max_workers=CONFIG.process_limit,
-        initializer=_worker_init,
-        initargs=(target_graph, max_annotation_sum),
-    ) as executor:
-        async for results in schedule_tasks(
-            executor=executor,
-            func=_relevance_worker,
-            iterable=pair_batches,
-            description='Calculate weighed relevance similarity scores between terms in the target graph.',
-            total=batch_count,
-        ):
-            for concept_from, concept_to, similarity in results:
-
-                if similarity is not None:
-                    yield concept_from, concept_to, similarity
+    async for result in calculate_relevance_scores(
+        target_graph=target_graph,
+        max_annotation=target_sums.max(initial=0),
+        annotation_attribute='annotation_sum',
+        description='Calculate weighed relevance similarity scores between terms in the target graph.',
+    ):
+        yield result
@@ -1,9 +1,16 @@
 import networkx as nx
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.linalg import spsolve_triangular
 
 from bioterms.etc.enums import ConceptPrefix, ConceptRelationshipType
 from bioterms.etc.utils import iter_progress, verbose_print
 
 
+_ANCESTOR_CACHE_KEY: tuple[tuple[str, ...], bytes, bytes] | None = None
+_ANCESTOR_CACHE: list[frozenset[int]] | None = None
+
+
 def filter_edges_by_relationship(graph: nx.MultiDiGraph | nx.DiGraph,
                                  relationship_types: set[ConceptRelationshipType],
                                  ):
@@ -36,6 +43,248 @@ def filter_edges_by_relationship(graph: nx.MultiDiGraph | nx.DiGraph,
     graph.remove_edges_from(edges_to_remove)
 
 
+def relationship_subgraph(graph: nx.MultiDiGraph | nx.DiGraph,
+                          relationship_types: set[ConceptRelationshipType],
+                          ) -> nx.DiGraph:
+    """
+    Build a new directed graph holding every node of the graph, but only the edges of the given
+    relationship types, in a single pass.
+
+    Unlike deep-copying the graph and removing edges from the copy, attribute dictionaries are only
+    copied shallowly, and the edges that are dropped are never copied at all.
+    :param graph: The graph to take nodes and edges from. It is not modified.
+    :param relationship_types: The relationship types of the edges to keep.
+    :return: A new DiGraph with the kept edges; parallel edges are merged.
+    """
+    subgraph = nx.DiGraph()
+    subgraph.add_nodes_from(graph.nodes(data=True))
+    subgraph.add_edges_from(
+        (u, v, data) for u, v, data in iter_progress(
+            graph.edges(data=True),
+            description='Filtering edges by relationship types',
+            total=graph.number_of_edges(),
+        )
+        if data.get('label') in relationship_types
+    )
+
+    verbose_print(f'Kept {subgraph.number_of_edges()} edges matching specified relationship types.')
+
+    return subgraph
+
+
+def annotation_adjacency(annotation_graph: nx.Graph,
+                         row_nodes: list[str],
+                         row_prefix: ConceptPrefix,
+                         column_prefix: ConceptPrefix,
+                         column_nodes: list[str] | None = None,
+                         ) -> tuple[sp.csr_array, list[str]]:
+    """
+    Convert the annotations between two vocabularies into a binary sparse matrix over integer node
+    indices, so that later sweeps never have to format or prefix-check an annotation node name.
+
+    Each annotation edge is split into its prefix and node ID once; edges between other prefixes,
+    or to nodes outside the given node lists, are dropped.
+    :param annotation_graph: The undirected graph of the annotation between the two vocabularies.
+    :param row_nodes: The bare node IDs of the first vocabulary, one per matrix row.
+    :param row_prefix: The prefix of the first vocabulary.
+    :param column_prefix: The prefix of the second vocabulary.
+    :param column_nodes: The bare node IDs of the second vocabulary, one per matrix column. If None,
+        every node of the second vocabulary in the annotation graph gets a column, in the order
+        they are first seen.
+    :return: A tuple of (matrix, column_nodes), with a one where row node i is annotated with column
+        node j.
+    """
+    row_index = {node: idx for idx, node in enumerate(row_nodes)}
+    if column_nodes is None:
+        column_index = {}
+        discover_columns = True
+    else:
+        column_index = {node: idx for idx, node in enumerate(column_nodes)}
+        discover_columns = False
+
+    rows = []
+    cols = []
+    for u, v in annotation_graph.edges():
+        prefix_u, _, node_u = u.partition(':')
+        prefix_v, _, node_v = v.partition(':')
+
+        if prefix_u == column_prefix.value and prefix_v == row_prefix.value:
+            node_u, node_v = node_v, node_u
+        elif prefix_u != row_prefix.value or prefix_v != column_prefix.value:
+            continue
+
+        row = row_index.get(node_u)
+        if row is None:
+            continue
+
+        if discover_columns:
+            col = column_index.setdefault(node_v, len(column_index))
+        else:
+            col = column_index.get(node_v)
+            if col is None:
+                continue
+
+        rows.append(row)
+        cols.append(col)
+
+    matrix = sp.csr_array(
+        (
+            np.ones(len(rows), dtype=np.int32),
+            (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)),
+        ),
+        shape=(len(row_nodes), len(column_index)),
+    )
+    # An annotation stored in both directions of a directed graph is summed into a two
+    matrix.data[:] = 1
+
+    return matrix, list(column_index) if discover_columns else column_nodes
+
+
+def graph_to_csr(graph: nx.DiGraph) -> tuple[np.ndarray, np.ndarray, dict[str, int], list[str]]:
+    """
+    Convert a directed graph into a CSR adjacency representation over integer node indices.
+
+    The successors of node i are `indices[indptr[i]:indptr[i + 1]]`; as IS_A relationships point
+    from child to parent, these are the parents of the node.
+    :param graph: The directed graph to convert.
+    :return: A tuple of (indptr, indices, node_to_idx, idx_to_node).
+    """
+    idx_to_node = list(graph.nodes)
+    node_to_idx = {node: idx for idx, node in enumerate(idx_to_node)}
+
+    edges = np.array(
+        [(node_to_idx[u], node_to_idx[v]) for u, v in graph.edges()],
+        dtype=np.int32,
+    ).reshape(-1, 2)
+    edges = edges[np.argsort(edges[:, 0], kind='stable')]
+
+    indptr = np.zeros(len(idx_to_node) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(edges[:, 0], minlength=len(idx_to_node)), out=indptr[1:])
+
+    return indptr, edges[:, 1].copy(), node_to_idx, idx_to_node
+
+
+def topological_order(indptr: np.ndarray,
+                      indices: np.ndarray,
+                      ) -> list[int]:
+    """
+    Order the nodes of a CSR graph so that every node comes before its successors (Kahn's algorithm).
+    :param indptr: The CSR index pointer array.
+    :param indices: The CSR successor index array.
+    :return: The node indices in topological order.
+    """
+    node_count = len(indptr) - 1
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+    in_degree = np.bincount(indices, minlength=node_count).tolist()
+
+    order = [node for node in range(node_count) if in_degree[node] == 0]
+    for node in order:
+        for successor in indices[indptr[node]:indptr[node + 1]]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                order.append(successor)
+
+    if len(order) != node_count:
+        raise ValueError('The graph contains a cycle and has no topological order.')
+
+    return order
+
+
+def collect_ancestor_sets(indptr: np.ndarray,
+                          indices: np.ndarray,
+                          order: list[int],
+                          ) -> list[frozenset[int]]:
+    """
+    Collect the ancestors of every node of a CSR graph, itself included, in one sweep over the
+    reversed topological order, so no node's ancestry is traversed more than once.
+    :param indptr: The CSR index pointer array.
+    :param indices: The CSR successor (parent) index array.
+    :param order: The node indices in topological order.
+    :return: The frozen set of ancestor indices of each node.
+    """
+    indptr = indptr.tolist()
+    indices = indices.tolist()
+
+    ancestor_sets: list[frozenset[int] | None] = [None] * (len(indptr) - 1)
+
+    # Parents come after their children in topological order, so walk it backwards
+    for node in reversed(order):
+        ancestors = {node}
+        for parent in indices[indptr[node]:indptr[node + 1]]:
+            ancestors |= ancestor_sets[parent]
+        ancestor_sets[node] = frozenset(ancestors)
+
+    return ancestor_sets
+
+
+def precompute_ancestors(graph: nx.DiGraph) -> tuple[list[str], list[frozenset[int]]]:
+    """
+    Collect the ancestors of every node in the graph, reusing the result of the previous call if
+    the graph has the same nodes and edges.
+
+    Ancestors only depend on the hierarchy, so calculating several similarity methods, or against
+    several corpora, for the same target vocabulary in one process sweeps it only once.
+    :param graph: The directed graph, with edges from child to parent.
+    :return: A tuple of (nodes, ancestor_sets), with the frozen set of ancestor indices (itself
+        included) of each node in the same order as `nodes`.
+    """
+    global _ANCESTOR_CACHE_KEY, _ANCESTOR_CACHE
+
+    indptr, indices, _, idx_to_node = graph_to_csr(graph)
+    key = (tuple(idx_to_node), indptr.tobytes(), indices.tobytes())
+
+    if key != _ANCESTOR_CACHE_KEY:
+        _ANCESTOR_CACHE = collect_ancestor_sets(
+            indptr=indptr,
+            indices=indices,
+            order=topological_order(indptr, indices),
+        )
+        _ANCESTOR_CACHE_KEY = key
+    else:
+        verbose_print('Reusing ancestors collected for an identical graph.')
+
+    return idx_to_node, _ANCESTOR_CACHE
+
+
+def accumulate_to_ancestors(indptr: np.ndarray,
+                            indices: np.ndarray,
+                            order: list[int],
+                            values: np.ndarray,
+                            ) -> np.ndarray:
+    """
+    Accumulate node values up a CSR graph, so that every node holds its own value plus the
+    accumulated values of all its children, counted once per path.
+
+    This is the linear system (I - A) x = values over the child-to-parent adjacency A. Numbering the
+    nodes in topological order makes it lower triangular, so it is solved by compiled forward
+    substitution rather than a Python loop over the edges.
+    :param indptr: The CSR index pointer array.
+    :param indices: The CSR successor (parent) index array.
+    :param order: The node indices in topological order.
+    :param values: The value of each node.
+    :return: The accumulated value of each node, as float64.
+    """
+    node_count = len(indptr) - 1
+    position = np.empty(node_count, dtype=np.int64)
+    position[order] = np.arange(node_count)
+
+    children = np.repeat(np.arange(node_count), np.diff(indptr))
+    system = sp.eye_array(node_count, format='csr') - sp.csr_array(
+        (np.ones(len(indices)), (position[indices], position[children])),
+        shape=(node_count, node_count),
+    )
+
+    accumulated = np.empty(node_count, dtype=np.float64)
+    accumulated[order] = spsolve_triangular(
+        system.tocsr(),
+        np.asarray(values, dtype=np.float64)[order],
+        lower=True,
+    )
+
+    return accumulated
+
+
 def count_annotation_for_graph(target_graph: nx.DiGraph,
                                annotation_graph: nx.Graph,
                                target_prefix: ConceptPrefix,
@@ -46,29 +295,22 @@ def count_annotation_for_graph(target_graph: nx.DiGraph,
     :param annotation_graph: The directed graph of the annotation between target and corpus.
     :param target_prefix: The prefix of the target vocabulary.
     """
-    order = list(nx.topological_sort(target_graph))
+    indptr, indices, _, idx_to_node = graph_to_csr(target_graph)
+    order = topological_order(indptr, indices)
 
-    for node in iter_progress(
-        order,
-        description='Calculating annotation counts for target graph',
-        total=len(order),
-    ):
+    direct_counts = np.zeros(len(idx_to_node), dtype=np.int64)
+    for idx, node in enumerate(idx_to_node):
         annotation_name = f'{target_prefix.value}:{node}'
+        if annotation_name in annotation_graph:
+            direct_counts[idx] = annotation_graph.degree[annotation_name]
 
-        direct_annotation_count = annotation_graph.degree[annotation_name] \
-            if annotation_name in annotation_graph else 0
+    annotation_counts = np.rint(accumulate_to_ancestors(indptr, indices, order, direct_counts))
 
-        # The IS_A relationship is from child to parent, so the predecessors are the children
-        child_annotation_sum = 0
-        for child in target_graph.predecessors(node):
-            if 'annotation_count' in target_graph.nodes[child]:
-                child_annotation_sum += target_graph.nodes[child]['annotation_count']
-            else:
-                # A child should have been processed before the parent in topological order
-                raise ValueError(f'Child node {child} has not been processed yet.')
-
-        total_annotation_count = direct_annotation_count + child_annotation_sum
-        target_graph.nodes[node]['annotation_count'] = total_annotation_count
+    nx.set_node_attributes(
+        target_graph,
+        dict(zip(idx_to_node, annotation_counts.astype(np.int64).tolist())),
+        'annotation_count',
+    )
 
 
 def find_mica(node_1: str,
@@ -1,35 +1,79 @@
 import os
+import asyncio
 import importlib
 import importlib.resources
-import inspect
 from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType, ModuleType
+from typing import Callable, Mapping
 import aiofiles
 import aiofiles.os
 import numpy as np
 
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix
-from bioterms.etc.utils import check_files_exist
+from bioterms.etc.utils import check_files_exist_async
 from bioterms.database import Cache, DocumentDatabase, GraphDatabase, VectorDatabase, get_active_cache, \
     get_active_doc_db, get_active_graph_db, get_active_vector_db
-from .utils import ALL_VOCABULARIES, get_vocabulary_module, get_vocabulary_status
+from .utils import ALL_VOCABULARIES, VocabularyMeta, get_vocabulary_meta, get_vocabulary_module, \
+    get_vocabulary_status, remove_data_files
 
 
-def get_vocabulary_config(prefix: ConceptPrefix) -> dict:
+# The registry is small and fixed, so import every vocabulary module up front: later lookups are
+# then cache hits, and no request path ever goes through the import machinery
+for _prefix in ALL_VOCABULARIES:
+    get_vocabulary_module(_prefix)
+del _prefix
+
+
+_VOCABULARY_HOOKS = (
+    'download_vocabulary',
+    'delete_vocabulary_files',
+    'delete_vocabulary_data',
+    'create_indexes',
+    'load_vocabulary_from_file',
+)
+
+
+def _get_dispatch(vocabulary_module: ModuleType) -> dict[str, Callable | None]:
+    """
+    Resolve the optional hooks a vocabulary module implements. The table is built on first use
+    and stored on the module itself, so later operations are a single attribute lookup.
+    :param vocabulary_module: The vocabulary module.
+    :return: A mapping of hook name to the hook function, or None if the module does not provide it.
+    """
+    dispatch = getattr(vocabulary_module, '_bioterms_dispatch', None)
+
+    if dispatch is None:
+        dispatch = {}
+        for name in _VOCABULARY_HOOKS:
+            func = getattr(vocabulary_module, name, None)
+            dispatch[name] = func if callable(func) else None
+
+        vocabulary_module._bioterms_dispatch = dispatch
+
+    return dispatch
+
+
+@lru_cache(maxsize=None)
+def get_vocabulary_config(prefix: ConceptPrefix) -> Mapping:
     """
     Get the vocabulary configuration for the given prefix.
+
+    The configuration is built once per prefix and shared between callers, so it is returned
+    as a read-only mapping with its lists frozen to tuples.
     :param prefix: The prefix of the vocabulary.
     :return: The vocabulary configuration.
     """
-    vocabulary_module = get_vocabulary_module(prefix)
-    return {
-        'name': vocabulary_module.VOCABULARY_NAME,
-        'prefix': vocabulary_module.VOCABULARY_PREFIX,
-        'annotations': vocabulary_module.ANNOTATIONS,
-        'similarityMethods': vocabulary_module.SIMILARITY_METHODS,
-        'filePaths': vocabulary_module.FILE_PATHS,
-        'conceptClass': vocabulary_module.CONCEPT_CLASS,
-    }
+    vocabulary_meta = get_vocabulary_meta(prefix)
+    return MappingProxyType({
+        'name': vocabulary_meta.name,
+        'prefix': vocabulary_meta.prefix,
+        'annotations': vocabulary_meta.annotations,
+        'similarityMethods': vocabulary_meta.similarity_methods,
+        'filePaths': vocabulary_meta.file_paths,
+        'conceptClass': vocabulary_meta.concept_class,
+    })
 
 
 async def delete_vocabulary_files(prefix: ConceptPrefix):
@@ -39,25 +83,14 @@ async def delete_vocabulary_files(prefix: ConceptPrefix):
     """
     vocabulary_module = get_vocabulary_module(prefix)
 
-    deletion_func = getattr(vocabulary_module, 'delete_vocabulary_files', None)
+    deletion_func = _get_dispatch(vocabulary_module)['delete_vocabulary_files']
 
-    if deletion_func is None or not callable(deletion_func):
-        # Fallback to default deletion method
-        for file_path in vocabulary_module.FILE_PATHS:
-            try:
-                await aiofiles.os.remove(file_path)
-            except Exception:
-                pass
-
-        timestamp_file_path = os.path.join(CONFIG.data_dir, vocabulary_module.TIMESTAMP_FILE)
-        try:
-            await aiofiles.os.remove(timestamp_file_path)
-        except Exception:
-            pass
+    if deletion_func is None:
+        # Fallback to default deletion method, removing every file concurrently
+        vocabulary_meta = get_vocabulary_meta(prefix)
+        await remove_data_files([*vocabulary_meta.file_paths, vocabulary_meta.timestamp_file])
     else:
-        result = deletion_func()
-        if inspect.iscoroutine(result):
-            await result
+        await deletion_func()
 
 
 async def download_vocabulary(prefix: ConceptPrefix,
@@ -73,20 +106,62 @@ async def download_vocabulary(prefix: ConceptPrefix,
     if redownload:
         await delete_vocabulary_files(prefix)
 
-    download_func = getattr(vocabulary_module, 'download_vocabulary', None)
-    if download_func is None or not callable(download_func):
+    download_func = _get_dispatch(vocabulary_module)['download_vocabulary']
+    if download_func is None:
         raise ValueError(f'Vocabulary module for {prefix} does not have a download_vocabulary function.')
 
-    result = download_func()
-    if inspect.iscoroutine(result):
-        await result
+    vocabulary_meta = get_vocabulary_meta(prefix)
+    timestamp_file_path = os.path.join(CONFIG.data_dir, vocabulary_meta.timestamp_file)
+
+    if not redownload:
+        # Files already downloaded and stamped are kept as they are, and so is their download time
+        downloaded, stamped = await asyncio.gather(
+            check_files_exist_async(vocabulary_meta.file_paths),
+            aiofiles.os.path.exists(timestamp_file_path),
+        )
+        if downloaded and stamped:
+            return
+
+    await download_func()
 
-    timestamp_file_path = os.path.join(CONFIG.data_dir, vocabulary_module.TIMESTAMP_FILE)
+    temp_file_path = f'{timestamp_file_path}.tmp'
 
-    async with aiofiles.open(timestamp_file_path, 'w') as timestamp_file:
-        current_time = datetime.now(timezone.utc).isoformat()
+    # Write next to the target and swap it in, so an interrupted write never leaves a torn timestamp
+    async with aiofiles.open(temp_file_path, 'w') as timestamp_file:
+        current_time = datetime.now(timezone.utc).isoformat(timespec='seconds')
         await timestamp_file.write(current_time)
 
+    await aiofiles.os.replace(temp_file_path, timestamp_file_path)
+
+
+# Document indexes as (field, unique). Lookup indexes back the upserts during loading, search
+# indexes only serve queries and can be built once the data is in
+_LOOKUP_INDEXES = (('conceptId', True),)
+_SEARCH_INDEXES = (('label', False),)
+
+
+async def _create_doc_indexes(vocabulary_meta: VocabularyMeta,
+                              indexes: tuple[tuple[str, bool], ...],
+                              overwrite: bool,
+                              doc_db: DocumentDatabase,
+                              ):
+    """
+    Create the given document indexes for a vocabulary.
+    :param vocabulary_meta: The vocabulary metadata.
+    :param indexes: The indexes to create, as (field, unique) pairs.
+    :param overwrite: Whether to overwrite existing indexes.
+    :param doc_db: The document database instance.
+    """
+    # Built one after another: the backends create the collection on first use, which is not
+    # safe to race on the same prefix
+    for field, unique in indexes:
+        await doc_db.create_index(
+            prefix=vocabulary_meta.prefix,
+            field=field,
+            unique=unique,
+            overwrite=overwrite,
+        )
+
 
 async def create_indexes(prefix: ConceptPrefix,
                          overwrite: bool = False,
@@ -103,35 +178,30 @@ async def create_indexes(prefix: ConceptPrefix,
     vocabulary_module = get_vocabulary_module(prefix)
     cache = get_active_cache()
 
-    create_index_func = getattr(vocabulary_module, 'create_indexes', None)
-    if create_index_func is None or not callable(create_index_func):
+    create_index_func = _get_dispatch(vocabulary_module)['create_indexes']
+    if create_index_func is None:
         # Fallback to default index creation method
         if doc_db is None:
             doc_db = await get_active_doc_db()
         if graph_db is None:
             graph_db = get_active_graph_db()
 
-        await doc_db.create_index(
-            prefix=vocabulary_module.VOCABULARY_PREFIX,
-            field='conceptId',
-            unique=True,
-            overwrite=overwrite,
-        )
-        await doc_db.create_index(
-            prefix=vocabulary_module.VOCABULARY_PREFIX,
-            field='label',
-            overwrite=overwrite,
+        # The document and graph databases are independent, so their indexes are built concurrently
+        await asyncio.gather(
+            _create_doc_indexes(
+                vocabulary_meta=get_vocabulary_meta(prefix),
+                indexes=_LOOKUP_INDEXES + _SEARCH_INDEXES,
+                overwrite=overwrite,
+                doc_db=doc_db,
+            ),
+            graph_db.create_index(),
         )
-
-        await graph_db.create_index()
     else:
-        result = create_index_func(
+        await create_index_func(
             overwrite=overwrite,
             doc_db=doc_db,
             graph_db=graph_db,
         )
-        if inspect.iscoroutine(result):
-            await result
 
     await cache.rotate_dataset_version()
 
@@ -153,11 +223,9 @@ async def delete_vocabulary(prefix: ConceptPrefix,
     vocabulary_module = get_vocabulary_module(prefix)
     cache = cache or get_active_cache()
 
-    delete_func = getattr(vocabulary_module, 'delete_vocabulary_data', None)
-    if delete_func is None or not callable(delete_func):
+    delete_func = _get_dispatch(vocabulary_module)['delete_vocabulary_data']
+    if delete_func is None:
         # Fallback to default deletion method
-        if cache is None:
-            cache = get_active_cache()
         if doc_db is None:
             doc_db = await get_active_doc_db()
         if graph_db is None:
@@ -166,16 +234,19 @@ async def delete_vocabulary(prefix: ConceptPrefix,
             vector_db = get_active_vector_db()
 
         await cache.purge()
-        await doc_db.delete_all_for_label(vocabulary_module.VOCABULARY_PREFIX)
-        await graph_db.delete_vocabulary_graph(prefix=vocabulary_module.VOCABULARY_PREFIX)
-        await vector_db.delete_vectors_for_prefix(prefix=vocabulary_module.VOCABULARY_PREFIX)
+
+        # The backends hold independent copies of the vocabulary, so they are cleared concurrently
+        vocabulary_prefix = get_vocabulary_meta(prefix).prefix
+        await asyncio.gather(
+            doc_db.delete_all_for_label(vocabulary_prefix),
+            graph_db.delete_vocabulary_graph(prefix=vocabulary_prefix),
+            vector_db.delete_vectors_for_prefix(prefix=vocabulary_prefix),
+        )
     else:
-        result = delete_func(
+        await delete_func(
             doc_db=doc_db,
             graph_db=graph_db,
         )
-        if inspect.iscoroutine(result):
-            await result
 
     await cache.rotate_dataset_version()
 
@@ -197,10 +268,19 @@ async def load_vocabulary(prefix: ConceptPrefix,
     :param graph_db: The graph database instance.
     """
     vocabulary_module = get_vocabulary_module(prefix)
+    vocabulary_meta = get_vocabulary_meta(prefix)
 
-    if not check_files_exist(vocabulary_module.FILE_PATHS):
+    if not await check_files_exist_async(vocabulary_meta.file_paths):
         raise ValueError(f'Vocabulary files for {prefix} not found. Are they downloaded?')
 
+    load_func = _get_dispatch(vocabulary_module)['load_vocabulary_from_file']
+    if load_func is None:
+        raise ValueError(f'Vocabulary module for {prefix} does not have a load_vocabulary_from_file function.')
+
+    # With the default indexes, only those the load looks up are built beforehand, and the rest
+    # are built once over the loaded data instead of being maintained through the bulk insert
+    defer_search_indexes = not offline and _get_dispatch(vocabulary_module)['create_indexes'] is None
+
     if not offline:
         if drop_existing:
             # Drop existing data before loading
@@ -210,24 +290,33 @@ async def load_vocabulary(prefix: ConceptPrefix,
                 graph_db=graph_db,
             )
 
-        # Create indexes before loading data
-        await create_indexes(
-            prefix=prefix,
-            doc_db=doc_db,
-            graph_db=graph_db,
-        )
+        if defer_search_indexes:
+            if doc_db is None:
+                doc_db = await get_active_doc_db()
+            if graph_db is None:
+                graph_db = get_active_graph_db()
 
-    load_func = getattr(vocabulary_module, 'load_vocabulary_from_file', None)
-    if load_func is None or not callable(load_func):
-        raise ValueError(f'Vocabulary module for {prefix} does not have a load_vocabulary_from_file function.')
+            # The graph indexes and constraint back the node merges, so they are built up front too
+            await asyncio.gather(
+                _create_doc_indexes(vocabulary_meta, _LOOKUP_INDEXES, False, doc_db),
+                graph_db.create_index(),
+            )
+        else:
+            # Custom index creation may be needed by the module's own loader
+            await create_indexes(
+                prefix=prefix,
+                doc_db=doc_db,
+                graph_db=graph_db,
+            )
 
-    result = load_func(
+    await load_func(
         doc_db=doc_db,
         graph_db=graph_db,
         offline=offline,
     )
-    if inspect.iscoroutine(result):
-        await result
+
+    if defer_search_indexes:
+        await _create_doc_indexes(vocabulary_meta, _SEARCH_INDEXES, False, doc_db)
 
     if not offline:
         # Cache is only required when mutating online databases.
@@ -239,7 +328,7 @@ async def load_vocabulary(prefix: ConceptPrefix,
 
 
 async def _embed_vocabulary_online(prefix: ConceptPrefix,
-                                   config: dict,
+                                   config: Mapping,
                                    drop_existing: bool,
                                    doc_db: DocumentDatabase = None,
                                    graph_db: GraphDatabase = None,
@@ -289,7 +378,7 @@ async def _embed_vocabulary_online(prefix: ConceptPrefix,
 
 
 async def _embed_vocabulary_offline(prefix: ConceptPrefix,
-                                    config: dict,
+                                    config: Mapping,
                                     ):
     """
     Embed a vocabulary's concepts from an offline concept dump into an offline embedding dump.
@@ -412,21 +501,30 @@ async def restore_vocabulary_embeddings(prefix: ConceptPrefix,
     await cache.rotate_dataset_version()
 
 
+@lru_cache(maxsize=None)
+def _load_license_text(file_name: str) -> str | None:
+    """
+    Read a licence file from the package data, once per process. Missing files are cached as well.
+    :param file_name: The licence file name, without the extension.
+    :return: The licence information as a string, or None if not available.
+    """
+    # Read through the resource itself, as_file would extract a temporary copy from zipped installs
+    file_path = importlib.resources.files('bioterms.data.licenses').joinpath(f'{file_name}.md')
+    try:
+        return file_path.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        return None
+
+
 def get_vocabulary_license(prefix: ConceptPrefix) -> str | None:
     """
     Get the licence information for the vocabulary specified by the prefix.
     :param prefix: The prefix of the vocabulary.
     :return: The licence information as a string, or None if not available.
     """
-    file_name = ALL_VOCABULARIES.get(prefix)
-    if not file_name:
-        raise ValueError(f'Vocabulary with prefix {prefix} not found.')
-
-    file_name += '.md'
-
     try:
-        file_path = importlib.resources.files('bioterms.data.licenses') / file_name
-        with importlib.resources.as_file(file_path) as license_file:
-            return license_file.read_text()
-    except FileNotFoundError:
-        return None
+        file_name = ALL_VOCABULARIES[prefix]
+    except KeyError:
+        raise ValueError(f'Vocabulary with prefix {prefix} not found.') from None
+
+    return _load_license_text(file_name)
@@ -1,18 +1,21 @@
 import os
+import asyncio
 import aiofiles
 import aiofiles.os
 import httpx
 import networkx as nx
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptStatus, ConceptRelationshipType, SimilarityMethod
 from bioterms.etc.errors import FilesNotFound
 from bioterms.etc.utils import check_files_exist, ensure_data_directory, download_file, \
-    get_trud_release_url, extract_file_from_zip, iter_progress, verbose_print
+    get_trud_release_url, extract_file_from_zip, gc_paused, iter_progress, verbose_print
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.concept import Concept
-from .utils import write_concepts_to_file, write_graph_to_file
+from .utils import read_string_columns, series_values, write_concepts_to_file, write_graph_to_file
 
 
 VOCABULARY_NAME = 'Clinical Terms Version 3 (Read Codes)'
@@ -77,85 +80,6 @@ async def download_vocabulary(download_client: httpx.AsyncClient = None):
             pass
 
 
-def _parse_term_label(term_30: str,
-                      term_60: str,
-                      term_198: str,
-                      ) -> str:
-    """
-    Parse the term label from available term fields.
-    :param term_30: The 30-character term.
-    :param term_60: The 60-character term.
-    :param term_198: The 198-character term.
-    :return: The selected term label.
-    """
-    if not pd.isna(term_198):
-        return term_198
-
-    if not pd.isna(term_60):
-        return term_60
-
-    return term_30
-
-
-def _status_from_ctv3_code(status_code: str) -> ConceptStatus:
-    """
-    Map a raw CTV3 status code to a ConceptStatus.
-    :param status_code: The raw status code from the concept file.
-    :return: The mapped ConceptStatus.
-    """
-    return ConceptStatus.DEPRECATED if status_code not in ('C', 'O') else ConceptStatus.ACTIVE
-
-
-def _make_ctv3_stub_concept(concept_row) -> CONCEPT_CLASS:
-    """
-    Build a Concept for a CTV3 concept ID that has no matching term/description entry.
-    :param concept_row: The row from the concept dataframe.
-    :return: The built stub Concept instance.
-    """
-    return CONCEPT_CLASS(
-        prefix=VOCABULARY_PREFIX,
-        conceptId=concept_row['concept_id'],
-        status=_status_from_ctv3_code(concept_row['status']),
-    )
-
-
-def _extract_ctv3_label_and_synonyms(group) -> tuple[str | None, list[str]] | None:
-    """
-    Extract the preferred label and synonym labels from a group of term rows for one concept.
-    :param group: The group of term rows for a single concept ID.
-    :return: A tuple of (label, synonyms), or None if the concept has no usable label or synonym.
-    """
-    label_row = group[group['type'] == 'P']
-    synonym_rows = group[group['type'] == 'S']
-
-    if not label_row.empty:
-        label = _parse_term_label(
-            term_30=label_row.iloc[0]['term_30'],
-            term_60=label_row.iloc[0]['term_60'],
-            term_198=label_row.iloc[0]['term_198'],
-        )
-    elif not synonym_rows.empty:
-        label = _parse_term_label(
-            term_30=synonym_rows.iloc[0]['term_30'],
-            term_60=synonym_rows.iloc[0]['term_60'],
-            term_198=synonym_rows.iloc[0]['term_198'],
-        )
-    else:
-        # No label or synonym at all, however, the concept ID appeared in the file
-        return None
-
-    synonyms = [
-        _parse_term_label(
-            term_30=row['term_30'],
-            term_60=row['term_60'],
-            term_198=row['term_198']
-        )
-        for _, row in synonym_rows.iterrows()
-    ]
-
-    return label, synonyms
-
-
 def _load_concepts() -> list[CONCEPT_CLASS]:
     """
     Load concepts from the CTV3 vocabulary files.
@@ -167,71 +91,83 @@ def _load_concepts() -> list[CONCEPT_CLASS]:
         header=None,
         names=['concept_id', 'status'],
         usecols=[0, 1],
+        dtype=str,
+        engine='pyarrow',
     ).sort_values('concept_id').reset_index(drop=True)
 
-    description_df = pd.read_csv(
+    # Only preferred (P) and synonym (S) descriptions carry labels, the rest are dropped before the join
+    description_table = read_string_columns(
         os.path.join(CONFIG.data_dir, FILE_PATHS[1]),
-        sep='|',
-        header=None,
-        names=['concept_id', 'term_id', 'type'],
-        usecols=[0, 1, 2],
+        delimiter='|',
+        columns={0: 'concept_id', 1: 'term_id', 2: 'type'},
+    )
+    description_table = description_table.filter(pc.is_in(description_table['type'], pa.array(['P', 'S'])))
+    description_table = description_table.append_column(
+        'description_index',
+        pa.array(range(description_table.num_rows), pa.int64()),
     )
 
-    term_df = pd.read_csv(
+    term_table = read_string_columns(
         os.path.join(CONFIG.data_dir, FILE_PATHS[2]),
-        sep='|',
-        header=None,
-        names=['term_id', 'term_30', 'term_60', 'term_198'],
-        usecols=[0, 2, 3, 4],
+        delimiter='|',
+        columns={0: 'term_id', 2: 'term_30', 3: 'term_60', 4: 'term_198'},
     )
 
-    merged_term_df = pd.merge(
-        description_df,
-        term_df,
-        on='term_id',
-        how='inner',
-        validate='many_to_one',
-    ).sort_values('concept_id').reset_index(drop=True).groupby('concept_id')
+    # The hash join does not keep row order, so the description order is restored afterward
+    merged_term_df = description_table.join(
+        term_table,
+        keys='term_id',
+        join_type='inner',
+    ).sort_by('description_index').drop_columns(['description_index']).to_pandas()
 
-    del description_df
-    del term_df
+    del description_table
+    del term_table
 
     verbose_print('Successfully read CTV3 concept and term files from disk, processing concepts...')
 
-    concept_index = 0
-    concept_count = len(concept_df)
-    concepts = []
+    # Use the longest available term as the label of each description
+    merged_term_df = merged_term_df.assign(
+        label=merged_term_df['term_198'].fillna(merged_term_df['term_60']).fillna(merged_term_df['term_30']),
+    )
 
-    for concept_id, group in iter_progress(
-        merged_term_df,
-        description='Processing CTV3 concepts',
-        total=len(merged_term_df),
-    ):
-        while concept_index < concept_count and concept_df.iloc[concept_index]['concept_id'] != concept_id:
-            concepts.append(_make_ctv3_stub_concept(concept_df.iloc[concept_index]))
-            concept_index += 1
+    # The label is the first preferred term, falling back to the first synonym
+    label_series = merged_term_df.sort_values('type', kind='stable').drop_duplicates('concept_id') \
+        .set_index('concept_id')['label']
+    synonym_series = merged_term_df[merged_term_df['type'] == 'S'].groupby('concept_id')['label'].agg(list)
 
-        if concept_index < concept_count and concept_df.iloc[concept_index]['concept_id'] == concept_id:
-            label_and_synonyms = _extract_ctv3_label_and_synonyms(group)
-            if label_and_synonyms is None:
-                continue
+    # Both lookups are indexed by concept_id, so an index join replaces the key merge.
+    # Concepts without any term are kept as stubs with neither label nor synonyms
+    concept_df = concept_df.join(label_series, on='concept_id').join(
+        synonym_series.rename('synonyms'),
+        on='concept_id',
+    )
 
-            label, synonyms = label_and_synonyms
+    del merged_term_df
+    del label_series
+    del synonym_series
 
-            concept = CONCEPT_CLASS(
+    # Only current (C) and optional (O) concepts are active, any other status code is deprecated
+    concept_rows = zip(
+        concept_df['concept_id'].tolist(),
+        concept_df['status'].isin(('C', 'O')).tolist(),
+        series_values(concept_df['label']),
+        series_values(concept_df['synonyms']),
+    )
+    with gc_paused():
+        concepts = [
+            CONCEPT_CLASS(
                 prefix=VOCABULARY_PREFIX,
                 conceptId=concept_id,
-                label=label if not pd.isna(label) and label else None,
-                synonyms=synonyms if synonyms else None,
-                status=_status_from_ctv3_code(concept_df.iloc[concept_index]['status']),
+                label=label or None,
+                synonyms=synonyms or None,
+                status=ConceptStatus.ACTIVE if active else ConceptStatus.DEPRECATED,
             )
-
-            concepts.append(concept)
-            concept_index += 1
-
-    while concept_index < concept_count:
-        concepts.append(_make_ctv3_stub_concept(concept_df.iloc[concept_index]))
-        concept_index += 1
+            for concept_id, active, label, synonyms in iter_progress(
+                concept_rows,
+                description='Processing CTV3 concepts',
+                total=len(concept_df),
+            )
+        ]
 
     return concepts
 
@@ -245,8 +181,7 @@ def _load_relationships(concepts: list[CONCEPT_CLASS],
     """
     ctv3_graph = nx.DiGraph()
 
-    for concept in concepts:
-        ctv3_graph.add_node(concept.concept_id)
+    ctv3_graph.add_nodes_from(concept.concept_id for concept in concepts)
 
     hierarchy_df = pd.read_csv(
         os.path.join(CONFIG.data_dir, FILE_PATHS[3]),
@@ -254,6 +189,8 @@ def _load_relationships(concepts: list[CONCEPT_CLASS],
         header=None,
         names=['child_id', 'parent_id'],
         usecols=[0, 1],
+        dtype=str,
+        engine='pyarrow',
     )
 
     redundant_df = pd.read_csv(
@@ -261,31 +198,29 @@ def _load_relationships(concepts: list[CONCEPT_CLASS],
         sep='|',
         header=None,
         names=['current_id', 'old_id'],
+        dtype=str,
+        engine='pyarrow',
     )
 
     verbose_print('Successfully read CTV3 relationship files from disk, processing relationships...')
 
-    for _, row in iter_progress(
-        hierarchy_df.iterrows(),
-        description='Processing CTV3 hierarchical relationships',
-        total=len(hierarchy_df),
-    ):
-        ctv3_graph.add_edge(
-            row['child_id'],
-            row['parent_id'],
-            label=ConceptRelationshipType.IS_A
-        )
+    ctv3_graph.add_edges_from(
+        iter_progress(
+            zip(hierarchy_df['child_id'].tolist(), hierarchy_df['parent_id'].tolist()),
+            description='Processing CTV3 hierarchical relationships',
+            total=len(hierarchy_df),
+        ),
+        label=ConceptRelationshipType.IS_A,
+    )
 
-    for _, row in iter_progress(
-        redundant_df.iterrows(),
-        description='Processing CTV3 redundancy relationships',
-        total=len(redundant_df),
-    ):
-        ctv3_graph.add_edge(
-            row['old_id'],
-            row['current_id'],
-            label=ConceptRelationshipType.REPLACED_BY
-        )
+    ctv3_graph.add_edges_from(
+        iter_progress(
+            zip(redundant_df['old_id'].tolist(), redundant_df['current_id'].tolist()),
+            description='Processing CTV3 redundancy relationships',
+            total=len(redundant_df),
+        ),
+        label=ConceptRelationshipType.REPLACED_BY,
+    )
 
     return ctv3_graph
 
@@ -314,14 +249,15 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         if graph_db is None:
             graph_db = get_active_graph_db()
 
-        await doc_db.save_terms(
-            terms=concepts,
-            no_upsert=True,
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=ctv3_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts,
+                no_upsert=True,
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=ctv3_graph,
+            ),
         )
     else:
         await write_concepts_to_file(
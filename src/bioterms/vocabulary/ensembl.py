@@ -1,16 +1,18 @@
 import os
-import re
+import asyncio
 import aiofiles
 import aiofiles.os
 import httpx
 import networkx as nx
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
 
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptStatus, ConceptRelationshipType, ConceptType, AnnotationType
 from bioterms.etc.errors import FilesNotFound
 from bioterms.etc.utils import check_files_exist, ensure_data_directory, download_file, extract_file_from_gzip, \
-    iter_progress, verbose_print
+    gc_paused, iter_progress, verbose_print
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.annotation import Annotation
 from bioterms.model.concept import EnsemblConcept
@@ -28,6 +30,19 @@ FILE_PATHS = [
 TIMESTAMP_FILE = 'ensembl/.timestamp'
 CONCEPT_CLASS = EnsemblConcept
 
+_GTF_COLUMNS = ('seqname', 'source', 'feature', 'start', 'end', 'score', 'strand', 'frame', 'attribute')
+_GTF_FEATURES = ('gene', 'transcript', 'exon', 'CDS')
+_GTF_ATTRIBUTES = (
+    'gene_id',
+    'gene_name',
+    'gene_biotype',
+    'transcript_id',
+    'transcript_name',
+    'transcript_biotype',
+    'exon_id',
+    'protein_id',
+)
+
 
 async def download_vocabulary(download_client: httpx.AsyncClient = None):
     """
@@ -60,132 +75,105 @@ async def download_vocabulary(download_client: httpx.AsyncClient = None):
             pass
 
 
-def _handle_gene_feature(attributes: dict,
-                         row,
-                         genes: dict[str, CONCEPT_CLASS],
-                         ensembl_graph: nx.DiGraph,
-                         annotations: list[Annotation],
-                         ):
+def _read_gtf_table(file_path: str) -> pa.Table:
     """
-    Process a GTF 'gene' feature row into a gene Concept and its HGNC symbol annotation.
+    Stream the GTF file into an Arrow table, keeping only the features the vocabulary uses.
+
+    Other feature types (UTRs, codons...) are dropped batch by batch as the file is parsed, so
+    they are never held in memory as a whole.
+    :param file_path: The path to the GTF file.
+    :return: The Arrow table of seqname, feature, start, end and attribute columns.
     """
-    if attributes['gene_id'] in genes:
-        return
+    # Arrow has no comment option, so the header block is skipped and any later comment line is dropped
+    header_rows = 0
+    with open(file_path) as gtf_file:
+        for line in gtf_file:
+            if not line.startswith('#'):
+                break
+            header_rows += 1
+
+    reader = pa_csv.open_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(column_names=list(_GTF_COLUMNS), skip_rows=header_rows),
+        parse_options=pa_csv.ParseOptions(
+            delimiter='\t',
+            quote_char=False,
+            invalid_row_handler=lambda row: 'skip' if (row.text or '').startswith('#') else 'error',
+        ),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=['seqname', 'feature', 'start', 'end', 'attribute'],
+            column_types={'seqname': pa.string(), 'start': pa.int64(), 'end': pa.int64()},
+        ),
+    )
+    features = pa.array(_GTF_FEATURES)
+
+    return pa.Table.from_batches(
+        [batch.filter(pc.is_in(batch['feature'], features)) for batch in reader],
+        schema=reader.schema,
+    )
 
-    if 'gene_name' in attributes:
-        label = attributes['gene_name']
-        annotations.append(Annotation(
-            prefixFrom=VOCABULARY_PREFIX,
-            prefixTo=ConceptPrefix.HGNC_SYMBOL,
-            conceptIdFrom=attributes['gene_id'],
-            conceptIdTo=attributes['gene_name'],
-            annotationType=AnnotationType.HAS_SYMBOL
-        ))
-    else:
-        label = None
 
-    gene_concept = CONCEPT_CLASS(
+def _build_gene_concept(row) -> CONCEPT_CLASS:
+    """
+    Build a gene Concept from a GTF 'gene' feature row.
+    """
+    return CONCEPT_CLASS(
         prefix=VOCABULARY_PREFIX,
-        conceptId=attributes['gene_id'],
-        label=label,
+        conceptId=row.gene_id,
+        label=row.gene_name,
         conceptTypes=[ConceptType.GENE],
-        bioType=attributes['gene_biotype'],
-        start=int(row['start']),
-        end=int(row['end']),
-        sequence=row['seqname'],
+        bioType=row.gene_biotype,
+        start=int(row.start),
+        end=int(row.end),
+        sequence=row.seqname,
         status=ConceptStatus.ACTIVE,
     )
 
-    genes[attributes['gene_id']] = gene_concept
-    ensembl_graph.add_node(gene_concept.concept_id)
-
 
-def _handle_transcript_feature(attributes: dict,
-                               row,
-                               transcripts: dict[str, CONCEPT_CLASS],
-                               ensembl_graph: nx.DiGraph,
-                               ):
+def _build_transcript_concept(row) -> CONCEPT_CLASS:
     """
-    Process a GTF 'transcript' feature row into a transcript Concept, part-of its gene.
+    Build a transcript Concept from a GTF 'transcript' feature row.
     """
-    if attributes['transcript_id'] not in transcripts:
-        transcript_concept = CONCEPT_CLASS(
-            prefix=VOCABULARY_PREFIX,
-            conceptId=attributes['transcript_id'],
-            label=attributes.get('transcript_name'),
-            conceptTypes=[ConceptType.TRANSCRIPT],
-            bioType=attributes.get('transcript_biotype'),
-            start=int(row['start']),
-            end=int(row['end']),
-            sequence=row['seqname'],
-            status=ConceptStatus.ACTIVE,
-        )
-
-        transcripts[attributes['transcript_id']] = transcript_concept
-        ensembl_graph.add_node(transcript_concept.concept_id)
-
-    ensembl_graph.add_edge(
-        attributes['transcript_id'],
-        attributes['gene_id'],
-        label=ConceptRelationshipType.PART_OF,
+    return CONCEPT_CLASS(
+        prefix=VOCABULARY_PREFIX,
+        conceptId=row.transcript_id,
+        label=row.transcript_name,
+        conceptTypes=[ConceptType.TRANSCRIPT],
+        bioType=row.transcript_biotype,
+        start=int(row.start),
+        end=int(row.end),
+        sequence=row.seqname,
+        status=ConceptStatus.ACTIVE,
     )
 
 
-def _handle_exon_feature(attributes: dict,
-                         row,
-                         exons: dict[str, CONCEPT_CLASS],
-                         ensembl_graph: nx.DiGraph,
-                         ):
+def _build_exon_concept(row) -> CONCEPT_CLASS:
     """
-    Process a GTF 'exon' feature row into an exon Concept, part-of its transcript.
+    Build an exon Concept from a GTF 'exon' feature row.
     """
-    if attributes['exon_id'] not in exons:
-        exon_concept = CONCEPT_CLASS(
-            prefix=VOCABULARY_PREFIX,
-            conceptId=attributes['exon_id'],
-            conceptTypes=[ConceptType.EXON],
-            start=int(row['start']),
-            end=int(row['end']),
-            sequence=row['seqname'],
-            status=ConceptStatus.ACTIVE,
-        )
-
-        exons[attributes['exon_id']] = exon_concept
-        ensembl_graph.add_node(exon_concept.concept_id)
-
-    ensembl_graph.add_edge(
-        attributes['exon_id'],
-        attributes['transcript_id'],
-        label=ConceptRelationshipType.PART_OF,
+    return CONCEPT_CLASS(
+        prefix=VOCABULARY_PREFIX,
+        conceptId=row.exon_id,
+        conceptTypes=[ConceptType.EXON],
+        start=int(row.start),
+        end=int(row.end),
+        sequence=row.seqname,
+        status=ConceptStatus.ACTIVE,
     )
 
 
-def _handle_cds_feature(attributes: dict,
-                        row,
-                        proteins: dict[str, CONCEPT_CLASS],
-                        ensembl_graph: nx.DiGraph,
-                        ):
+def _build_protein_concept(row) -> CONCEPT_CLASS:
     """
-    Process a GTF 'CDS' feature row into a protein Concept, part-of its transcript.
+    Build a protein Concept from a GTF 'CDS' feature row.
     """
-    if attributes['protein_id'] not in proteins:
-        protein_concept = CONCEPT_CLASS(
-            prefix=VOCABULARY_PREFIX,
-            conceptId=attributes['protein_id'],
-            conceptTypes=[ConceptType.PROTEIN],
-            start=int(row['start']),
-            end=int(row['end']),
-            sequence=row['seqname'],
-            status=ConceptStatus.ACTIVE,
-        )
-
-        proteins[attributes['protein_id']] = protein_concept
-        ensembl_graph.add_node(protein_concept.concept_id)
-
-    ensembl_graph.add_edge(
-        attributes['protein_id'],
-        attributes['transcript_id'],
-        label=ConceptRelationshipType.PART_OF,
+    return CONCEPT_CLASS(
+        prefix=VOCABULARY_PREFIX,
+        conceptId=row.protein_id,
+        conceptTypes=[ConceptType.PROTEIN],
+        start=int(row.start),
+        end=int(row.end),
+        sequence=row.seqname,
+        status=ConceptStatus.ACTIVE,
     )
 
 
@@ -210,64 +198,66 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
             graph_db=graph_db,
         )
 
-    gene_df = pd.read_csv(
-        str(os.path.join(CONFIG.data_dir, FILE_PATHS[0])),
-        sep='\t',
-        comment='#',
-        header=None,
-        names=[
-            'seqname',
-            'source',
-            'feature',
-            'start',
-            'end',
-            'score',
-            'strand',
-            'frame',
-            'attribute',
-        ],
-        dtype={
-            'seqname': str,
-        }
-    )
+    gene_df = _read_gtf_table(str(os.path.join(CONFIG.data_dir, FILE_PATHS[0]))).to_pandas()
 
-    genes: dict[str, CONCEPT_CLASS] = {}
-    transcripts: dict[str, CONCEPT_CLASS] = {}
-    exons: dict[str, CONCEPT_CLASS] = {}
-    proteins: dict[str, CONCEPT_CLASS] = {}
+    concepts: list[CONCEPT_CLASS] = []
     ensembl_graph = nx.DiGraph()
-    annotations = []
+    part_of_edges: list[tuple[str, str]] = []
 
     verbose_print('Ensembl GTF file read, processing entries...')
 
-    for _, row in iter_progress(gene_df.iterrows(), description='Processing GTF entries', total=len(gene_df)):
-        # Parse the attribute into a dictionary
-        attributes = dict(
-            re.findall(r'([^\s"]+)\s"([^"]+)"', row['attribute'])
-        )
+    # Pull every attribute the builders read out as its own column in one regex pass each
+    for key in _GTF_ATTRIBUTES:
+        gene_df[key] = gene_df['attribute'].str.extract(fr'(?:^|\s){key}\s"([^"]+)"', expand=False)
+
+    gene_df = gene_df.drop(columns='attribute')
+    gene_df = gene_df.astype(object).where(gene_df.notna(), None)
+
+    # (feature, ID column, part-of parent column, concept builder), in the order concepts are listed
+    feature_builders = (
+        ('gene', 'gene_id', None, _build_gene_concept),
+        ('transcript', 'transcript_id', 'gene_id', _build_transcript_concept),
+        ('exon', 'exon_id', 'transcript_id', _build_exon_concept),
+        ('CDS', 'protein_id', 'transcript_id', _build_protein_concept),
+    )
 
-        feature = row['feature']
-        if feature == 'gene':
-            _handle_gene_feature(attributes, row, genes, ensembl_graph, annotations)
-        elif feature == 'transcript':
-            _handle_transcript_feature(attributes, row, transcripts, ensembl_graph)
-        elif feature == 'exon':
-            _handle_exon_feature(attributes, row, exons, ensembl_graph)
-        elif feature == 'CDS':
-            _handle_cds_feature(attributes, row, proteins, ensembl_graph)
+    for feature, id_column, parent_column, build_concept in feature_builders:
+        feature_df = gene_df[gene_df['feature'] == feature]
+
+        # Exons and proteins repeat once per transcript they belong to, so build each from its first row
+        concept_df = feature_df.drop_duplicates(id_column)
+        with gc_paused():
+            concepts.extend(
+                build_concept(row)
+                for row in iter_progress(
+                    concept_df.itertuples(index=False, name='GtfRow'),
+                    description=f'Processing Ensembl {feature} entries',
+                    total=len(concept_df),
+                )
+            )
+
+        if parent_column is not None:
+            part_of_edges.extend(zip(feature_df[id_column].tolist(), feature_df[parent_column].tolist()))
 
     del gene_df
 
-    verbose_print('Ensembl concepts processed, saving to databases...')
+    ensembl_graph.add_nodes_from(concept.concept_id for concept in concepts)
+    ensembl_graph.add_edges_from(part_of_edges, label=ConceptRelationshipType.PART_OF)
+    del part_of_edges
 
-    concepts = list(genes.values()) + \
-               list(transcripts.values()) + \
-               list(exons.values()) + \
-               list(proteins.values())
-    del genes
-    del transcripts
-    del exons
-    del proteins
+    annotations = [
+        Annotation(
+            prefixFrom=VOCABULARY_PREFIX,
+            prefixTo=ConceptPrefix.HGNC_SYMBOL,
+            conceptIdFrom=concept.concept_id,
+            conceptIdTo=concept.label,
+            annotationType=AnnotationType.HAS_SYMBOL,
+        )
+        for concept in concepts
+        if ConceptType.GENE in concept.concept_types and concept.label is not None
+    ]
+
+    verbose_print('Ensembl concepts processed, saving to databases...')
 
     if not offline:
         if doc_db is None:
@@ -275,14 +265,15 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         if graph_db is None:
             graph_db = get_active_graph_db()
 
-        await doc_db.save_terms(
-            terms=concepts,
-            no_upsert=True,
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=ensembl_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts,
+                no_upsert=True,
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=ensembl_graph,
+            ),
         )
         await graph_db.save_annotations(annotations)
     else:
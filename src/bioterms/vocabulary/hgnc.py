@@ -1,4 +1,5 @@
 import os
+import asyncio
 import httpx
 import networkx as nx
 import pandas as pd
@@ -11,7 +12,7 @@ from bioterms.etc.utils import check_files_exist, ensure_data_directory, downloa
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.annotation import Annotation
 from bioterms.model.concept import HgncConcept
-from .utils import ensure_gene_symbol_loaded, write_concepts_to_file, write_graph_to_file, \
+from .utils import ensure_gene_symbol_loaded, series_values, write_concepts_to_file, write_graph_to_file, \
     write_annotations_to_file
 
 
@@ -42,104 +43,82 @@ async def download_vocabulary(download_client: httpx.AsyncClient = None):
     symbol_url = 'https://storage.googleapis.com/public-download-files/hgnc/tsv/tsv/hgnc_complete_set.txt'
     withdrawn_url = 'https://storage.googleapis.com/public-download-files/hgnc/tsv/tsv/withdrawn.txt'
 
-    await download_file(
-        url=symbol_url,
-        file_path=FILE_PATHS[0],
-        download_client=download_client,
-    )
-    await download_file(
-        url=withdrawn_url,
-        file_path=FILE_PATHS[1],
-        download_client=download_client,
+    await asyncio.gather(
+        download_file(
+            url=symbol_url,
+            file_path=FILE_PATHS[0],
+            download_client=download_client,
+        ),
+        download_file(
+            url=withdrawn_url,
+            file_path=FILE_PATHS[1],
+            download_client=download_client,
+        ),
     )
 
 
-def _build_hgnc_symbol_concept(row) -> tuple[CONCEPT_CLASS, list[Annotation]]:
+def _build_hgnc_symbol_concept(hgnc_id: str,
+                               symbol: str | None,
+                               name: str | None,
+                               status: str | None,
+                               location: str | None,
+                               alias_symbols: list[str] | None,
+                               alias_names: list[str] | None,
+                               ) -> CONCEPT_CLASS:
     """
-    Build a Concept and its annotations for one HGNC gene symbol row.
-    :param row: The row from the HGNC symbol dataframe.
-    :return: A tuple of the built Concept and its list of Annotation instances.
+    Build a Concept for one HGNC gene symbol row.
+    :param hgnc_id: The HGNC ID, with the HGNC: prefix.
+    :param symbol: The approved symbol.
+    :param name: The approved name.
+    :param status: The status of the entry.
+    :param location: The chromosomal location, preferring the sortable form.
+    :param alias_symbols: The alias symbols, already split.
+    :param alias_names: The alias names, already split.
+    :return: The built Concept instance.
     """
     synonyms = []
-    annotations = []
-
-    if row['alias_symbol'] and pd.notna(row['alias_symbol']):
-        alias_symbols = row['alias_symbol'].split('|')
 
+    if alias_symbols:
         synonyms.extend(alias_symbols)
 
-        for alias_symbol in alias_symbols:
-            annotations.append(Annotation(
-                prefixFrom=VOCABULARY_PREFIX,
-                prefixTo=ConceptPrefix.HGNC_SYMBOL,
-                conceptIdFrom=row['hgnc_id'],
-                conceptIdTo=alias_symbol,
-                annotationType=AnnotationType.ALIAS_SYMBOL,
-            ))
-
-    if row['alias_name'] and pd.notna(row['alias_name']):
-        synonyms.extend(row['alias_name'].split('|'))
-
-    if not pd.isna(row['location_sortable']):
-        location = row['location_sortable']
-    elif not pd.isna(row['location']):
-        location = row['location']
-    else:
-        location = None
+    if alias_names:
+        synonyms.extend(alias_names)
 
-    concept = CONCEPT_CLASS(
+    return CONCEPT_CLASS(
         prefix=VOCABULARY_PREFIX,
-        conceptId=row['hgnc_id'].split(':')[1],
-        label=row['symbol'] if pd.notna(row['symbol']) else None,
+        conceptId=hgnc_id.split(':')[1],
+        label=symbol,
         synonyms=synonyms if synonyms else None,
-        definition=row['name'] if pd.notna(row['name']) else None,
+        definition=name,
         location=location,
-        status=ConceptStatus.ACTIVE if row['status'] == 'Approved' else ConceptStatus.DEPRECATED,
+        status=ConceptStatus.ACTIVE if status == 'Approved' else ConceptStatus.DEPRECATED,
     )
 
-    annotations.append(Annotation(
-        prefixFrom=VOCABULARY_PREFIX,
-        prefixTo=ConceptPrefix.HGNC_SYMBOL,
-        conceptIdFrom=row['hgnc_id'],
-        conceptIdTo=row['symbol'],
-        annotationType=AnnotationType.HAS_SYMBOL,
-    ))
 
-    return concept, annotations
-
-
-def _build_hgnc_withdrawn_concept(row,
-                                  hgnc_graph: nx.DiGraph,
+def _build_hgnc_withdrawn_concept(hgnc_id: str,
+                                  withdrawn_symbol: str,
                                   ) -> tuple[CONCEPT_CLASS, Annotation]:
     """
-    Build a Concept for a withdrawn HGNC entry, wiring its replaced-by edges into the graph.
-    :param row: The row from the HGNC withdrawn dataframe.
-    :param hgnc_graph: The HGNC graph to add replaced-by edges to.
+    Build a Concept for a withdrawn HGNC entry.
+    :param hgnc_id: The withdrawn HGNC ID, with the HGNC: prefix.
+    :param withdrawn_symbol: The symbol the entry had before it was withdrawn.
     :return: A tuple of the built Concept and its single Annotation.
     """
-    replacing_symbols = row['MERGED_INTO_REPORT(S) (i.e HGNC_ID|SYMBOL|STATUS)'].split(', ')
     concept = CONCEPT_CLASS(
         prefix=VOCABULARY_PREFIX,
-        conceptId=row['HGNC_ID'].split(':')[1],
-        label=row['WITHDRAWN_SYMBOL'],
+        conceptId=hgnc_id.split(':')[1],
+        label=withdrawn_symbol,
         status=ConceptStatus.DEPRECATED,
     )
 
-    for symbol in replacing_symbols:
-        hgnc_graph.add_edge(
-            concept.concept_id,
-            symbol.split('|')[0].split(':')[1],
-            label=ConceptRelationshipType.REPLACED_BY,
-        )
-
     # The withdrawn ID's own former symbol is a HGNC_SYMBOL-space value, not another
     # HGNC identifier -- prefixTo must be HGNC_SYMBOL, not VOCABULARY_PREFIX (HGNC).
     # Only one such annotation per row, independent of how many replacing symbols exist.
     annotation = Annotation(
         prefixFrom=VOCABULARY_PREFIX,
         prefixTo=ConceptPrefix.HGNC_SYMBOL,
-        conceptIdFrom=row['HGNC_ID'],
-        conceptIdTo=row['WITHDRAWN_SYMBOL'],
+        conceptIdFrom=hgnc_id,
+        conceptIdTo=withdrawn_symbol,
         annotationType=AnnotationType.PREVIOUS_SYMBOL,
     )
 
@@ -167,18 +146,35 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
             graph_db=graph_db,
         )
 
+    # The Arrow parser is multi-threaded, and only the columns used below are converted
     symbol_df = pd.read_csv(
         str(os.path.join(CONFIG.data_dir, FILE_PATHS[0])),
         sep='\t',
         dtype=str,
+        usecols=[
+            'hgnc_id',
+            'symbol',
+            'name',
+            'status',
+            'location',
+            'location_sortable',
+            'alias_symbol',
+            'alias_name',
+        ],
+        engine='pyarrow',
     )
     withdrawn_df = pd.read_csv(
         str(os.path.join(CONFIG.data_dir, FILE_PATHS[1])),
         sep='\t',
-        dtype={
-            'WITHDRAWN_SYMBOL': str,
-        },
+        dtype=str,
+        usecols=[
+            'HGNC_ID',
+            'STATUS',
+            'WITHDRAWN_SYMBOL',
+            'MERGED_INTO_REPORT(S) (i.e HGNC_ID|SYMBOL|STATUS)',
+        ],
         keep_default_na=False,
+        engine='pyarrow',
     )
     withdrawn_df = withdrawn_df.drop(withdrawn_df[withdrawn_df['STATUS'] == 'Entry Withdrawn'].index)
 
@@ -188,27 +184,79 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
 
     verbose_print('HGNC file read from disk, processing concepts...')
 
-    for _, row in iter_progress(
-        symbol_df.iterrows(),
+    # Prepare every field as a whole column, so the loop below only walks plain lists
+    symbol_rows = zip(
+        series_values(symbol_df['hgnc_id']),
+        series_values(symbol_df['symbol']),
+        series_values(symbol_df['name']),
+        series_values(symbol_df['status']),
+        series_values(symbol_df['location_sortable'].fillna(symbol_df['location'])),
+        series_values(symbol_df['alias_symbol'].str.split('|')),
+        series_values(symbol_df['alias_name'].str.split('|')),
+    )
+
+    for row in iter_progress(
+        symbol_rows,
         description='Processing HGNC entries',
         total=len(symbol_df)
     ):
-        concept, row_annotations = _build_hgnc_symbol_concept(row)
+        concepts.append(_build_hgnc_symbol_concept(*row))
+
+    # Link every entry to its approved symbol and to each of its alias symbols
+    annotations.extend(
+        Annotation(
+            prefixFrom=VOCABULARY_PREFIX,
+            prefixTo=ConceptPrefix.HGNC_SYMBOL,
+            conceptIdFrom=hgnc_id,
+            conceptIdTo=symbol,
+            annotationType=AnnotationType.HAS_SYMBOL,
+        )
+        for hgnc_id, symbol in zip(symbol_df['hgnc_id'].tolist(), symbol_df['symbol'].tolist())
+    )
 
-        concepts.append(concept)
-        hgnc_graph.add_node(concept.concept_id)
-        annotations.extend(row_annotations)
+    alias_df = symbol_df[['hgnc_id']].assign(
+        alias_symbol=symbol_df['alias_symbol'].str.split('|'),
+    ).explode('alias_symbol').dropna(subset=['alias_symbol'])
+    annotations.extend(
+        Annotation(
+            prefixFrom=VOCABULARY_PREFIX,
+            prefixTo=ConceptPrefix.HGNC_SYMBOL,
+            conceptIdFrom=hgnc_id,
+            conceptIdTo=alias_symbol,
+            annotationType=AnnotationType.ALIAS_SYMBOL,
+        )
+        for hgnc_id, alias_symbol in alias_df.itertuples(index=False, name=None)
+    )
+    del alias_df
 
-    for _, row in iter_progress(
-        withdrawn_df.iterrows(),
+    withdrawn_rows = zip(
+        withdrawn_df['HGNC_ID'].tolist(),
+        withdrawn_df['WITHDRAWN_SYMBOL'].tolist(),
+    )
+
+    for hgnc_id, withdrawn_symbol in iter_progress(
+        withdrawn_rows,
         description='Processing HGNC withdrawn entries',
         total=len(withdrawn_df)
     ):
-        concept, annotation = _build_hgnc_withdrawn_concept(row, hgnc_graph)
+        concept, annotation = _build_hgnc_withdrawn_concept(hgnc_id, withdrawn_symbol)
 
         annotations.append(annotation)
         concepts.append(concept)
-        hgnc_graph.add_node(concept.concept_id)
+
+    hgnc_graph.add_nodes_from(concept.concept_id for concept in concepts)
+
+    # The merge report lists every replacing entry as HGNC_ID|SYMBOL|STATUS, comma separated
+    replacements = withdrawn_df.assign(
+        replacement=withdrawn_df['MERGED_INTO_REPORT(S) (i.e HGNC_ID|SYMBOL|STATUS)'].str.split(', '),
+    ).explode('replacement')
+    hgnc_graph.add_edges_from(
+        zip(
+            replacements['HGNC_ID'].str.split(':').str[1].tolist(),
+            replacements['replacement'].str.split('|').str[0].str.split(':').str[1].tolist(),
+        ),
+        label=ConceptRelationshipType.REPLACED_BY,
+    )
 
     verbose_print('Saving HGNC concepts to databases...')
 
@@ -218,14 +266,15 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         if graph_db is None:
             graph_db = get_active_graph_db()
 
-        await doc_db.save_terms(
-            terms=concepts,
-            no_upsert=True,
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=hgnc_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts,
+                no_upsert=True,
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=hgnc_graph,
+            ),
         )
         await graph_db.save_annotations(annotations)
     else:
@@ -1,4 +1,6 @@
 import os
+import asyncio
+from itertools import chain, repeat
 import networkx as nx
 import pandas as pd
 
@@ -48,63 +50,52 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         str(os.path.join(CONFIG.data_dir, FILE_PATHS[0])),
         sep='\t',
         dtype=str,
+        usecols=['symbol', 'alias_symbol'],
+        engine='pyarrow',
     )
     withdrawn_df = pd.read_csv(
         str(os.path.join(CONFIG.data_dir, FILE_PATHS[1])),
         sep='\t',
-        dtype={
-            'WITHDRAWN_SYMBOL': str,
-        },
+        dtype=str,
+        usecols=['STATUS', 'WITHDRAWN_SYMBOL'],
         keep_default_na=False,
+        engine='pyarrow',
     )
-    withdrawn_df = withdrawn_df.drop(withdrawn_df[withdrawn_df['STATUS'] == 'Entry Withdrawn'].index)
 
     verbose_print('HGNC symbol file read from disk, constructing concepts...')
 
-    active_symbols = set()
-    symbol_df['alias_symbol_substrings'] = symbol_df['alias_symbol'].str.split('|')
-    alias_symbols = symbol_df['alias_symbol_substrings'].explode().dropna().tolist()
-
-    active_symbols.update(alias_symbols)
-    active_symbols.update(symbol_df['symbol'].tolist())
+    alias_symbols = symbol_df['alias_symbol'].dropna().str.split('|').explode()
+    withdrawn_symbols = set(
+        withdrawn_df.loc[withdrawn_df['STATUS'] != 'Entry Withdrawn', 'WITHDRAWN_SYMBOL'].tolist()
+    )
+    active_symbols = (set(alias_symbols.tolist()) | set(symbol_df['symbol'].tolist())) - withdrawn_symbols
 
-    withdrawn_symbols = set(withdrawn_df['WITHDRAWN_SYMBOL'].tolist())
-    active_symbols = active_symbols - withdrawn_symbols
+    del symbol_df
+    del withdrawn_df
 
     verbose_print('Concept categorisation complete, building graph...')
 
-    concepts = []
-    gene_graph = nx.DiGraph()
-
-    for symbol in iter_progress(
-        active_symbols,
-        description='Processing HGNC active symbols',
-        total=len(active_symbols)
-    ):
-        concept = CONCEPT_CLASS(
+    # Active symbols come first, followed by the withdrawn ones, in a single construction pass
+    symbol_statuses = chain(
+        zip(active_symbols, repeat(ConceptStatus.ACTIVE)),
+        zip(withdrawn_symbols, repeat(ConceptStatus.DEPRECATED)),
+    )
+    concepts = [
+        CONCEPT_CLASS(
             prefix=VOCABULARY_PREFIX,
             conceptId=symbol,
             label=symbol,
-            status=ConceptStatus.ACTIVE,
+            status=status,
         )
-
-        concepts.append(concept)
-        gene_graph.add_node(symbol)
-
-    for symbol in iter_progress(
-        withdrawn_symbols,
-        description='Processing HGNC withdrawn symbols',
-        total=len(withdrawn_symbols)
-    ):
-        concept = CONCEPT_CLASS(
-            prefix=VOCABULARY_PREFIX,
-            conceptId=symbol,
-            label=symbol,
-            status=ConceptStatus.DEPRECATED,
+        for symbol, status in iter_progress(
+            symbol_statuses,
+            description='Processing HGNC symbols',
+            total=len(active_symbols) + len(withdrawn_symbols),
         )
+    ]
 
-        concepts.append(concept)
-        gene_graph.add_node(symbol)
+    gene_graph = nx.DiGraph()
+    gene_graph.add_nodes_from(concept.concept_id for concept in concepts)
 
     verbose_print('Concept processing complete, saving to databases...')
 
@@ -114,14 +105,15 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         if graph_db is None:
             graph_db = get_active_graph_db()
 
-        await doc_db.save_terms(
-            terms=concepts,
-            no_upsert=True,
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=gene_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts,
+                no_upsert=True,
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=gene_graph,
+            ),
         )
     else:
         await write_concepts_to_file(
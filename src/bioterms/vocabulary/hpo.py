@@ -1,16 +1,20 @@
 import os
+import asyncio
+import pickle
+from typing import Optional
 import httpx
 import networkx as nx
-from owlready2 import get_ontology, ThingClass
+from owlready2 import ThingClass
 
+from bioterms import __version__
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptStatus, ConceptRelationshipType, SimilarityMethod
 from bioterms.etc.errors import FilesNotFound
 from bioterms.etc.utils import check_files_exist, ensure_data_directory, download_file, iter_progress, \
-    verbose_print
+    load_owl_ontology, verbose_print
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.concept import Concept
-from .utils import write_concepts_to_file, write_graph_to_file
+from .utils import remove_data_files, write_concepts_to_file, write_graph_to_file
 
 
 VOCABULARY_NAME = 'Human Phenotype Ontology'
@@ -29,6 +33,17 @@ FILE_PATHS = ['hpo/hp.owl']
 TIMESTAMP_FILE = 'hpo/.timestamp'
 CONCEPT_CLASS = Concept
 
+_PARSED_CACHE_FILE = 'hpo/hp.parsed.pkl'
+# Bump whenever the parsing code or the Concept model changes, so older caches are not served
+_PARSED_CACHE_FORMAT = 1
+
+
+async def delete_vocabulary_files():
+    """
+    Delete the HPO owl file, its timestamp and the parsed cache built from it.
+    """
+    await remove_data_files([*FILE_PATHS, TIMESTAMP_FILE, _PARSED_CACHE_FILE])
+
 
 async def download_vocabulary(download_client: httpx.AsyncClient = None):
     """
@@ -55,21 +70,20 @@ def _construct_hpo_concept(hpo_class: ThingClass) -> CONCEPT_CLASS:
     :param hpo_class: The HPO class to convert.
     :return: A Concept instance.
     """
+    # Every owlready2 attribute access is a quadstore lookup, so each property is read only once
+    labels = getattr(hpo_class, 'label', None)
+    definitions = getattr(hpo_class, 'IAO_0000115', None)
+    comments = getattr(hpo_class, 'comment', None)
+
     concept = CONCEPT_CLASS(
         prefix=VOCABULARY_PREFIX,
         conceptTypes=[],
-        conceptId=hpo_class.name.split('_')[-1],
-        label=hpo_class.label[0]
-        if hasattr(hpo_class, 'label') and hpo_class.label
-        else None,
-        definition=hpo_class.IAO_0000115[0]
-        if hasattr(hpo_class, 'IAO_0000115') and hpo_class.IAO_0000115
-        else None,
-        comment=hpo_class.comment[0]
-        if hasattr(hpo_class, 'comment') and hpo_class.comment
-        else None,
+        conceptId=hpo_class.name.rpartition('_')[2],
+        label=labels[0] if labels else None,
+        definition=definitions[0] if definitions else None,
+        comment=comments[0] if comments else None,
         status=ConceptStatus.DEPRECATED
-        if hasattr(hpo_class, 'deprecated') and bool(hpo_class.deprecated)
+        if bool(getattr(hpo_class, 'deprecated', None))
         else ConceptStatus.ACTIVE,
         synonyms=[],
     )
@@ -87,38 +101,125 @@ def _process_hpo_class(hpo_class: ThingClass,
     concept = _construct_hpo_concept(hpo_class)
     relationships: list[tuple[str, str, ConceptRelationshipType]] = []
 
-    if hasattr(hpo_class, 'subclasses'):
-        for child in hpo_class.subclasses():
+    subclasses = getattr(hpo_class, 'subclasses', None)
+    if subclasses is not None:
+        for child in subclasses():
             relationships.append((
-                child.name.split('_')[-1],
+                child.name.rpartition('_')[2],
                 concept.concept_id,
                 ConceptRelationshipType.IS_A
             ))
 
-    if hasattr(hpo_class, 'hasAlternativeId'):
-        for replaced_classes in hpo_class.hasAlternativeId:
+    alternative_ids = getattr(hpo_class, 'hasAlternativeId', None)
+    if alternative_ids is not None:
+        for replaced_classes in alternative_ids:
             relationships.append((
-                replaced_classes.split(':')[-1],
+                replaced_classes.rpartition(':')[2],
                 concept.concept_id,
                 ConceptRelationshipType.REPLACED_BY
             ))
 
-    if hasattr(hpo_class, 'consider'):
+    considered_classes = getattr(hpo_class, 'consider', None)
+    if considered_classes is not None:
         # OBO's `consider` is advisory ("this obsolete term has no confirmed replacement,
         # but you might consider these instead") -- unlike hasAlternativeId, it is not a
         # confident 1:1 identity-preserving merge, so it must not share REPLACED_BY's
         # semantics (multiple non-exclusive suggestions are normal, e.g. HP_0000489 above
         # has two).
-        for considered_class in hpo_class.consider:
+        for considered_class in considered_classes:
             relationships.append((
                 concept.concept_id,
-                considered_class.split(':')[-1],
+                considered_class.rpartition(':')[2],
                 ConceptRelationshipType.CONSIDER
             ))
 
     return concept, relationships
 
 
+def _parse_hpo_ontology(ontology_path: str) -> tuple[list[CONCEPT_CLASS], nx.DiGraph]:
+    """
+    Parse the HPO owl file into concepts and the vocabulary graph.
+    :param ontology_path: The absolute path to the HPO owl file.
+    :return: A tuple of the list of concepts and the HPO graph.
+    """
+    hpo_ontology = load_owl_ontology(ontology_path)
+    # Imported classes from other ontologies (UBERON, GO...) are not HPO concepts
+    hpo_classes = [hpo_class for hpo_class in hpo_ontology.classes() if hpo_class.name.startswith('HP_')]
+    verbose_print('HPO ontology read from file')
+
+    concepts = []
+    relationships: list[tuple[str, str, ConceptRelationshipType]] = []
+
+    for hpo_class in iter_progress(hpo_classes, description='Processing HPO classes', total=len(hpo_classes)):
+        concept, class_relationships = _process_hpo_class(hpo_class)
+        concepts.append(concept)
+        relationships.extend(class_relationships)
+
+    hpo_graph = nx.DiGraph()
+    hpo_graph.add_nodes_from(concept.concept_id for concept in concepts)
+    hpo_graph.add_edges_from(
+        (source_id, target_id, {'label': rel_type})
+        for source_id, target_id, rel_type in relationships
+    )
+
+    return concepts, hpo_graph
+
+
+def _parsed_cache_key(ontology_path: str) -> tuple:
+    """
+    Build the key a parsed cache must match to be reused.
+    :param ontology_path: The absolute path to the HPO owl file.
+    :return: The cache format, the package version and the modification time of the owl file.
+    """
+    return _PARSED_CACHE_FORMAT, __version__, os.stat(ontology_path).st_mtime_ns
+
+
+def _read_parsed_cache(ontology_path: str) -> Optional[tuple[list[CONCEPT_CLASS], nx.DiGraph]]:
+    """
+    Read the concepts and graph cached from an earlier parse of the HPO owl file.
+    :param ontology_path: The absolute path to the HPO owl file.
+    :return: A tuple of the list of concepts and the HPO graph, or None if there is no usable cache
+        for the current owl file and code.
+    """
+    cache_path = os.path.join(CONFIG.data_dir, _PARSED_CACHE_FILE)
+
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with open(cache_path, 'rb') as cache_file:
+            # The key is pickled on its own, so a stale cache is rejected before its concepts are loaded
+            if pickle.load(cache_file) != _parsed_cache_key(ontology_path):
+                return None
+
+            concepts, hpo_graph = pickle.load(cache_file)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+        verbose_print(f'Discarding unreadable HPO parsed cache: {e}')
+        return None
+
+    return concepts, hpo_graph
+
+
+def _write_parsed_cache(ontology_path: str,
+                        concepts: list[CONCEPT_CLASS],
+                        hpo_graph: nx.DiGraph,
+                        ):
+    """
+    Cache the parsed concepts and graph, keyed by the owl file modification time and the code version.
+    :param ontology_path: The absolute path to the HPO owl file.
+    :param concepts: The list of parsed concepts.
+    :param hpo_graph: The parsed HPO graph.
+    """
+    cache_path = os.path.join(CONFIG.data_dir, _PARSED_CACHE_FILE)
+    temp_path = f'{cache_path}.tmp'
+
+    with open(temp_path, 'wb') as cache_file:
+        pickle.dump(_parsed_cache_key(ontology_path), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump((concepts, hpo_graph), cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.replace(temp_path, cache_path)
+
+
 async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
                                     graph_db: GraphDatabase = None,
                                     offline: bool = False,
@@ -133,29 +234,17 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         raise FilesNotFound('HPO owl file not found')
 
     full_ontology_path = os.path.join(CONFIG.data_dir, FILE_PATHS[0])
-    verbose_print(f'Loading HPO ontology from {full_ontology_path}')
-
-    owl_file_path = f'file://{full_ontology_path}'
 
-    hpo_ontology = get_ontology(owl_file_path).load()
-    hpo_classes = list(hpo_ontology.classes())
-    verbose_print('HPO ontology read from file')
-
-    hpo_graph = nx.DiGraph()
-    concepts = []
+    # Parsing the owl file dominates the load, so the result is reused until the file changes
+    parsed = _read_parsed_cache(full_ontology_path)
 
-    for hpo_class in iter_progress(hpo_classes, description='Processing HPO classes', total=len(hpo_classes)):
-        if hpo_class.name.startswith('HP_'):
-            concept, relationships = _process_hpo_class(hpo_class)
-            concepts.append(concept)
-            hpo_graph.add_node(concept.concept_id)
-
-            for source_id, target_id, rel_type in relationships:
-                hpo_graph.add_edge(
-                    source_id,
-                    target_id,
-                    label=rel_type
-                )
+    if parsed is not None:
+        verbose_print('HPO ontology unchanged since the last load, using the parsed cache')
+        concepts, hpo_graph = parsed
+    else:
+        verbose_print(f'Loading HPO ontology from {full_ontology_path}')
+        concepts, hpo_graph = _parse_hpo_ontology(full_ontology_path)
+        _write_parsed_cache(full_ontology_path, concepts, hpo_graph)
 
     if not offline:
         if doc_db is None:
@@ -165,14 +254,15 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
 
         verbose_print('Saving HPO concepts and graph to databases')
 
-        await doc_db.save_terms(
-            terms=concepts,
-            no_upsert=True,
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=hpo_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts,
+                no_upsert=True,
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=hpo_graph,
+            ),
         )
     else:
         await write_concepts_to_file(
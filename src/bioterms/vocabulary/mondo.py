@@ -1,7 +1,8 @@
 import os
+import asyncio
 import httpx
 import networkx as nx
-from owlready2 import get_ontology, ThingClass
+from owlready2 import ThingClass
 from urllib.parse import unquote
 
 from bioterms.etc.consts import CONFIG
@@ -9,7 +10,7 @@ from bioterms.etc.enums import ConceptPrefix, ConceptStatus, ConceptRelationship
     AnnotationType
 from bioterms.etc.errors import FilesNotFound
 from bioterms.etc.utils import check_files_exist, ensure_data_directory, download_file, iter_progress, \
-    verbose_print
+    load_owl_ontology, verbose_print
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.concept import Concept
 from bioterms.model.annotation import Annotation
@@ -238,9 +239,7 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
     full_ontology_path = os.path.join(CONFIG.data_dir, FILE_PATHS[0])
     verbose_print(f'Loading Mondo ontology from {full_ontology_path}')
 
-    owl_file_path = f'file://{full_ontology_path}'
-
-    mondo_ontology = get_ontology(owl_file_path).load()
+    mondo_ontology = load_owl_ontology(full_ontology_path)
     mondo_classes = list(mondo_ontology.classes())
     verbose_print('Mondo ontology read from file')
 
@@ -268,14 +267,15 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
 
         verbose_print('Saving Mondo concepts and graph to databases')
 
-        await doc_db.save_terms(
-            terms=concepts,
-            no_upsert=True,
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=mondo_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts,
+                no_upsert=True,
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=mondo_graph,
+            ),
         )
 
         verbose_print(f'Saving {len(annotations)} OHDSI annotations to the database...')
@@ -1,9 +1,9 @@
 import os
+import asyncio
 import aiofiles
 import aiofiles.os
 import httpx
 import networkx as nx
-import pandas as pd
 
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptStatus, ConceptRelationshipType, SimilarityMethod
@@ -12,7 +12,7 @@ from bioterms.etc.utils import check_files_exist, ensure_data_directory, downloa
     iter_progress, verbose_print
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.concept import Concept
-from .utils import write_concepts_to_file, write_graph_to_file
+from .utils import read_string_columns, series_values, write_concepts_to_file, write_graph_to_file
 
 
 VOCABULARY_NAME = 'National Cancer Institute Thesaurus'
@@ -66,39 +66,6 @@ async def download_vocabulary(download_client: httpx.AsyncClient = None):
             pass
 
 
-def _build_ncit_concept(row,
-                        ncit_graph: nx.DiGraph,
-                        ) -> CONCEPT_CLASS:
-    """
-    Build a Concept for one NCIT thesaurus row and wire its is-a edges into the graph.
-    :param row: The row from the NCIT flat file dataframe.
-    :param ncit_graph: The NCIT graph to add is-a edges to.
-    :return: The built Concept instance.
-    """
-    synonyms = row['synonyms'].split('|')
-
-    concept = CONCEPT_CLASS(
-        prefix=VOCABULARY_PREFIX,
-        conceptId=row['code'],
-        label=synonyms[0],
-        synonyms=synonyms[1:] if len(synonyms) > 1 else None,
-        definition=row['definition'] if not pd.isna(row['definition']) else None,
-        status=ConceptStatus.DEPRECATED if row['concept_status'] == 'Obsolete_Concept' else ConceptStatus.ACTIVE,
-    )
-
-    ncit_graph.add_node(row['code'])
-
-    if not pd.isna(row['parents']):
-        for parent in row['parents'].split('|'):
-            ncit_graph.add_edge(
-                row['code'],
-                parent,
-                label=ConceptRelationshipType.IS_A
-            )
-
-    return concept
-
-
 async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
                                     graph_db: GraphDatabase = None,
                                     offline: bool = False,
@@ -114,34 +81,53 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
 
     flat_file_path = str(os.path.join(CONFIG.data_dir, FILE_PATHS[0]))
 
-    ncit_df = pd.read_csv(
+    # The flat file columns are code, IRI, parents, synonyms, definition, display name, status,
+    # semantic type and subsets, only the ones the concepts use are read
+    ncit_df = read_string_columns(
         flat_file_path,
-        sep='\t',
-        names=[
-            'code',
-            'concept_iri',
-            'parents',
-            'synonyms',
-            'definition',
-            'display_name',
-            'concept_status',
-            'semantic_type',
-            'concept_in_subset',
-        ],
-        dtype=str,
-    )
+        delimiter='\t',
+        columns={0: 'code', 2: 'parents', 3: 'synonyms', 4: 'definition', 6: 'concept_status'},
+    ).to_pandas()
 
     verbose_print('NCIT flat file read from disk, constructing concepts...')
 
+    # The first of the pipe-separated synonyms is the preferred label
+    synonym_lists = ncit_df['synonyms'].str.split('|')
+    concept_rows = zip(
+        ncit_df['code'].tolist(),
+        synonym_lists.str[0].tolist(),
+        synonym_lists.str[1:].tolist(),
+        series_values(ncit_df['definition']),
+        (ncit_df['concept_status'] == 'Obsolete_Concept').tolist(),
+    )
+    concepts = [
+        CONCEPT_CLASS(
+            prefix=VOCABULARY_PREFIX,
+            conceptId=code,
+            label=label,
+            synonyms=synonyms or None,
+            definition=definition,
+            status=ConceptStatus.DEPRECATED if obsolete else ConceptStatus.ACTIVE,
+        )
+        for code, label, synonyms, definition, obsolete in iter_progress(
+            concept_rows,
+            description='Processing NCIT concepts',
+            total=len(ncit_df),
+        )
+    ]
+
+    parent_df = ncit_df[['code', 'parents']].dropna()
+    parent_df = parent_df.assign(parents=parent_df['parents'].str.split('|')).explode('parents')
+
     ncit_graph = nx.DiGraph()
-    concepts = []
+    ncit_graph.add_nodes_from(ncit_df['code'].tolist())
+    ncit_graph.add_edges_from(
+        zip(parent_df['code'].tolist(), parent_df['parents'].tolist()),
+        label=ConceptRelationshipType.IS_A,
+    )
 
-    for _, row in iter_progress(
-        ncit_df.iterrows(),
-        description='Processing NCIT concepts',
-        total=len(ncit_df)
-    ):
-        concepts.append(_build_ncit_concept(row, ncit_graph))
+    del ncit_df
+    del parent_df
 
     verbose_print('NCIT concepts constructed, saving to databases...')
 
@@ -151,14 +137,15 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         if graph_db is None:
             graph_db = get_active_graph_db()
 
-        await doc_db.save_terms(
-            terms=concepts,
-            no_upsert=True,
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=ncit_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts,
+                no_upsert=True,
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=ncit_graph,
+            ),
         )
     else:
         await write_concepts_to_file(
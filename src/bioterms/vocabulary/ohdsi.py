@@ -7,7 +7,7 @@ import pandas as pd
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptStatus, ConceptRelationshipType, AnnotationType
 from bioterms.etc.errors import FilesNotFound
-from bioterms.etc.utils import check_files_exist, iter_progress, verbose_print
+from bioterms.etc.utils import check_files_exist, gc_paused, iter_progress, verbose_print
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.concept import OhdsiDrugStrength, OhdsiConcept
 from bioterms.model.annotation import Annotation
@@ -85,10 +85,12 @@ def _canonicalize_relationship_id(relationship_id: str,
             sep='\t',
         )
 
-        for _, row in relationship_df.iterrows():
-            rel_id = row['relationship_id']
-            rev_rel_id = row['reverse_relationship_id']
+        relationship_rows = relationship_df[['relationship_id', 'reverse_relationship_id']].itertuples(
+            index=False,
+            name=None,
+        )
 
+        for rel_id, rev_rel_id in relationship_rows:
             if rev_rel_id in _CANONICAL_RELATIONSHIP_CACHE:
                 # Reverse relationship already mapped
                 continue
@@ -267,20 +269,23 @@ def _process_concepts() -> dict[int, CONCEPT_CLASS]:
     concepts: dict[int, CONCEPT_CLASS] = {}
 
     for chunk in iter_progress(chunks, desc='Processing OHDSI concepts'):
-        for _, row in iter_progress(chunk.iterrows(),
-                                    description='Processing OHDSI concept rows',
-                                    total=len(chunk),
-                                    transient=True,
-                                    ):
-            concept = CONCEPT_CLASS(
-                prefix=VOCABULARY_PREFIX,
-                conceptId=str(row['concept_id']),
-                label=str(row['concept_name']),
-                status=ConceptStatus.DEPRECATED
-                       if row['valid_end_date'] < date_int
-                       else ConceptStatus.ACTIVE,
-            )
-            concepts[row['concept_id']] = concept
+        concept_rows = chunk[['concept_id', 'concept_name', 'valid_end_date']].itertuples(index=False, name=None)
+        with gc_paused():
+            for concept_id, concept_name, valid_end_date in iter_progress(
+                concept_rows,
+                description='Processing OHDSI concept rows',
+                total=len(chunk),
+                transient=True,
+            ):
+                concept = CONCEPT_CLASS(
+                    prefix=VOCABULARY_PREFIX,
+                    conceptId=str(concept_id),
+                    label=str(concept_name),
+                    status=ConceptStatus.DEPRECATED
+                           if valid_end_date < date_int
+                           else ConceptStatus.ACTIVE,
+                )
+                concepts[concept_id] = concept
 
     return concepts
 
@@ -306,13 +311,13 @@ def _process_synonyms(concepts: dict[int, CONCEPT_CLASS]):
     )
 
     for chunk in iter_progress(chunks, desc='Processing OHDSI concept synonyms'):
-        for _, row in iter_progress(chunk.iterrows(),
-                                    description='Processing OHDSI concept synonym rows',
-                                    total=len(chunk),
-                                    transient=True,
-                                    ):
-            concept_id = row['concept_id']
-            synonym = row['concept_synonym_name']
+        synonym_rows = chunk[['concept_id', 'concept_synonym_name']].itertuples(index=False, name=None)
+        for concept_id, synonym in iter_progress(
+            synonym_rows,
+            description='Processing OHDSI concept synonym rows',
+            total=len(chunk),
+            transient=True,
+        ):
             if concept_id in concepts:
                 concept = concepts[concept_id]
                 if concept.synonyms is None:
@@ -325,27 +330,27 @@ def _apply_drug_strength_row(row,
                              ):
     """
     Build a drug strength entry from one DRUG_STRENGTH.csv row and attach it to its drug concept.
-    :param row: The row from the OHDSI DRUG_STRENGTH.csv file.
+    :param row: The row from the OHDSI DRUG_STRENGTH.csv file, as a named tuple with missing values as None.
     :param concepts: A dictionary mapping concept IDs to Concept instances.
     """
     drug_strength = OhdsiDrugStrength(
-        ingredientId=str(row['ingredient_concept_id']),
-        amountValue=row['amount_value'] if not pd.isna(row['amount_value']) else None,
-        numeratorValue=row['numerator_value'] if not pd.isna(row['numerator_value']) else None,
-        denominatorValue=row['denominator_value'] if not pd.isna(row['denominator_value']) else None,
+        ingredientId=str(row.ingredient_concept_id),
+        amountValue=row.amount_value,
+        numeratorValue=row.numerator_value,
+        denominatorValue=row.denominator_value,
     )
 
-    if not pd.isna(row['amount_unit_concept_id']):
-        amount_unit = concepts[row['amount_unit_concept_id']].label
+    if row.amount_unit_concept_id is not None:
+        amount_unit = concepts[row.amount_unit_concept_id].label
         drug_strength.amount_unit = amount_unit
-    if not pd.isna(row['numerator_unit_concept_id']):
-        numerator_unit = concepts[row['numerator_unit_concept_id']].label
+    if row.numerator_unit_concept_id is not None:
+        numerator_unit = concepts[row.numerator_unit_concept_id].label
         drug_strength.numerator_unit = numerator_unit
-    if not pd.isna(row['denominator_unit_concept_id']):
-        denominator_unit = concepts[row['denominator_unit_concept_id']].label
+    if row.denominator_unit_concept_id is not None:
+        denominator_unit = concepts[row.denominator_unit_concept_id].label
         drug_strength.denominator_unit = denominator_unit
 
-    drug_concept = concepts.get(row['drug_concept_id'])
+    drug_concept = concepts.get(row.drug_concept_id)
     if drug_concept:
         if drug_concept.drug_strengths is None:
             drug_concept.drug_strengths = []
@@ -389,11 +394,14 @@ def _process_drug_strength(concepts: dict[int, CONCEPT_CLASS]):
     )
 
     for chunk in iter_progress(chunks, desc='Processing OHDSI drug strengths'):
-        for _, row in iter_progress(chunk.iterrows(),
-                                    description='Processing OHDSI drug strength rows',
-                                    total=len(chunk),
-                                    transient=True,
-                                    ):
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+
+        for row in iter_progress(
+            chunk.itertuples(index=False, name='DrugStrengthRow'),
+            description='Processing OHDSI drug strength rows',
+            total=len(chunk),
+            transient=True,
+        ):
             _apply_drug_strength_row(row, concepts)
 
 
@@ -427,23 +435,27 @@ def _process_relationships(ohdsi_graph: nx.MultiDiGraph):
     )
 
     for chunk in iter_progress(relationship_chunks, desc='Processing OHDSI concept relationships'):
-        for _, row in iter_progress(chunk.iterrows(),
-                                    description='Processing OHDSI concept relationship rows',
-                                    total=len(chunk),
-                                    transient=True,
-                                    ):
-            if row['valid_end_date'] < date_int:
+        relationship_rows = chunk[
+            ['concept_id_1', 'concept_id_2', 'relationship_id', 'valid_end_date']
+        ].itertuples(index=False, name=None)
+        for concept_id_1, concept_id_2, relationship_id, valid_end_date in iter_progress(
+            relationship_rows,
+            description='Processing OHDSI concept relationship rows',
+            total=len(chunk),
+            transient=True,
+        ):
+            if valid_end_date < date_int:
                 continue
-            if row['concept_id_1'] == row['concept_id_2']:
+            if concept_id_1 == concept_id_2:
                 # Self-mapping rows (overwhelmingly 'Maps to'/'Mapped from' pairs, where every
                 # standard concept trivially maps to itself) carry no graph-topological
                 # information -- skip, mirroring the same guard in _process_annotations.
                 continue
             _add_relationship(
                 ohdsi_graph,
-                row['relationship_id'],
-                str(row['concept_id_1']),
-                str(row['concept_id_2']),
+                relationship_id,
+                str(concept_id_1),
+                str(concept_id_2),
             )
 
     ancestor_chunks = pd.read_csv(
@@ -463,22 +475,26 @@ def _process_relationships(ohdsi_graph: nx.MultiDiGraph):
     )
 
     for chunk in iter_progress(ancestor_chunks, desc='Processing OHDSI concept ancestors'):
-        for _, row in iter_progress(chunk.iterrows(),
-                                    description='Processing OHDSI concept ancestor rows',
-                                    total=len(chunk),
-                                    transient=True,
-                                    ):
+        ancestor_rows = chunk[
+            ['ancestor_concept_id', 'descendant_concept_id', 'min_levels_of_separation']
+        ].itertuples(index=False, name=None)
+        for ancestor_id, descendant_id, min_levels_of_separation in iter_progress(
+            ancestor_rows,
+            description='Processing OHDSI concept ancestor rows',
+            total=len(chunk),
+            transient=True,
+        ):
             # min_levels_of_separation == 0 means ancestor and descendant are the SAME
             # concept (CONCEPT_ANCESTOR's documented self-row convention) -- that is not a
             # hierarchy edge. Direct parent-child pairs are separation == 1; deeper values
             # are transitive (grandparent, etc.) and are intentionally not flattened into
             # is_a here.
-            if row['min_levels_of_separation'] != 1:
+            if min_levels_of_separation != 1:
                 continue
 
             ohdsi_graph.add_edge(
-                str(row['descendant_concept_id']),
-                str(row['ancestor_concept_id']),
+                str(descendant_id),
+                str(ancestor_id),
                 key='is_a',
                 label=ConceptRelationshipType.IS_A,
             )
@@ -512,20 +528,23 @@ def _process_annotations() -> list[Annotation]:
     annotations = []
 
     for chunk in iter_progress(chunks, desc='Processing OHDSI annotations'):
-        for _, row in iter_progress(chunk.iterrows(),
-                                    description='Processing OHDSI annotation rows',
-                                    total=len(chunk),
-                                    transient=True,
-                                    ):
-            # Ignore the NaN vocabulary IDs and concept codes
-            if pd.isna(row['vocabulary_id']) or pd.isna(row['concept_code']):
-                continue
-
-            if str(row['concept_id']) == str(row['concept_code']):
+        # Ignore the NaN vocabulary IDs and concept codes
+        chunk = chunk.dropna(subset=['vocabulary_id', 'concept_code'])
+        annotation_rows = chunk[['concept_id', 'vocabulary_id', 'concept_code']].itertuples(
+            index=False,
+            name=None,
+        )
+        for concept_id, vocabulary_id, concept_code in iter_progress(
+            annotation_rows,
+            description='Processing OHDSI annotation rows',
+            total=len(chunk),
+            transient=True,
+        ):
+            if str(concept_id) == str(concept_code):
                 # Skip self-mapping
                 continue
 
-            vocabulary_prefix = map_vocabulary_prefix(row['vocabulary_id'])
+            vocabulary_prefix = map_vocabulary_prefix(vocabulary_id)
             if vocabulary_prefix == 'Vocabulary':
                 # Special case: these codes are representing vocabularies themselves, and does
                 # not even have a unique concept code.
@@ -534,8 +553,8 @@ def _process_annotations() -> list[Annotation]:
             annotation = Annotation(
                 prefixFrom=VOCABULARY_PREFIX,
                 prefixTo=vocabulary_prefix,
-                conceptIdFrom=str(row['concept_id']),
-                conceptIdTo=str(row['concept_code']),
+                conceptIdFrom=str(concept_id),
+                conceptIdTo=str(concept_code),
                 annotationType=AnnotationType.EXACT,
             )
             annotations.append(annotation)
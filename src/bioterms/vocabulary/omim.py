@@ -1,9 +1,9 @@
 import os
+import asyncio
 import aiofiles
 import aiofiles.os
 import httpx
 import networkx as nx
-import pandas as pd
 
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptStatus, ConceptRelationshipType, SimilarityMethod
@@ -12,7 +12,7 @@ from bioterms.etc.utils import check_files_exist, ensure_data_directory, downloa
     iter_progress, verbose_print
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.concept import Concept
-from .utils import write_concepts_to_file, write_graph_to_file
+from .utils import read_csv_columns, series_values, write_concepts_to_file, write_graph_to_file
 
 
 VOCABULARY_NAME = 'Online Mendelian Inheritance in Man'
@@ -67,46 +67,6 @@ async def download_vocabulary(download_client: httpx.AsyncClient = None):
             pass
 
 
-def _build_omim_concept(row,
-                        omim_graph: nx.DiGraph,
-                        ) -> CONCEPT_CLASS:
-    """
-    Build a Concept for one OMIM row and wire its is-a and replaced-by edges into the graph.
-    :param row: The row from the OMIM CSV dataframe.
-    :param omim_graph: The OMIM graph to add edges to.
-    :return: The built Concept instance.
-    """
-    concept = CONCEPT_CLASS(
-        prefix=VOCABULARY_PREFIX,
-        conceptId=row['Class ID'].split('/')[-1],
-        label=row['Preferred Label'] if not pd.isna(row['Preferred Label']) else None,
-        synonyms=row['Synonyms'].split('|') if not pd.isna(row['Synonyms']) else None,
-        status=ConceptStatus.DEPRECATED
-            if not pd.isna(row['Obsolete']) and bool(row['Obsolete'])
-            else ConceptStatus.ACTIVE,
-    )
-
-    omim_graph.add_node(concept.concept_id)
-
-    if not pd.isna(row['Parents']):
-        for parent in row['Parents'].split('|'):
-            omim_graph.add_edge(
-                concept.concept_id,
-                parent.split('/')[-1],
-                label=ConceptRelationshipType.IS_A
-            )
-
-    if not pd.isna(row['Moved from']):
-        for moved_from_id in row['Moved from'].split('|'):
-            omim_graph.add_edge(
-                moved_from_id,
-                concept.concept_id,
-                label=ConceptRelationshipType.REPLACED_BY
-            )
-
-    return concept
-
-
 async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
                                     graph_db: GraphDatabase = None,
                                     offline: bool = False,
@@ -122,21 +82,56 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
 
     csv_path = str(os.path.join(CONFIG.data_dir, FILE_PATHS[0]))
 
-    omim_df = pd.read_csv(
+    omim_df = read_csv_columns(
         csv_path,
+        columns=['Class ID', 'Preferred Label', 'Synonyms', 'Obsolete', 'Parents', 'Moved from'],
     )
 
     verbose_print('OMIM release file loaded from disk, processing concepts...')
 
+    # IDs and synonym lists are split for the whole column at once, and missing cells are turned
+    # into None once per column, instead of checked with pd.isna per row
+    omim_df['concept_id'] = omim_df['Class ID'].str.rpartition('/')[2]
+    omim_rows = zip(
+        omim_df['concept_id'].tolist(),
+        series_values(omim_df['Preferred Label']),
+        series_values(omim_df['Synonyms'].str.split('|')),
+        series_values(omim_df['Obsolete']),
+    )
+    concepts = [
+        CONCEPT_CLASS(
+            prefix=VOCABULARY_PREFIX,
+            conceptId=concept_id,
+            label=preferred_label,
+            synonyms=synonyms,
+            status=ConceptStatus.DEPRECATED if obsolete else ConceptStatus.ACTIVE,
+        )
+        for concept_id, preferred_label, synonyms, obsolete in iter_progress(
+            omim_rows,
+            description='Processing OMIM ontology file',
+            total=len(omim_df),
+        )
+    ]
+
+    parent_df = omim_df[['concept_id', 'Parents']].dropna()
+    parent_df = parent_df.assign(Parents=parent_df['Parents'].str.split('|')).explode('Parents')
+    moved_df = omim_df[['concept_id', 'Moved from']].dropna()
+    moved_df = moved_df.assign(**{'Moved from': moved_df['Moved from'].str.split('|')}).explode('Moved from')
+
     omim_graph = nx.DiGraph()
-    concepts = []
+    omim_graph.add_nodes_from(omim_df['concept_id'].tolist())
+    omim_graph.add_edges_from(
+        zip(parent_df['concept_id'].tolist(), parent_df['Parents'].str.rpartition('/')[2].tolist()),
+        label=ConceptRelationshipType.IS_A,
+    )
+    omim_graph.add_edges_from(
+        zip(moved_df['Moved from'].tolist(), moved_df['concept_id'].tolist()),
+        label=ConceptRelationshipType.REPLACED_BY,
+    )
 
-    for _, row in iter_progress(
-        omim_df.iterrows(),
-        description='Processing OMIM ontology file',
-        total=len(omim_df),
-    ):
-        concepts.append(_build_omim_concept(row, omim_graph))
+    del omim_df
+    del parent_df
+    del moved_df
 
     verbose_print('Concept processing complete, saving to databases...')
 
@@ -146,14 +141,15 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         if graph_db is None:
             graph_db = get_active_graph_db()
 
-        await doc_db.save_terms(
-            terms=concepts,
-            no_upsert=True,
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=omim_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts,
+                no_upsert=True,
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=omim_graph,
+            ),
         )
     else:
         await write_concepts_to_file(
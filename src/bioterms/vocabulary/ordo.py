@@ -1,13 +1,14 @@
 import os
+import asyncio
 import httpx
 import networkx as nx
-from owlready2 import get_ontology, ThingClass, PropertyClass, Restriction
+from owlready2 import ThingClass, PropertyClass, Restriction
 
 from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptStatus, ConceptRelationshipType, SimilarityMethod
 from bioterms.etc.errors import FilesNotFound
 from bioterms.etc.utils import check_files_exist, ensure_data_directory, download_file, iter_progress, \
-    verbose_print
+    load_owl_ontology, verbose_print
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.concept import Concept
 from .utils import write_concepts_to_file, write_graph_to_file
@@ -59,19 +60,18 @@ def _construct_ordo_concept(ordo_class: ThingClass) -> Concept:
     :param ordo_class: The ORDO class to convert.
     :return: A Concept instance.
     """
+    # Each annotation property is a lookup in the quadstore, so it is read only once
+    labels = getattr(ordo_class, 'label', None)
+    definitions = getattr(ordo_class, 'definition', None)
+    alternative_terms = getattr(ordo_class, 'alternative_term', None)
+
     concept = CONCEPT_CLASS(
         prefix=VOCABULARY_PREFIX,
         conceptTypes=[],
         conceptId=ordo_class.name.split('_')[-1],
-        label=ordo_class.label[0]
-        if hasattr(ordo_class, 'label') and ordo_class.label
-        else None,
-        definition=str(ordo_class.definition[0])
-        if hasattr(ordo_class, 'definition') and ordo_class.definition
-        else None,
-        synonyms=list(ordo_class.alternative_term)
-        if hasattr(ordo_class, 'alternative_term') and ordo_class.alternative_term
-        else None,
+        label=labels[0] if labels else None,
+        definition=str(definitions[0]) if definitions else None,
+        synonyms=list(alternative_terms) if alternative_terms else None,
     )
 
     return concept
@@ -132,12 +132,13 @@ def _process_ordo_class(ordo_class: ThingClass,
     if is_deprecated:
         concept.status = ConceptStatus.DEPRECATED
 
-    if part_of_prop[ordo_class]:
+    part_of_parents = part_of_prop[ordo_class]
+    if part_of_parents:
         # ORDO's BFO 'part of' axiom (e.g. a specific disorder that is part of a disease
         # group/family in Orphanet's classification) is a distinct relation from subClassOf
         # is_a -- keep it as PART_OF rather than collapsing it into is_a (see project
         # convention: never overwrite/relabel the observed source relation).
-        for parent in part_of_prop[ordo_class]:
+        for parent in part_of_parents:
             if isinstance(parent, ThingClass) and parent.name.startswith('Orphanet_'):
                 relationships.append((
                     concept.concept_id,
@@ -160,15 +161,16 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
     if not check_files_exist(FILE_PATHS):
         raise FilesNotFound('ORDO owl file not found')
 
-    owl_file_path = f'file://{os.path.join(CONFIG.data_dir, FILE_PATHS[0])}'
-
-    ordo_ontology = get_ontology(owl_file_path).load()
-    ordo_classes = list(ordo_ontology.classes())
+    ordo_ontology = load_owl_ontology(os.path.join(CONFIG.data_dir, FILE_PATHS[0]))
+    # Imported classes from other ontologies are not ORDO concepts
+    ordo_classes = [
+        ordo_class for ordo_class in ordo_ontology.classes() if ordo_class.name.startswith('Orphanet_')
+    ]
 
     verbose_print('ORDO ontology loaded from disk, processing concepts...')
 
-    ordo_graph = nx.DiGraph()
     concepts = []
+    relationships: list[tuple[str, str, ConceptRelationshipType]] = []
     part_of_prop = [p for p in ordo_ontology.object_properties() if p.name.startswith('BFO_0000050')][0]
 
     for ordo_class in iter_progress(
@@ -176,17 +178,16 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         description='Processing ORDO classes',
         total=len(ordo_classes)
     ):
-        if ordo_class.name.startswith('Orphanet_'):
-            concept, relationships = _process_ordo_class(ordo_class, part_of_prop)
-            concepts.append(concept)
-            ordo_graph.add_node(concept.concept_id)
-
-            for source_id, target_id, rel_type in relationships:
-                ordo_graph.add_edge(
-                    source_id,
-                    target_id,
-                    label=rel_type
-                )
+        concept, class_relationships = _process_ordo_class(ordo_class, part_of_prop)
+        concepts.append(concept)
+        relationships.extend(class_relationships)
+
+    ordo_graph = nx.DiGraph()
+    ordo_graph.add_nodes_from(concept.concept_id for concept in concepts)
+    ordo_graph.add_edges_from(
+        (source_id, target_id, {'label': rel_type})
+        for source_id, target_id, rel_type in relationships
+    )
 
     verbose_print('Concept processing complete, saving to databases...')
 
@@ -196,14 +197,15 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         if graph_db is None:
             graph_db = get_active_graph_db()
 
-        await doc_db.save_terms(
-            terms=concepts,
-            no_upsert=True,
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=ordo_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts,
+                no_upsert=True,
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=ordo_graph,
+            ),
         )
     else:
         await write_concepts_to_file(
@@ -1,4 +1,5 @@
 import os
+import asyncio
 import json
 import httpx
 import networkx as nx
@@ -12,8 +13,8 @@ from bioterms.etc.utils import check_files_exist, ensure_data_directory, downloa
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.concept import ReactomeConcept
 from bioterms.model.annotation import Annotation
-from .utils import ensure_gene_symbol_loaded, write_concepts_to_file, write_graph_to_file, \
-    write_annotations_to_file
+from .utils import ensure_gene_symbol_loaded, read_csv_columns, series_values, write_concepts_to_file, \
+    write_graph_to_file, write_annotations_to_file
 
 
 VOCABULARY_NAME = 'Reactome Pathways'
@@ -62,11 +63,12 @@ def _load_uniprot_to_symbol_map() -> dict[str, str]:
     )
 
     uniprot_to_symbol: dict[str, str] = {}
-    for _, row in hgnc_df.dropna(subset=['uniprot_ids']).iterrows():
-        for uniprot_id in row['uniprot_ids'].split('|'):
+    hgnc_df = hgnc_df.dropna(subset=['uniprot_ids'])
+    for symbol, uniprot_ids in hgnc_df[['symbol', 'uniprot_ids']].itertuples(index=False, name=None):
+        for uniprot_id in uniprot_ids.split('|'):
             # First mapping wins on the rare case a UniProt accession is listed for more
             # than one HGNC entry; ambiguous re-assignment is not attempted here.
-            uniprot_to_symbol.setdefault(uniprot_id, row['symbol'])
+            uniprot_to_symbol.setdefault(uniprot_id, symbol)
 
     return uniprot_to_symbol
 
@@ -110,11 +112,11 @@ def _parse_synonyms(synonym_str: str,
                     ) -> list[str] | None:
     """
     Parse synonyms from a string.
-    :param synonym_str: The synonym string, may be NaN or a JSON encoded array.
+    :param synonym_str: The synonym string, may be None or a JSON encoded array.
     :param label: The primary label of the concept. This will be removed from the synonyms if present.
     :return: A list of synonyms or None.
     """
-    if pd.isna(synonym_str):
+    if synonym_str is None:
         return None
 
     synonyms = json.loads(synonym_str)
@@ -130,69 +132,69 @@ def _process_concept_files() -> tuple[list[CONCEPT_CLASS], nx.DiGraph]:
     Process Reactome concept files from disk and construct concepts and graph.
     :return: A tuple of list of concepts and the concept graph.
     """
-    pathway_df = pd.read_csv(str(os.path.join(CONFIG.data_dir, FILE_PATHS[0])))
-    reaction_df = pd.read_csv(str(os.path.join(CONFIG.data_dir, FILE_PATHS[2])))
-    gene_df = pd.read_csv(str(os.path.join(CONFIG.data_dir, FILE_PATHS[5])))
+    pathway_df = read_csv_columns(str(os.path.join(CONFIG.data_dir, FILE_PATHS[0])))
+    reaction_df = read_csv_columns(str(os.path.join(CONFIG.data_dir, FILE_PATHS[2])))
+    gene_df = read_csv_columns(str(os.path.join(CONFIG.data_dir, FILE_PATHS[5])))
 
     concepts = []
-    reactome_graph = nx.DiGraph()
 
     verbose_print('Reactome concept files loaded from disk, processing concepts...')
 
-    for _, row in iter_progress(
-        pathway_df.iterrows(),
+    for st_id, display_name in iter_progress(
+        zip(pathway_df['st_id'].tolist(), series_values(pathway_df['display_name'])),
         description='Processing Reactome pathways',
         total=len(pathway_df),
     ):
         concept = CONCEPT_CLASS(
             prefix=VOCABULARY_PREFIX,
-            conceptId=row['st_id'],
+            conceptId=st_id,
             conceptTypes=[ConceptType.PATHWAY],
-            label=row['display_name'] if not pd.isna(row['display_name']) else None,
+            label=display_name,
             status=ConceptStatus.ACTIVE,
         )
 
         concepts.append(concept)
-        reactome_graph.add_node(row['st_id'])
 
-    for _, row in iter_progress(
-        reaction_df.iterrows(),
+    for st_id, display_name, synonym_str, inferred in iter_progress(
+        zip(*(
+            series_values(reaction_df[column])
+            for column in ('st_id', 'display_name', 'synonyms', 'inferred')
+        )),
         description='Processing Reactome reactions',
         total=len(reaction_df),
     ):
-        label = row['display_name'] if not pd.isna(row['display_name']) else ''
+        label = display_name if display_name is not None else ''
         synonyms = _parse_synonyms(
-            synonym_str=row['synonyms'],
+            synonym_str=synonym_str,
             label=label,
         )
 
         concept = CONCEPT_CLASS(
             prefix=VOCABULARY_PREFIX,
-            conceptId=row['st_id'],
+            conceptId=st_id,
             conceptTypes=[ConceptType.REACTION],
             label=label,
             synonyms=synonyms,
             status=ConceptStatus.ACTIVE,
-            inferred=row['inferred'],
+            inferred=inferred,
         )
 
         concepts.append(concept)
-        reactome_graph.add_node(row['st_id'])
 
-    for _, row in iter_progress(
-        gene_df.iterrows(),
+    for st_id, display_name, synonym_str in iter_progress(
+        zip(*(series_values(gene_df[column]) for column in ('st_id', 'display_name', 'synonyms'))),
         description='Processing Reactome genes',
         total=len(gene_df),
     ):
-        label = row['display_name'] if not pd.isna(row['display_name']) else ''
+        label = display_name if display_name is not None else ''
         synonyms = _parse_synonyms(
-            synonym_str=row['synonyms'],
+            synonym_str=synonym_str,
             label=label,
         )
 
         concept = CONCEPT_CLASS(
             prefix=VOCABULARY_PREFIX,
-            conceptId=row['st_id'],
+            conceptId=st_id,
             conceptTypes=[ConceptType.GENE],
             label=label,
             synonyms=synonyms,
@@ -200,7 +202,9 @@ def _process_concept_files() -> tuple[list[CONCEPT_CLASS], nx.DiGraph]:
         )
 
         concepts.append(concept)
-        reactome_graph.add_node(row['st_id'])
+
+    reactome_graph = nx.DiGraph()
+    reactome_graph.add_nodes_from(concept.concept_id for concept in concepts)
 
     return concepts, reactome_graph
 
@@ -209,65 +213,62 @@ def _process_relationship_files(reactome_graph: nx.DiGraph):
     """
     Process Reactome relationship files from disk and construct the internal relationships graph.
     """
-    pathway_hierarchy_df = pd.read_csv(
-        str(os.path.join(CONFIG.data_dir, FILE_PATHS[1]))
+    pathway_hierarchy_df = read_csv_columns(
+        str(os.path.join(CONFIG.data_dir, FILE_PATHS[1])),
     )
-    reaction_order_df = pd.read_csv(
-        str(os.path.join(CONFIG.data_dir, FILE_PATHS[3]))
+    reaction_order_df = read_csv_columns(
+        str(os.path.join(CONFIG.data_dir, FILE_PATHS[3])),
     )
-    reaction_pathway_df = pd.read_csv(
-        str(os.path.join(CONFIG.data_dir, FILE_PATHS[4]))
+    reaction_pathway_df = read_csv_columns(
+        str(os.path.join(CONFIG.data_dir, FILE_PATHS[4])),
     )
-    gene_reaction_df = pd.read_csv(
-        str(os.path.join(CONFIG.data_dir, FILE_PATHS[6]))
+    gene_reaction_df = read_csv_columns(
+        str(os.path.join(CONFIG.data_dir, FILE_PATHS[6])),
     )
 
     verbose_print('Reactome relationship files loaded from disk, processing relationships...')
 
-    for _, row in iter_progress(
-        pathway_hierarchy_df.iterrows(),
-        description='Processing Reactome pathway hierarchy relationships',
-        total=len(pathway_hierarchy_df),
-    ):
-        reactome_graph.add_edge(
-            row['sub_pathway_st_id'],
-            row['parent_st_id'],
-            label=ConceptRelationshipType.PART_OF,
-        )
+    reactome_graph.add_edges_from(
+        iter_progress(
+            zip(pathway_hierarchy_df['sub_pathway_st_id'].tolist(), pathway_hierarchy_df['parent_st_id'].tolist()),
+            description='Processing Reactome pathway hierarchy relationships',
+            total=len(pathway_hierarchy_df),
+        ),
+        label=ConceptRelationshipType.PART_OF,
+    )
 
-    for _, row in iter_progress(
-        reaction_order_df.iterrows(),
-        description='Processing Reactome reaction order relationships',
-        total=len(reaction_order_df),
-    ):
-        reactome_graph.add_edge(
-            row['reaction_id'],
-            row['preceding_reaction_id'],
-            label=ConceptRelationshipType.PRECEDED_BY,
-        )
+    reactome_graph.add_edges_from(
+        iter_progress(
+            zip(reaction_order_df['reaction_id'].tolist(), reaction_order_df['preceding_reaction_id'].tolist()),
+            description='Processing Reactome reaction order relationships',
+            total=len(reaction_order_df),
+        ),
+        label=ConceptRelationshipType.PRECEDED_BY,
+    )
 
-    for _, row in iter_progress(
-        reaction_pathway_df.iterrows(),
-        description='Processing Reactome reaction-pathway relationships',
-        total=len(reaction_pathway_df),
-    ):
-        reactome_graph.add_edge(
-            row['reaction_id'],
-            row['pathway_id'],
-            label=ConceptRelationshipType.PART_OF,
-        )
+    reactome_graph.add_edges_from(
+        iter_progress(
+            zip(reaction_pathway_df['reaction_id'].tolist(), reaction_pathway_df['pathway_id'].tolist()),
+            description='Processing Reactome reaction-pathway relationships',
+            total=len(reaction_pathway_df),
+        ),
+        label=ConceptRelationshipType.PART_OF,
+    )
 
-    for _, row in iter_progress(
-        gene_reaction_df.iterrows(),
-        description='Processing Reactome gene-reaction relationships',
-        total=len(gene_reaction_df),
-    ):
-        if row['relationship'] in ['input', 'output']:
-            reactome_graph.add_edge(
-                row['reaction_id'],
-                row['gene_id'],
-                label=ConceptRelationshipType(f'has_{row["relationship"]}'),
-            )
+    # Rows are kept in file order, so a gene that is both input and output keeps the later label
+    gene_reaction_df = gene_reaction_df[gene_reaction_df['relationship'].isin(['input', 'output'])]
+    relationship_labels = {
+        'input': {'label': ConceptRelationshipType.HAS_INPUT},
+        'output': {'label': ConceptRelationshipType.HAS_OUTPUT},
+    }
+    reactome_graph.add_edges_from(
+        (reaction_id, gene_id, relationship_labels[relationship])
+        for reaction_id, gene_id, relationship in iter_progress(
+            zip(*(gene_reaction_df[column].tolist() for column in ('reaction_id', 'gene_id', 'relationship'))),
+            description='Processing Reactome gene-reaction relationships',
+            total=len(gene_reaction_df),
+        )
+    )
 
 
 async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
@@ -299,17 +300,17 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
 
     annotations = []
     unresolved_count = 0
-    mapping_df = pd.read_csv(
+    mapping_df = read_csv_columns(
         str(os.path.join(CONFIG.data_dir, FILE_PATHS[7])),
     )
-    for _, row in iter_progress(
-        mapping_df.iterrows(),
+    for gene_id, uniprot_id in iter_progress(
+        mapping_df[['gene_id', 'symbol']].itertuples(index=False, name=None),
         description='Processing Reactome gene symbol mappings',
         total=len(mapping_df),
     ):
-        # row['symbol'] is actually a UniProt accession (see _load_uniprot_to_symbol_map) --
+        # The 'symbol' column is actually a UniProt accession (see _load_uniprot_to_symbol_map) --
         # resolve it to the real HGNC symbol rather than using it as one directly.
-        symbol = uniprot_to_symbol.get(row['symbol'])
+        symbol = uniprot_to_symbol.get(uniprot_id)
         if symbol is None:
             unresolved_count += 1
             continue
@@ -317,7 +318,7 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         annotations.append(Annotation(
             prefixFrom=VOCABULARY_PREFIX,
             prefixTo=ConceptPrefix.HGNC_SYMBOL,
-            conceptIdFrom=row['gene_id'],
+            conceptIdFrom=gene_id,
             conceptIdTo=symbol,
             annotationType=AnnotationType.HAS_SYMBOL,
         ))
@@ -336,14 +337,15 @@ async def load_vocabulary_from_file(doc_db: DocumentDatabase = None,
         if graph_db is None:
             graph_db = get_active_graph_db()
 
-        await doc_db.save_terms(
-            terms=concepts,
-            no_upsert=True,
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=reactome_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts,
+                no_upsert=True,
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=reactome_graph,
+            ),
         )
         await graph_db.save_annotations(annotations)
     else:
@@ -1,4 +1,5 @@
 import os
+import asyncio
 import httpx
 import networkx as nx
 import pandas as pd
@@ -7,7 +8,7 @@ from bioterms.etc.consts import CONFIG
 from bioterms.etc.enums import ConceptPrefix, ConceptStatus, ConceptRelationshipType, SimilarityMethod
 from bioterms.etc.errors import FilesNotFound
 from bioterms.etc.utils import check_files_exist, ensure_data_directory, get_trud_release_url, \
-    download_rf2, rf2_dataframe_deduplicate, iter_progress, verbose_print
+    download_rf2, rf2_dataframe_deduplicate, gc_paused, iter_progress, verbose_print
 from bioterms.database import DocumentDatabase, GraphDatabase, get_active_doc_db, get_active_graph_db
 from bioterms.model.concept import SnomedConcept
 from .utils import write_concepts_to_file, write_graph_to_file
@@ -126,19 +127,20 @@ def _process_concepts(concept_file_path: str) -> dict[int, CONCEPT_CLASS]:
 
     verbose_print(f'Concept file {concept_file_path} loaded, processing concepts...')
 
-    for _, row in iter_progress(
-        concept_df.iterrows(),
-        description='Processing SNOMED concepts',
-        total=len(concept_df)
-    ):
-        concept = CONCEPT_CLASS(
-            prefix=VOCABULARY_PREFIX,
-            conceptId=str(row['id']),
-            fullyDefined=bool(row['definitionStatusId'] == 900000000000073002),
-            status=ConceptStatus.DEPRECATED if bool(row['active'] == 0) else ConceptStatus.ACTIVE,
-        )
+    with gc_paused():
+        for concept_id, active, definition_status_id in iter_progress(
+            concept_df[['id', 'active', 'definitionStatusId']].itertuples(index=False, name=None),
+            description='Processing SNOMED concepts',
+            total=len(concept_df)
+        ):
+            concept = CONCEPT_CLASS(
+                prefix=VOCABULARY_PREFIX,
+                conceptId=str(concept_id),
+                fullyDefined=bool(definition_status_id == 900000000000073002),
+                status=ConceptStatus.DEPRECATED if bool(active == 0) else ConceptStatus.ACTIVE,
+            )
 
-        concepts[row['id']] = concept
+            concepts[concept_id] = concept
 
     return concepts
 
@@ -156,31 +158,36 @@ def _process_descriptions(description_file_path: str,
 
     verbose_print(f'Description file {description_file_path} loaded, processing descriptions...')
 
-    for _, row in iter_progress(
-        description_df.iterrows(),
+    description_rows = description_df[['active', 'conceptId', 'typeId', 'term']].itertuples(
+        index=False,
+        name=None,
+    )
+
+    for active, concept_id, type_id, term in iter_progress(
+        description_rows,
         description='Processing SNOMED descriptions',
         total=len(description_df)
     ):
-        if not bool(row['active']):
+        if not bool(active):
             # See _process_relationships -- deduplication alone does not imply active.
             continue
 
-        if row['conceptId'] not in concepts:
-            concepts[row['conceptId']] = CONCEPT_CLASS(
+        if concept_id not in concepts:
+            concepts[concept_id] = CONCEPT_CLASS(
                 prefix=VOCABULARY_PREFIX,
-                conceptId=str(row['conceptId']),
+                conceptId=str(concept_id),
                 status=None,
             )
 
-        if row['typeId'] == 900000000000003001:
+        if type_id == 900000000000003001:
             # Label
-            concepts[row['conceptId']].label = row['term']
+            concepts[concept_id].label = term
         else:
             # Synonym
-            if concepts[row['conceptId']].synonyms is None:
-                concepts[row['conceptId']].synonyms = [str(row['term'])]
+            if concepts[concept_id].synonyms is None:
+                concepts[concept_id].synonyms = [str(term)]
             else:
-                concepts[row['conceptId']].synonyms.append(str(row['term']))
+                concepts[concept_id].synonyms.append(str(term))
 
 
 def _process_definitions(definition_file_path: str,
@@ -196,19 +203,19 @@ def _process_definitions(definition_file_path: str,
 
     verbose_print(f'Definition file {definition_file_path} loaded, processing definitions...')
 
-    for _, row in iter_progress(
-        definition_df.iterrows(),
+    for active, concept_id, term in iter_progress(
+        definition_df[['active', 'conceptId', 'term']].itertuples(index=False, name=None),
         description='Processing SNOMED definitions',
         total=len(definition_df)
     ):
-        if not bool(row['active']):
+        if not bool(active):
             # See _process_relationships -- deduplication alone does not imply active.
             continue
 
-        if row['conceptId'] not in concepts:
-            raise ValueError(f'Concept ID {row["conceptId"]} not found in concepts dictionary.')
+        if concept_id not in concepts:
+            raise ValueError(f'Concept ID {concept_id} not found in concepts dictionary.')
 
-        concepts[row['conceptId']].definition = row['term']
+        concepts[concept_id].definition = term
 
 
 def _process_relationships(relationship_file_path: str,
@@ -224,26 +231,31 @@ def _process_relationships(relationship_file_path: str,
 
     verbose_print(f'Relationship file {relationship_file_path} loaded, processing relationships...')
 
-    for _, row in iter_progress(
-        relationship_df.iterrows(),
+    relationship_rows = relationship_df[['active', 'sourceId', 'destinationId', 'typeId']].itertuples(
+        index=False,
+        name=None,
+    )
+
+    for active, source_id, destination_id, type_id in iter_progress(
+        relationship_rows,
         description='Processing SNOMED relationships',
         total=len(relationship_df)
     ):
-        if not bool(row['active']):
+        if not bool(active):
             # rf2_dataframe_deduplicate only keeps the latest effectiveTime per relationship
             # id -- it does not imply the kept row is active. Unlike _process_concepts, this
             # was previously unfiltered, silently loading retracted/superseded relationships
             # (~36% of is_a rows across the three releases) as if current.
             continue
 
-        if row['typeId'] == 116680003:
+        if type_id == 116680003:
             # IS_A relationship
             snomed_graph.add_edge(
-                str(row['sourceId']),
-                str(row['destinationId']),
+                str(source_id),
+                str(destination_id),
                 label=ConceptRelationshipType.IS_A
             )
-        elif row['typeId'] == 370124000:
+        elif type_id == 370124000:
             # REPLACED_BY relationship -- NOTE: this typeId does not appear anywhere in the
             # current release's relationship files (verified: 0 rows, active or inactive).
             # SNOMED's actual concept-inactivation history (SAME_AS/REPLACED_BY/WAS_A/
@@ -252,8 +264,8 @@ def _process_relationships(relationship_file_path: str,
             # Left in place rather than guessing a replacement SCTID; SNOMED replaced_by is
             # effectively non-functional until that's addressed.
             snomed_graph.add_edge(
-                str(row['sourceId']),
-                str(row['destinationId']),
+                str(source_id),
+                str(destination_id),
                 label=ConceptRelationshipType.REPLACED_BY
             )
 
@@ -306,13 +318,14 @@ async def _load_snomed_release(concept_file: str,
         if graph_db is None:
             graph_db = get_active_graph_db()
 
-        await doc_db.save_terms(
-            terms=concepts
-        )
-
-        await graph_db.save_vocabulary_graph(
-            concepts=concepts,
-            graph=snomed_graph,
+        await asyncio.gather(
+            doc_db.save_terms(
+                terms=concepts
+            ),
+            graph_db.save_vocabulary_graph(
+                concepts=concepts,
+                graph=snomed_graph,
+            ),
         )
     else:
         await write_concepts_to_file(
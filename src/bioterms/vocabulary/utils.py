@@ -4,16 +4,23 @@ import json
 import io
 import csv
 import asyncio
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 import aiofiles
+import aiofiles.os
+import aiofiles.ospath
 import networkx as nx
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 
 from bioterms.etc.consts import CONFIG
-from bioterms.etc.enums import ConceptPrefix, ConceptRelationshipType, AnnotationType
+from bioterms.etc.enums import ConceptPrefix, ConceptRelationshipType, AnnotationType, SimilarityMethod
 from bioterms.etc.errors import VocabularyNotLoaded
-from bioterms.etc.utils import check_files_exist, edge_iter, batch_iterable, verbose_print
+from bioterms.etc.utils import check_files_exist_async, edge_iter, batch_iterable, verbose_print
 from bioterms.database import Cache, DocumentDatabase, GraphDatabase, VectorDatabase, get_active_cache, \
     get_active_doc_db, get_active_graph_db, get_active_vector_db
 from bioterms.database.doc_db.utils import generate_extra_data
@@ -38,19 +45,63 @@ ALL_VOCABULARIES = {
 }
 
 
+@lru_cache(maxsize=None)
+def _load_vocabulary_module(vocabulary_module_name: str):
+    """
+    Import a vocabulary module by name, once per process.
+    :param vocabulary_module_name: The module name under bioterms.vocabulary.
+    :return: The vocabulary module.
+    """
+    return importlib.import_module(f'bioterms.vocabulary.{vocabulary_module_name}')
+
+
 def get_vocabulary_module(prefix: ConceptPrefix):
     """
     Get the vocabulary module for the given prefix.
     :param prefix: The prefix of the vocabulary.
     :return: The vocabulary module.
     """
-    vocabulary_module_name = ALL_VOCABULARIES.get(prefix)
-    if not vocabulary_module_name:
-        raise ValueError(f'Vocabulary with prefix {prefix} not found.')
+    try:
+        vocabulary_module_name = ALL_VOCABULARIES[prefix]
+    except KeyError:
+        raise ValueError(f'Vocabulary with prefix {prefix} not found.') from None
 
-    vocabulary_module = importlib.import_module(f'bioterms.vocabulary.{vocabulary_module_name}')
+    # Validation stays outside the cached import, so unknown prefixes are never cached
+    return _load_vocabulary_module(vocabulary_module_name)
 
-    return vocabulary_module
+
+@dataclass(frozen=True, slots=True)
+class VocabularyMeta:
+    """
+    The constant metadata of a vocabulary module, read from the module once.
+    """
+    prefix: ConceptPrefix
+    name: str
+    annotations: tuple[ConceptPrefix, ...]
+    similarity_methods: tuple[SimilarityMethod, ...]
+    file_paths: tuple[str, ...]
+    timestamp_file: str
+    concept_class: type[Concept]
+
+
+@lru_cache(maxsize=None)
+def get_vocabulary_meta(prefix: ConceptPrefix) -> VocabularyMeta:
+    """
+    Get the metadata of the vocabulary specified by the prefix.
+    :param prefix: The prefix of the vocabulary.
+    :return: The vocabulary metadata.
+    """
+    vocabulary_module = get_vocabulary_module(prefix)
+
+    return VocabularyMeta(
+        prefix=vocabulary_module.VOCABULARY_PREFIX,
+        name=vocabulary_module.VOCABULARY_NAME,
+        annotations=tuple(vocabulary_module.ANNOTATIONS),
+        similarity_methods=tuple(vocabulary_module.SIMILARITY_METHODS),
+        file_paths=tuple(vocabulary_module.FILE_PATHS),
+        timestamp_file=vocabulary_module.TIMESTAMP_FILE,
+        concept_class=vocabulary_module.CONCEPT_CLASS,
+    )
 
 
 async def get_vocabulary_status(prefix: ConceptPrefix,
@@ -70,7 +121,7 @@ async def get_vocabulary_status(prefix: ConceptPrefix,
     :param use_cache: Whether to use the cache. Defaults to True.
     :return: The vocabulary status.
     """
-    vocabulary_module = get_vocabulary_module(prefix)
+    vocabulary_meta = get_vocabulary_meta(prefix)
 
     if cache is None:
         cache = get_active_cache()
@@ -87,31 +138,36 @@ async def get_vocabulary_status(prefix: ConceptPrefix,
     if vector_db is None:
         vector_db = get_active_vector_db()
 
-    concept_count = await doc_db.count_terms(prefix)
-    relationship_count = await graph_db.count_internal_relationships(prefix)
-    vector_count = await vector_db.count_vectors(prefix)
-    annotations = vocabulary_module.ANNOTATIONS
-    downloaded = check_files_exist(vocabulary_module.FILE_PATHS)
+    # Each count comes from a different backend, so they are queried concurrently
+    concept_count, relationship_count, vector_count, downloaded = await asyncio.gather(
+        doc_db.count_terms(prefix),
+        graph_db.count_internal_relationships(prefix),
+        vector_db.count_vectors(prefix),
+        check_files_exist_async(vocabulary_meta.file_paths),
+    )
 
-    try:
-        timestamp_file_path = os.path.join(CONFIG.data_dir, vocabulary_module.TIMESTAMP_FILE)
-        async with aiofiles.open(timestamp_file_path) as f:
-            timestamp_str = await f.read()
-            download_time = datetime.fromisoformat(timestamp_str.strip())
-    except (FileNotFoundError, ValueError):
-        download_time = None
+    download_time = None
+    if downloaded:
+        # The download time is only reported for downloaded files, so skip the read otherwise
+        try:
+            timestamp_file_path = os.path.join(CONFIG.data_dir, vocabulary_meta.timestamp_file)
+            async with aiofiles.open(timestamp_file_path) as f:
+                timestamp_str = await f.read()
+                download_time = datetime.fromisoformat(timestamp_str.strip())
+        except (FileNotFoundError, ValueError):
+            pass
 
     status = VocabularyStatus(
         prefix=prefix,
-        name=vocabulary_module.VOCABULARY_NAME,
+        name=vocabulary_meta.name,
         fileDownloaded=downloaded,
-        fileDownloadTime=download_time if downloaded else None,
+        fileDownloadTime=download_time,
         loaded=concept_count > 0,
         conceptCount=concept_count,
         relationshipCount=relationship_count,
         vectorCount=vector_count,
-        annotations=annotations,
-        similarityMethods=vocabulary_module.SIMILARITY_METHODS,
+        annotations=list(vocabulary_meta.annotations),
+        similarityMethods=list(vocabulary_meta.similarity_methods),
     )
 
     await cache.save_vocabulary_status(status)
@@ -141,6 +197,91 @@ async def ensure_gene_symbol_loaded(doc_db: DocumentDatabase = None,
         raise VocabularyNotLoaded('HGNC gene symbol vocabulary is not loaded.')
 
 
+# aiofiles has no lexists; unlike exists, it also reports dangling symlinks, which remove() can delete
+_path_lexists = aiofiles.ospath.wrap(os.path.lexists)
+
+
+async def remove_data_files(file_paths: list[str]):
+    """
+    Remove files from the data directory concurrently, skipping those that are not there.
+    :param file_paths: The file paths, relative to the data directory.
+    """
+    paths = [os.path.join(CONFIG.data_dir, file_path) for file_path in file_paths]
+
+    # Only remove what is there, so the usual already-clean case raises nothing
+    present = await asyncio.gather(*(_path_lexists(path) for path in paths))
+    results = await asyncio.gather(
+        *(aiofiles.os.remove(path) for path, exists in zip(paths, present) if exists),
+        return_exceptions=True,
+    )
+
+    for result in results:
+        # A file removed in the meantime is fine, anything else is a real failure
+        if isinstance(result, BaseException) and not isinstance(result, FileNotFoundError):
+            raise result
+
+
+def series_values(series: pd.Series) -> list:
+    """
+    Get the values of a dataframe column as a plain list, with missing values as None.
+
+    Iterating such lists in parallel is much cheaper than building a Series per row with iterrows.
+    :param series: The dataframe column.
+    :return: The column values.
+    """
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def read_string_columns(file_path: str,
+                        delimiter: str,
+                        columns: dict[int, str],
+                        ) -> pa.Table:
+    """
+    Read selected columns of a headerless delimited file into an Arrow table of strings.
+    :param file_path: The absolute path to the file.
+    :param delimiter: The field delimiter.
+    :param columns: A mapping of column position to the name to give the column.
+    :return: The Arrow table, with empty fields read as nulls.
+    """
+    table = pa_csv.read_csv(
+        file_path,
+        read_options=pa_csv.ReadOptions(autogenerate_column_names=True),
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=[f'f{index}' for index in columns],
+            column_types={f'f{index}': pa.string() for index in columns},
+            null_values=[''],
+            strings_can_be_null=True,
+        ),
+    )
+
+    return table.rename_columns(list(columns.values()))
+
+
+def read_csv_columns(file_path: str,
+                     columns: Optional[list[str]] = None,
+                     ) -> pd.DataFrame:
+    """
+    Read a CSV file with a header row through the Arrow CSV reader.
+
+    Quoted cells may span several lines, which pandas' pyarrow engine does not allow once the file
+    is larger than one parse block.
+    :param file_path: The absolute path to the file.
+    :param columns: The columns to read, all of them if not given.
+    :return: The dataframe, with empty and NA-like cells read as missing.
+    """
+    table = pa_csv.read_csv(
+        file_path,
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            strings_can_be_null=True,
+        ),
+    )
+
+    return table.to_pandas()
+
+
 async def write_concepts_to_file(prefix: ConceptPrefix,
                                  concepts: list[Concept],
                                  overwrite: bool = True,
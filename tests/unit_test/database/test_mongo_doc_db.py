@@ -0,0 +1,92 @@
+import os
+
+os.environ.setdefault('BTS_SERVER_HMAC_KEY', 'dGVzdC1obWFjLWtleQ==')
+os.environ.setdefault('BTS_ENABLE_METRICS', 'false')
+
+import pytest
+
+from bioterms.database.doc_db import mongo_doc_db
+from bioterms.database.doc_db.mongo_doc_db import MongoDocumentDatabase
+from bioterms.etc.consts import CONFIG
+from bioterms.etc.enums import ConceptPrefix
+from bioterms.model.concept import Concept
+
+
+class FakeCollection:
+    def __init__(self, fail: bool = False, prepared: list = None):
+        self.inserted = []
+        self.fail = fail
+        self.prepared = prepared
+        self.prepared_at_failure = None
+
+    async def insert_many(self, docs, ordered=True):
+        if self.fail:
+            self.prepared_at_failure = len(self.prepared) if self.prepared is not None else None
+            raise RuntimeError('insert failed')
+
+        self.inserted.append(list(docs))
+
+
+class FakeClient:
+    def __init__(self, collection: FakeCollection):
+        self.collection = collection
+
+    def __getitem__(self, name):
+        return {ConceptPrefix.HPO.value: self.collection}
+
+
+def make_concepts(count: int) -> list[Concept]:
+    return [
+        Concept(prefix=ConceptPrefix.HPO, conceptId=f'{i:07d}', label=f'Phenotype {i}')
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_save_terms_writes_every_batch_in_order(monkeypatch):
+    monkeypatch.setattr(CONFIG, 'disable_progress_bar', True)
+    monkeypatch.setattr(
+        mongo_doc_db,
+        'batch_iterable',
+        lambda seq: (seq[i:i + 2] for i in range(0, len(seq), 2)),
+    )
+    collection = FakeCollection()
+
+    await MongoDocumentDatabase(FakeClient(collection)).save_terms(make_concepts(5), no_upsert=True)
+
+    assert [[doc['conceptId'] for doc in batch] for batch in collection.inserted] == [
+        ['0000000', '0000001'],
+        ['0000002', '0000003'],
+        ['0000004'],
+    ]
+    assert all('nGrams' in doc and 'searchText' in doc for batch in collection.inserted for doc in batch)
+
+
+@pytest.mark.asyncio
+async def test_save_terms_raises_write_errors_without_preparing_more_batches(monkeypatch):
+    monkeypatch.setattr(CONFIG, 'disable_progress_bar', True)
+    monkeypatch.setattr(
+        mongo_doc_db,
+        'batch_iterable',
+        lambda seq: (seq[i:i + 2] for i in range(0, len(seq), 2)),
+    )
+    prepared = []
+    generate_extra_data = mongo_doc_db.generate_extra_data
+
+    async def counting_generate_extra_data(concepts, executor):
+        prepared.append(concepts)
+        return await generate_extra_data(concepts=concepts, executor=executor)
+
+    monkeypatch.setattr(mongo_doc_db, 'generate_extra_data', counting_generate_extra_data)
+    collection = FakeCollection(fail=True, prepared=prepared)
+
+    with pytest.raises(RuntimeError, match='insert failed'):
+        await MongoDocumentDatabase(FakeClient(collection)).save_terms(
+            make_concepts(9),
+            no_upsert=True,
+        )
+
+    # Five batches are available, but none is started after the failed write
+    assert collection.prepared_at_failure is not None
+    assert len(prepared) == collection.prepared_at_failure
+    assert len(prepared) < 5
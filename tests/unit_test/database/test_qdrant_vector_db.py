@@ -0,0 +1,58 @@
+import os
+
+os.environ.setdefault('BTS_SERVER_HMAC_KEY', 'dGVzdC1obWFjLWtleQ==')
+os.environ.setdefault('BTS_ENABLE_METRICS', 'false')
+
+import pytest
+
+# The module needs the optional qdrant client, and imports the sentence-transformers embedding models
+pytest.importorskip('qdrant_client')
+pytest.importorskip('sentence_transformers')
+
+from bioterms.database.vector_db.qdrant_vector_db import QdrantVectorDatabase
+from bioterms.etc.enums import ConceptPrefix
+
+
+class FakeQdrantClient:
+    def __init__(self, fail: bool = False):
+        self.upserted = []
+        self.fail = fail
+
+    async def update_collection(self, collection_name, hnsw_config):
+        pass
+
+    async def upsert(self, collection_name, points):
+        if self.fail:
+            raise RuntimeError('upsert failed')
+
+        self.upserted.append([point.id for point in points])
+
+
+async def make_embeddings(count: int, pulled: list):
+    for i in range(count):
+        pulled.append(i)
+        yield f'{i:07d}', i, [0.0, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_load_embeddings_upserts_every_batch():
+    client = FakeQdrantClient()
+
+    id_map = await QdrantVectorDatabase(client).load_embeddings(ConceptPrefix.HPO, make_embeddings(2500, []))
+
+    assert [len(batch) for batch in client.upserted] == [1001, 1001, 498]
+    assert id_map['0002499'] == 2499
+
+
+@pytest.mark.asyncio
+async def test_load_embeddings_stops_pulling_embeddings_after_a_failed_upsert():
+    pulled = []
+
+    with pytest.raises(RuntimeError, match='upsert failed'):
+        await QdrantVectorDatabase(FakeQdrantClient(fail=True)).load_embeddings(
+            ConceptPrefix.HPO,
+            make_embeddings(20000, pulled),
+        )
+
+    # The first batch fails, at most the batch produced meanwhile is pulled
+    assert len(pulled) <= 2 * 1001 + 1
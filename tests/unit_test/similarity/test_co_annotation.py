@@ -0,0 +1,90 @@
+import os
+
+os.environ.setdefault('BTS_SERVER_HMAC_KEY', 'dGVzdC1obWFjLWtleQ==')
+os.environ.setdefault('BTS_ENABLE_METRICS', 'false')
+
+import math
+import pytest
+import networkx as nx
+import numpy as np
+
+from bioterms.etc.consts import CONFIG
+from bioterms.etc.enums import ConceptPrefix, ConceptRelationshipType
+from bioterms.similarity import co_annotation
+
+
+def _expected_score(intersection_len: int, size_1: int, size_2: int, total: int) -> float:
+    npmi = (1 + math.log(intersection_len * total / (size_1 * size_2)) / math.log(total / intersection_len)) / 2
+    return npmi * intersection_len / (size_1 + size_2 - intersection_len)
+
+
+class TestCoAnnotationScores:
+    def test_matches_npmi_jaccard_formula(self):
+        scores = co_annotation._co_annotation_scores(
+            np.array([1, 2]),
+            np.array([2, 3]),
+            np.array([2, 2]),
+            3,
+        )
+
+        assert scores[0] == pytest.approx(_expected_score(1, 2, 2, 3))
+        assert scores[1] == pytest.approx(_expected_score(2, 3, 2, 3))
+
+    def test_intersection_covering_universe_is_fully_associated(self):
+        scores = co_annotation._co_annotation_scores(
+            np.array([3]),
+            np.array([3]),
+            np.array([4]),
+            3,
+        )
+
+        assert scores[0] == pytest.approx(3 / 4)
+
+    def test_pairs_without_shared_annotations_score_zero(self):
+        with np.errstate(all='raise'):
+            scores = co_annotation._co_annotation_scores(
+                np.array([0, 1]),
+                np.array([2, 2]),
+                np.array([2, 2]),
+                3,
+            )
+
+        assert scores[0] == 0
+        assert scores[1] == pytest.approx(_expected_score(1, 2, 2, 3))
+
+
+@pytest.mark.asyncio
+async def test_calculate_similarity_scores_only_overlapping_pairs(monkeypatch):
+    monkeypatch.setattr(CONFIG, 'disable_progress_bar', True)
+
+    target_graph = nx.MultiDiGraph()
+    target_graph.add_edge('B', 'A', label=ConceptRelationshipType.IS_A)
+    target_graph.add_edge('C', 'A', label=ConceptRelationshipType.IS_A)
+    target_graph.add_edge('D', 'A', label=ConceptRelationshipType.IS_A)
+
+    annotation_graph = nx.DiGraph()
+    annotation_graph.add_edge('hpo:B', 'mondo:1')
+    annotation_graph.add_edge('hpo:B', 'mondo:2')
+    annotation_graph.add_edge('hpo:C', 'mondo:2')
+    annotation_graph.add_edge('hpo:C', 'mondo:3')
+    annotation_graph.add_edge('hpo:D', 'mondo:4')
+
+    results = {
+        frozenset((concept_from, concept_to)): score
+        async for concept_from, concept_to, score in co_annotation.calculate_similarity(
+            target_graph=target_graph,
+            target_prefix=ConceptPrefix.HPO,
+            corpus_prefix=ConceptPrefix.MONDO,
+            annotation_graph=annotation_graph,
+        )
+    }
+
+    assert set(results) == {
+        frozenset(('A', 'B')),
+        frozenset(('A', 'C')),
+        frozenset(('A', 'D')),
+        frozenset(('B', 'C')),
+    }
+    assert results[frozenset(('B', 'C'))] == pytest.approx(_expected_score(1, 2, 2, 4))
+    assert results[frozenset(('A', 'B'))] == pytest.approx(_expected_score(2, 4, 2, 4))
+    assert results[frozenset(('A', 'D'))] == pytest.approx(_expected_score(1, 4, 1, 4))
@@ -0,0 +1,60 @@
+import os
+
+os.environ.setdefault('BTS_SERVER_HMAC_KEY', 'dGVzdC1obWFjLWtleQ==')
+os.environ.setdefault('BTS_ENABLE_METRICS', 'false')
+
+import math
+import pytest
+import networkx as nx
+
+from bioterms.etc.consts import CONFIG
+from bioterms.etc.enums import ConceptPrefix, ConceptRelationshipType
+from bioterms.similarity import relevance
+
+
+async def _collect(target_graph: nx.MultiDiGraph, annotation_graph: nx.DiGraph) -> dict:
+    return {
+        (concept_from, concept_to): score
+        async for concept_from, concept_to, score in relevance.calculate_similarity(
+            target_graph=target_graph,
+            target_prefix=ConceptPrefix.HPO,
+            corpus_prefix=ConceptPrefix.MONDO,
+            annotation_graph=annotation_graph,
+        )
+    }
+
+
+@pytest.mark.asyncio
+async def test_calculate_similarity_uses_most_informative_common_ancestor(monkeypatch):
+    monkeypatch.setattr(CONFIG, 'disable_progress_bar', True)
+
+    target_graph = nx.MultiDiGraph()
+    target_graph.add_edge('B', 'A', label=ConceptRelationshipType.IS_A)
+    target_graph.add_edge('C', 'A', label=ConceptRelationshipType.IS_A)
+    target_graph.add_edge('D', 'B', label=ConceptRelationshipType.IS_A)
+
+    annotation_graph = nx.DiGraph()
+    annotation_graph.add_edge('hpo:B', 'mondo:1')
+    annotation_graph.add_edge('hpo:C', 'mondo:2')
+    annotation_graph.add_edge('hpo:D', 'mondo:3')
+
+    results = await _collect(target_graph, annotation_graph)
+
+    ic_b = -math.log(2 / 3)
+    ic_d = -math.log(1 / 3)
+    assert results[('B', 'D')] == pytest.approx(2 * ic_b / (ic_b + ic_d) * (1 - 2 / 3))
+    assert results[('B', 'C')] == pytest.approx(0.0)
+    assert len(results) == 6
+
+
+@pytest.mark.asyncio
+async def test_calculate_similarity_skips_pairs_without_information_content(monkeypatch):
+    monkeypatch.setattr(CONFIG, 'disable_progress_bar', True)
+
+    target_graph = nx.MultiDiGraph()
+    target_graph.add_edge('S', 'R', label=ConceptRelationshipType.IS_A)
+
+    annotation_graph = nx.DiGraph()
+    annotation_graph.add_edge('hpo:S', 'mondo:1')
+
+    assert await _collect(target_graph, annotation_graph) == {}
@@ -0,0 +1,38 @@
+import os
+
+os.environ.setdefault('BTS_SERVER_HMAC_KEY', 'dGVzdC1obWFjLWtleQ==')
+os.environ.setdefault('BTS_ENABLE_METRICS', 'false')
+
+import networkx as nx
+
+from bioterms.etc.enums import ConceptPrefix
+from bioterms.similarity.utils import count_annotation_for_graph
+
+
+def test_count_annotation_for_graph_counts_every_path():
+    # D reaches A through both B and C, so its annotation is counted twice at A
+    target_graph = nx.DiGraph()
+    target_graph.add_edge('B', 'A')
+    target_graph.add_edge('C', 'A')
+    target_graph.add_edge('D', 'B')
+    target_graph.add_edge('D', 'C')
+    target_graph.add_node('E')
+
+    annotation_graph = nx.Graph()
+    annotation_graph.add_edge('hpo:B', 'mondo:1')
+    annotation_graph.add_edge('hpo:D', 'mondo:2')
+    annotation_graph.add_edge('hpo:D', 'mondo:3')
+
+    count_annotation_for_graph(
+        target_graph=target_graph,
+        annotation_graph=annotation_graph,
+        target_prefix=ConceptPrefix.HPO,
+    )
+
+    assert dict(target_graph.nodes(data='annotation_count')) == {
+        'A': 5,
+        'B': 3,
+        'C': 2,
+        'D': 2,
+        'E': 0,
+    }
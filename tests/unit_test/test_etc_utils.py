@@ -3,10 +3,15 @@ import os
 os.environ.setdefault('BTS_SERVER_HMAC_KEY', 'test-hmac-key')
 os.environ.setdefault('BTS_ENABLE_METRICS', 'false')
 
+import gc
+import gzip
+import httpx
+import owlready2
 import pytest
 
 from bioterms.etc.consts import CONFIG
-from bioterms.etc.utils import aiter_progress, iter_progress
+from bioterms.etc.utils import aiter_progress, download_file, extract_file_from_gzip, gc_paused, iter_progress, \
+    load_owl_ontology
 
 
 async def _agen(n):
@@ -38,3 +43,64 @@ def test_iter_progress_yields_all_items_when_progress_bar_disabled(monkeypatch):
     items = list(iter_progress(range(5), description='test'))
 
     assert items == [0, 1, 2, 3, 4]
+
+
+def test_gc_paused_restores_collector_state():
+    assert gc.isenabled()
+
+    with gc_paused():
+        assert not gc.isenabled()
+
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        with gc_paused():
+            pass
+
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+
+class _FakeOntology:
+    def __init__(self, iri):
+        self.iri = iri
+
+    def load(self):
+        return self
+
+
+def test_load_owl_ontology_warns_without_optimised_parser(monkeypatch, caplog):
+    monkeypatch.setattr(owlready2, 'get_ontology', _FakeOntology)
+    monkeypatch.setattr(owlready2.driver, 'owlready2_optimized', None)
+
+    with caplog.at_level('WARNING', logger='bioterms'):
+        ontology = load_owl_ontology('/data/hpo/hp.owl')
+
+    assert ontology.iri == 'file:///data/hpo/hp.owl'
+    assert 'optimised parser is not available' in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_download_file_writes_the_whole_body(monkeypatch, tmp_path):
+    monkeypatch.setattr(CONFIG, 'data_dir', str(tmp_path))
+    monkeypatch.setattr(CONFIG, 'disable_progress_bar', True)
+    body = bytes(range(256)) * 10000
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=body))) \
+            as client:
+        await download_file('https://example.org/hp.owl', 'hpo/hp.owl', download_client=client)
+
+    assert (tmp_path / 'hpo' / 'hp.owl').read_bytes() == body
+
+
+@pytest.mark.asyncio
+async def test_extract_file_from_gzip_writes_the_decompressed_file(tmp_path):
+    body = bytes(range(256)) * 10000
+    gzip_path = tmp_path / 'omim.gz'
+    gzip_path.write_bytes(gzip.compress(body))
+
+    await extract_file_from_gzip(str(gzip_path), str(tmp_path / 'omim.csv'), chunk_size=4096)
+
+    assert (tmp_path / 'omim.csv').read_bytes() == body
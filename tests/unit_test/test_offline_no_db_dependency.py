@@ -21,8 +21,11 @@ async def test_load_vocabulary_offline_does_not_require_cache(monkeypatch):
         load_vocabulary_from_file=fake_load_vocabulary_from_file,
     )
 
+    async def fake_check_files_exist_async(_files):
+        return True
+
     monkeypatch.setattr(vocabulary, 'get_vocabulary_module', lambda _: fake_module)
-    monkeypatch.setattr(vocabulary, 'check_files_exist', lambda _: True)
+    monkeypatch.setattr(vocabulary, 'check_files_exist_async', fake_check_files_exist_async)
 
     def fail_get_active_cache():
         raise AssertionError('get_active_cache should not be called in offline mode')
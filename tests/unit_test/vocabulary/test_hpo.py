@@ -0,0 +1,84 @@
+import os
+
+os.environ.setdefault('BTS_SERVER_HMAC_KEY', 'dGVzdC1obWFjLWtleQ==')
+os.environ.setdefault('BTS_ENABLE_METRICS', 'false')
+
+import networkx as nx
+import pytest
+
+from bioterms.etc.consts import CONFIG
+from bioterms.etc.enums import ConceptPrefix, ConceptRelationshipType
+from bioterms.model.concept import Concept
+from bioterms.vocabulary import hpo
+
+
+def _write_ontology(tmp_path) -> str:
+    ontology_path = tmp_path / 'hpo' / 'hp.owl'
+    ontology_path.parent.mkdir()
+    ontology_path.write_text('<rdf:RDF/>')
+
+    return str(ontology_path)
+
+
+def test_parsed_cache_round_trip(monkeypatch, tmp_path):
+    monkeypatch.setattr(CONFIG, 'data_dir', str(tmp_path))
+    ontology_path = _write_ontology(tmp_path)
+
+    concepts = [Concept(prefix=ConceptPrefix.HPO, conceptId='0000118', label='Phenotypic abnormality')]
+    hpo_graph = nx.DiGraph()
+    hpo_graph.add_edge('0000118', '0000001', label=ConceptRelationshipType.IS_A)
+
+    assert hpo._read_parsed_cache(ontology_path) is None
+
+    hpo._write_parsed_cache(ontology_path, concepts, hpo_graph)
+    cached_concepts, cached_graph = hpo._read_parsed_cache(ontology_path)
+
+    assert cached_concepts == concepts
+    assert list(cached_graph.edges(data=True)) == [('0000118', '0000001', {'label': ConceptRelationshipType.IS_A})]
+
+
+def test_parsed_cache_is_stale_once_the_ontology_changes(monkeypatch, tmp_path):
+    monkeypatch.setattr(CONFIG, 'data_dir', str(tmp_path))
+    ontology_path = _write_ontology(tmp_path)
+
+    hpo._write_parsed_cache(ontology_path, [], nx.DiGraph())
+    stat = os.stat(ontology_path)
+    os.utime(ontology_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert hpo._read_parsed_cache(ontology_path) is None
+
+
+def test_parsed_cache_is_stale_once_the_cache_format_changes(monkeypatch, tmp_path):
+    monkeypatch.setattr(CONFIG, 'data_dir', str(tmp_path))
+    ontology_path = _write_ontology(tmp_path)
+
+    hpo._write_parsed_cache(ontology_path, [], nx.DiGraph())
+    monkeypatch.setattr(hpo, '_PARSED_CACHE_FORMAT', hpo._PARSED_CACHE_FORMAT + 1)
+
+    assert hpo._read_parsed_cache(ontology_path) is None
+
+
+def test_unreadable_parsed_cache_is_a_miss(monkeypatch, tmp_path):
+    monkeypatch.setattr(CONFIG, 'data_dir', str(tmp_path))
+    ontology_path = _write_ontology(tmp_path)
+
+    hpo._write_parsed_cache(ontology_path, [], nx.DiGraph())
+    cache_path = tmp_path / 'hpo' / 'hp.parsed.pkl'
+    cache_path.write_bytes(cache_path.read_bytes()[:-10])
+
+    assert hpo._read_parsed_cache(ontology_path) is None
+
+    cache_path.write_bytes(b'not a pickle')
+
+    assert hpo._read_parsed_cache(ontology_path) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_vocabulary_files_removes_the_parsed_cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(CONFIG, 'data_dir', str(tmp_path))
+    ontology_path = _write_ontology(tmp_path)
+    hpo._write_parsed_cache(ontology_path, [], nx.DiGraph())
+
+    await hpo.delete_vocabulary_files()
+
+    assert list((tmp_path / 'hpo').iterdir()) == []
@@ -0,0 +1,42 @@
+import os
+
+os.environ.setdefault('BTS_SERVER_HMAC_KEY', 'dGVzdC1obWFjLWtleQ==')
+os.environ.setdefault('BTS_ENABLE_METRICS', 'false')
+
+from bioterms.vocabulary.utils import read_csv_columns, read_string_columns
+
+
+def test_read_string_columns_selects_and_renames_columns(tmp_path):
+    file_path = tmp_path / 'flat.txt'
+    file_path.write_text('C1\tiri1\t\t001|Term\nC2\tiri2\tC1\tNA\n')
+
+    table = read_string_columns(str(file_path), delimiter='\t', columns={0: 'code', 2: 'parents', 3: 'synonyms'})
+
+    assert table.column_names == ['code', 'parents', 'synonyms']
+    assert table.to_pydict() == {
+        'code': ['C1', 'C2'],
+        'parents': [None, 'C1'],
+        'synonyms': ['001|Term', 'NA'],
+    }
+
+
+def test_read_csv_columns_reads_multiline_cells_across_parse_blocks(tmp_path):
+    # Well over the 1 MiB Arrow parse block, with a quoted newline in every row
+    row_count = 60000
+    rows = ['Class ID,Preferred Label,Definitions,Obsolete']
+    rows.extend(
+        f'http://purl/OMIM/{i},label {i},"line one\nline two",{"true" if i % 2 else ""}'
+        for i in range(row_count)
+    )
+    file_path = tmp_path / 'omim.csv'
+    file_path.write_text('\n'.join(rows) + '\n')
+    assert file_path.stat().st_size > 2 * (1 << 20)
+
+    omim_df = read_csv_columns(str(file_path), columns=['Class ID', 'Definitions', 'Obsolete'])
+
+    assert list(omim_df.columns) == ['Class ID', 'Definitions', 'Obsolete']
+    assert len(omim_df) == row_count
+    assert omim_df['Class ID'].iloc[-1] == f'http://purl/OMIM/{row_count - 1}'
+    assert (omim_df['Definitions'] == 'line one\nline two').all()
+    assert omim_df['Obsolete'].iloc[0] is None
+    assert omim_df['Obsolete'].iloc[1] is True